@@ -0,0 +1,162 @@
+import type { DataPoint } from '@/lib/types'
+
+/**
+ * Reader for the binary data sidecars written by the gallery build
+ * (scripts/gallery/sidecar.py): a small JSON header followed by
+ * little-endian float32 columns and then any long label lists. Columns are
+ * returned as Float32Array views over the fetched buffer, so nothing is
+ * copied or parsed per value.
+ */
+
+const MAGIC = 'FPD1'
+const VERSION = 2
+const PREAMBLE_BYTES = 8
+
+export interface FigureDataColumn {
+  name: string
+  shape: number[]
+  /** Start of the column in the body, in float32 elements */
+  offset: number
+  length: number
+  /** Per dimension, the name of the label list that indexes it */
+  axes?: (string | null)[]
+  /** Series name for columns that come from a list of groups */
+  series?: string
+  /** For categorical columns, the strings the float codes index */
+  categories?: string[]
+}
+
+/** A label list stored after the float columns instead of in the header */
+export interface PackedLabels {
+  /** Start of the NUL-separated UTF-8 list in the body, in bytes */
+  offset: number
+  bytes: number
+  count: number
+}
+
+export interface FigureDataHeader {
+  version: number
+  figure: string
+  dtype: 'float32'
+  byteOrder: 'little'
+  palette: string[]
+  columns: FigureDataColumn[]
+  labels: Record<string, string[] | string | PackedLabels>
+}
+
+export interface FigureData {
+  /** The header, with packed label lists decoded into string[] */
+  header: FigureDataHeader
+  columns: Record<string, Float32Array>
+}
+
+const littleEndianHost =
+  new Uint8Array(new Uint32Array([1]).buffer)[0] === 1
+
+/**
+ * Parse a sidecar fetched as an ArrayBuffer.
+ */
+export function parseFigureData(buffer: ArrayBuffer): FigureData {
+  const view = new DataView(buffer)
+  const magic = String.fromCharCode(
+    ...new Uint8Array(buffer, 0, MAGIC.length)
+  )
+  if (magic !== MAGIC) {
+    throw new Error(`Not a figure data sidecar (magic ${magic})`)
+  }
+  const headerBytes = view.getUint32(4, true)
+  const decoder = new TextDecoder()
+  const header: FigureDataHeader = JSON.parse(
+    decoder.decode(new Uint8Array(buffer, PREAMBLE_BYTES, headerBytes))
+  )
+  if (header.version !== VERSION) {
+    throw new Error(`Unsupported figure data version ${header.version}`)
+  }
+  const bodyStart = PREAMBLE_BYTES + headerBytes
+
+  for (const [name, entry] of Object.entries(header.labels)) {
+    if (typeof entry === 'object' && !Array.isArray(entry)) {
+      const text = decoder.decode(
+        new Uint8Array(buffer, bodyStart + entry.offset, entry.bytes)
+      )
+      header.labels[name] = entry.count ? text.split('\0') : []
+    }
+  }
+
+  const columns: Record<string, Float32Array> = {}
+  for (const column of header.columns) {
+    const byteOffset = bodyStart + column.offset * 4
+    if (littleEndianHost) {
+      columns[column.name] = new Float32Array(buffer, byteOffset, column.length)
+    } else {
+      // Big-endian hosts need a byte-swapping copy
+      const values = new Float32Array(column.length)
+      for (let i = 0; i < column.length; i++) {
+        values[i] = view.getFloat32(byteOffset + i * 4, true)
+      }
+      columns[column.name] = values
+    }
+  }
+  return { header, columns }
+}
+
+/**
+ * Fetch and parse a sidecar, e.g. the `data` asset from the gallery manifest.
+ */
+export async function loadFigureData(url: string): Promise<FigureData> {
+  const response = await fetch(url)
+  if (!response.ok) {
+    throw new Error(`Failed to load figure data: ${response.status}`)
+  }
+  return parseFigureData(await response.arrayBuffer())
+}
+
+/**
+ * A label list by name (long lists are already decoded by parseFigureData).
+ */
+export function labelList(data: FigureData, name: string): string[] {
+  const labels = data.header.labels[name]
+  if (!Array.isArray(labels)) throw new Error(`Unknown label list: ${name}`)
+  return labels
+}
+
+/**
+ * The strings of a categorical column, one per code.
+ */
+export function categoryValues(data: FigureData, name: string): string[] {
+  const values = data.columns[name]
+  const column = data.header.columns.find((c) => c.name === name)
+  if (!values || !column?.categories) throw new Error(`Not a categorical column: ${name}`)
+  const categories = column.categories
+  return Array.from(values, (code) => categories[code])
+}
+
+/**
+ * Row `index` of a column with shape [rows, n] (a view, not a copy).
+ */
+export function columnRow(
+  data: FigureData,
+  name: string,
+  index: number
+): Float32Array {
+  const values = data.columns[name]
+  const column = data.header.columns.find((c) => c.name === name)
+  if (!values || !column) throw new Error(`Unknown column: ${name}`)
+  const width = column.shape.slice(1).reduce((a, b) => a * b, 1)
+  return values.subarray(index * width, (index + 1) * width)
+}
+
+/**
+ * Pair x and y values into DataPoint[] (for plotStore/datasetStore),
+ * skipping points where either value is missing (NaN).
+ */
+export function toDataPoints(x: ArrayLike<number>, y: ArrayLike<number>): DataPoint[] {
+  const points: DataPoint[] = []
+  const n = Math.min(x.length, y.length)
+  for (let i = 0; i < n; i++) {
+    if (!Number.isNaN(x[i]) && !Number.isNaN(y[i])) {
+      points.push({ x: x[i], y: y[i] })
+    }
+  }
+  return points
+}
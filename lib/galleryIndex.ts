@@ -0,0 +1,231 @@
+import type { GalleryFilters } from '@/lib/gallery-types'
+
+/**
+ * Reader for the search index written by the gallery build
+ * (scripts/gallery/search.py). Items are referred to by their position in
+ * `items`; every posting list is sorted. Text and facet filters are map
+ * lookups plus posting-list intersections (a Latin-script query word scans
+ * the vocabulary of distinct words, not the items), and palette queries only
+ * rank the items whose colors share a Lab cell with (or next to) a query
+ * color, so none of them scans the whole gallery.
+ */
+
+export type Lab = [number, number, number]
+
+export interface GalleryIndex {
+  version: number
+  items: string[]
+  text: Record<string, number[]>
+  facets: Record<'chartTypes' | 'journalStyles' | 'colorTones', Record<string, number[]>>
+  palettes: {
+    space: 'CIELAB-D65'
+    /** Edge length of the Lab cells keyed in `cells` */
+    cell: number
+    /** Each item's colorPalette in Lab */
+    declared: Lab[][]
+    /** Dominant colors of each item's thumbnail: L, a, b and pixel share */
+    rendered: [number, number, number, number][][]
+    cells: Record<string, number[]>
+    /** Each item's nearest palettes, closest first */
+    similar: number[][]
+  }
+}
+
+/** A loaded index plus lookup structures derived from it once. */
+export interface GallerySearch {
+  index: GalleryIndex
+  /** Indexed Latin-script words, sorted, for substring matching */
+  vocabulary: string[]
+  positions: Map<string, number>
+}
+
+const CJK = '\\u3400-\\u4dbf\\u4e00-\\u9fff\\uf900-\\ufaff'
+const TOKENS = new RegExp(`([${CJK}]+)|[0-9a-z\\u00c0-\\u024f]+`, 'g')
+const CJK_RUN = new RegExp(`^[${CJK}]+$`)
+
+export function createGallerySearch(index: GalleryIndex): GallerySearch {
+  const vocabulary = Object.keys(index.text)
+    .filter((term) => !CJK_RUN.test(term))
+    .sort()
+  const positions = new Map<string, number>(index.items.map((id, n) => [id, n]))
+  return { index, vocabulary, positions }
+}
+
+/**
+ * Fetch the index, e.g. `${GALLERY_CDN_BASE}/gallery/search-index.json`.
+ */
+export async function loadGallerySearch(url: string): Promise<GallerySearch> {
+  const response = await fetch(url)
+  if (!response.ok) {
+    throw new Error(`Failed to load search index: ${response.status}`)
+  }
+  return createGallerySearch(await response.json())
+}
+
+// ---- Posting lists ----
+
+/** Positions in both sorted posting lists. */
+export function intersect(a: number[], b: number[]): number[] {
+  const out: number[] = []
+  let i = 0
+  let j = 0
+  while (i < a.length && j < b.length) {
+    if (a[i] === b[j]) {
+      out.push(a[i])
+      i++
+      j++
+    } else if (a[i] < b[j]) {
+      i++
+    } else {
+      j++
+    }
+  }
+  return out
+}
+
+function union(lists: number[][]): number[] {
+  return Array.from(new Set(lists.flat())).sort((a, b) => a - b)
+}
+
+function intersectAll(lists: number[][]): number[] {
+  return lists.reduce(intersect)
+}
+
+// ---- Text ----
+
+/**
+ * Items matching every word of `query`, or null for a blank query.
+ * Latin-script words match indexed words they occur in ("map" finds
+ * "heatmap"); a run of Chinese characters matches items containing all of
+ * its bigrams. A query with nothing indexable in it (only punctuation or
+ * symbols, e.g. "%") matches no items.
+ */
+export function searchText(search: GallerySearch, query: string): number[] | null {
+  const { text } = search.index
+  const normalized = query.normalize('NFKC').toLowerCase()
+  if (!normalized.trim()) return null
+  const lists: number[][] = []
+  for (const match of normalized.matchAll(TOKENS)) {
+    const run = match[1]
+    if (run === undefined) {
+      const word = match[0]
+      lists.push(union(search.vocabulary.filter((w) => w.includes(word)).map((w) => text[w])))
+    } else if (run.length === 1) {
+      lists.push(text[run] ?? [])
+    } else {
+      for (let i = 0; i < run.length - 1; i++) {
+        lists.push(text[run.slice(i, i + 2)] ?? [])
+      }
+    }
+  }
+  return lists.length ? intersectAll(lists) : []
+}
+
+// ---- Facets ----
+
+/** Items carrying any of `values` for one facet, or null when no value is chosen. */
+export function facetItems(
+  search: GallerySearch,
+  facet: keyof GalleryIndex['facets'],
+  values: string[]
+): number[] | null {
+  if (!values.length) return null
+  const postings = search.index.facets[facet]
+  return union(values.map((value) => postings[value] ?? []))
+}
+
+/**
+ * Gallery ids matching the filters, in catalog order. Facets give the same
+ * result as getFilteredItems in the gallery store. Text search is by word
+ * rather than by raw substring, so it differs from the store for some
+ * queries: a multi-word query matches items containing each word anywhere
+ * in the indexed text, not the words as one phrase, and punctuation and
+ * symbols are ignored ("t-test" is "t" and "test"; "%" alone matches nothing).
+ */
+export function filterItems(search: GallerySearch, filters: GalleryFilters): string[] {
+  const lists = [
+    facetItems(search, 'chartTypes', filters.chartTypes),
+    facetItems(search, 'journalStyles', filters.journalStyles),
+    facetItems(search, 'colorTones', filters.colorTones),
+    searchText(search, filters.search),
+  ].filter((list): list is number[] => list !== null)
+  const items = search.index.items
+  return lists.length ? intersectAll(lists).map((n) => items[n]) : [...items]
+}
+
+// ---- Palettes ----
+
+function linear(channel: number): number {
+  return channel <= 0.04045 ? channel / 12.92 : ((channel + 0.055) / 1.055) ** 2.4
+}
+
+function labF(t: number): number {
+  return t > 216 / 24389 ? Math.cbrt(t) : ((24389 / 27) * t + 16) / 116
+}
+
+/** CIELAB (D65) of a '#rrggbb' color, matching the build's conversion. */
+export function hexToLab(hex: string): Lab {
+  const value = parseInt(hex.replace('#', ''), 16)
+  const r = linear(((value >> 16) & 0xff) / 255)
+  const g = linear(((value >> 8) & 0xff) / 255)
+  const b = linear((value & 0xff) / 255)
+  const x = labF((0.4124564 * r + 0.3575761 * g + 0.1804375 * b) / 0.95047)
+  const y = labF(0.2126729 * r + 0.7151522 * g + 0.072175 * b)
+  const z = labF((0.0193339 * r + 0.119192 * g + 0.9503041 * b) / 1.08883)
+  return [116 * y - 16, 500 * (x - y), 200 * (y - z)]
+}
+
+function deltaE(p: Lab, q: Lab): number {
+  return Math.hypot(p[0] - q[0], p[1] - q[1], p[2] - q[2])
+}
+
+/** Weighted mean distance from each color to the other palette's nearest, both ways. */
+function paletteDistance(a: Lab[], aWeights: number[], b: Lab[], bWeights: number[]): number {
+  const oneWay = (from: Lab[], weights: number[], to: Lab[]) =>
+    from.reduce((sum, p, i) => sum + weights[i] * Math.min(...to.map((q) => deltaE(p, q))), 0)
+  return (oneWay(a, aWeights, b) + oneWay(b, bWeights, a)) / 2
+}
+
+function cellKey(lab: Lab, cell: number, offset: Lab = [0, 0, 0]): string {
+  return lab.map((v, i) => Math.floor(v / cell) + offset[i]).join(',')
+}
+
+const NEIGHBOURS: Lab[] = [-1, 0, 1].flatMap((l) =>
+  [-1, 0, 1].flatMap((a) => [-1, 0, 1].map((b) => [l, a, b] as Lab))
+)
+
+/**
+ * Up to `count` gallery ids whose palettes are closest to `colors`
+ * ('#rrggbb'), nearest first. Declared and rendered palettes are averaged,
+ * as for `similar` in the index.
+ */
+export function nearestPalettes(search: GallerySearch, colors: string[], count = 8): string[] {
+  if (!colors.length) return []
+  const { cell, cells, declared, rendered } = search.index.palettes
+  const query = colors.map(hexToLab)
+  const weights = query.map(() => 1 / query.length)
+  const candidates = union(
+    query.flatMap((lab) => NEIGHBOURS.map((offset) => cells[cellKey(lab, cell, offset)] ?? []))
+  )
+  const ranked = candidates.map((n) => {
+    const distances: number[] = []
+    if (declared[n].length) {
+      const w = declared[n].map(() => 1 / declared[n].length)
+      distances.push(paletteDistance(query, weights, declared[n], w))
+    }
+    if (rendered[n].length) {
+      const labs = rendered[n].map(([l, a, b]) => [l, a, b] as Lab)
+      distances.push(paletteDistance(query, weights, labs, rendered[n].map((c) => c[3])))
+    }
+    return { n, distance: distances.reduce((a, b) => a + b, 0) / distances.length }
+  })
+  ranked.sort((a, b) => a.distance - b.distance || a.n - b.n)
+  return ranked.slice(0, count).map(({ n }) => search.index.items[n])
+}
+
+/** Gallery ids with the palettes nearest to item `id`, nearest first. */
+export function similarItems(search: GallerySearch, id: string): string[] {
+  const n = search.positions.get(id)
+  if (n === undefined) return []
+  return search.index.palettes.similar[n].map((m) => search.index.items[m])
+}
@@ -0,0 +1,57 @@
+"""
+Round-trip benchmark of curve extraction against the generated line figures.
+
+Renders g-001, g-009, g-011, g-015 and g-020 to raster at several DPIs,
+extracts every series back with the NumPy extraction engine and reports
+accuracy (RMSE against the true data, normalized by each series' y range)
+and throughput (scanned pixels per second). Use it to judge tolerance and
+outlier-filter changes on both fidelity and speed.
+
+Usage:
+    python scripts/benchmark-extraction.py
+    python scripts/benchmark-extraction.py --dpis 100 200 --tolerance 20 40 --window 7
+    python scripts/benchmark-extraction.py --fixtures    (also save PNG + truth JSON)
+
+Output:
+    gallery_output/benchmarks/extraction/report.json
+    gallery_output/benchmarks/extraction/<id>@<dpi>.png|json   (with --fixtures)
+"""
+
+import argparse
+import json
+
+from gallery.extraction import OUTLIER_SIGMAS, OUTLIER_WINDOW
+from gallery.registry import load_figures, select
+from gallery.roundtrip import BENCH_DIR, DEFAULT_DPIS, TARGETS, print_report, run, summarize, write_fixtures
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description='Benchmark curve extraction on generated figures.')
+    parser.add_argument('figures', nargs='*', metavar='ID', help=f'subset of {", ".join(TARGETS)}')
+    parser.add_argument('--dpis', nargs='+', type=int, default=list(DEFAULT_DPIS), help='raster DPIs')
+    parser.add_argument('--tolerance', nargs='+', type=float, default=[30], help='color tolerances to compare')
+    parser.add_argument('--step', type=int, default=1, help='column sampling step (default: 1)')
+    parser.add_argument('--window', type=int, default=OUTLIER_WINDOW, help='outlier filter window')
+    parser.add_argument('--sigmas', type=float, default=OUTLIER_SIGMAS, help='outlier filter threshold')
+    parser.add_argument('--fixtures', action='store_true', help='save rasters with true series and calibration')
+    args = parser.parse_args()
+
+    try:
+        figures = select(select(load_figures(), TARGETS), args.figures)
+    except KeyError as e:
+        parser.error(e.args[0])
+
+    report = []
+    for tolerance in args.tolerance:
+        settings = f'tolerance {tolerance:g}, step {args.step}, window {args.window}, {args.sigmas:g} sigma'
+        results = run(figures, args.dpis, tolerance, args.step, args.window, args.sigmas)
+        summary = summarize(results)
+        print_report(summary, settings)
+        print()
+        report.append({'tolerance': tolerance, 'step': args.step, 'window': args.window,
+                       'sigmas': args.sigmas, 'summary': summary, 'series': results})
+
+    BENCH_DIR.mkdir(parents=True, exist_ok=True)
+    (BENCH_DIR / 'report.json').write_text(json.dumps(report, indent=2), encoding='utf-8')
+    if args.fixtures:
+        write_fixtures(figures, args.dpis)
+    print(f'Report: {BENCH_DIR / "report.json"}')
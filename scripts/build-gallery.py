@@ -0,0 +1,36 @@
+"""
+Build the whole scientific figure gallery (g-001 … g-030) in one run.
+
+Loads the figure registries of generate-gallery-figures.py and
+generate-gallery-supplement.py and renders them through the shared
+pipeline in scripts/gallery/.
+
+Usage:
+    python scripts/build-gallery.py [g001 g021 ...]
+    python scripts/build-gallery.py --styles nature ieee science cell --palettes original nature vibrant
+    python scripts/build-gallery.py --publish --formats png pdf
+    python scripts/build-gallery.py --publish --atlas --compress
+    python scripts/build-gallery.py --publish --search-index
+    python scripts/build-gallery.py --supervised --timeout 60 --max-rss 1024 --recycle-after 5
+    python scripts/build-gallery.py --events build-events.jsonl --metrics gallery.prom
+    python scripts/build-gallery.py --shard 2/4 --shard-dir /shared/gallery --publish
+    python scripts/build-gallery.py --merge --shard-dir /shared/gallery --atlas --compress
+
+Output:
+    gallery_output/*.svg                              (30 SVG files)
+    gallery_output/*.data.bin                         (float32 data sidecars)
+    gallery_output/variants/<style>/<palette>/*.svg   (with --styles/--palettes)
+    gallery_output/gallery/*.<hash>.*, manifest.json  (with --publish)
+    gallery_output/gallery/atlas-<n>.<hash>.webp|png, atlas.json  (with --atlas)
+    gallery_output/gallery/search-index.json          (with --search-index)
+    *.svg.br, *.svg.gz, *.json.br, *.json.gz          (with --compress)
+    gallery_output/compress-report.json               (with --compress)
+    <shard dir>/gallery/<I>-of-<N>/, costs.json       (with --shard)
+    gallery_output/build-report.json                  (with --merge)
+"""
+
+from gallery.build import main
+from gallery.registry import load_figures
+
+if __name__ == '__main__':
+    main(load_figures(), 'gallery figures', name='gallery')
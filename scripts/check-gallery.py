@@ -0,0 +1,49 @@
+"""
+Visual regression check of the gallery against stored baselines.
+
+Rasterizes every built SVG in gallery_output/ in a process pool (with
+PyMuPDF; without it, figures are drawn again through Agg), compares
+perceptual hashes with the baselines and pixel-diffs only the figures whose
+hashes moved. Build the gallery first, then run it
+after changing rcParams, matplotlib versions or generator code; exits
+non-zero if any figure changed visibly, is new or has no SVG.
+
+Usage:
+    python scripts/check-gallery.py --update          (record baselines)
+    python scripts/check-gallery.py [g001 g021 ...] [--workers 4]
+    python scripts/check-gallery.py --tolerance 32 --max-changed 0.005
+
+Output:
+    gallery_output/regression/baseline/<id>.png, hashes.json   (with --update)
+    gallery_output/regression/report/index.html, report.json, <id>.diff.png
+"""
+
+import argparse
+import sys
+
+from gallery.registry import load_figures, select
+from gallery.regress import DPI, MAX_CHANGED, REPORT_DIR, TOLERANCE, check, print_summary, update_baselines
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description='Check gallery figures for visual changes.')
+    parser.add_argument('figures', nargs='*', metavar='ID', help='figure ids to check (default: all)')
+    parser.add_argument('--update', action='store_true', help='store the current rasters as baselines')
+    parser.add_argument('--workers', type=int, help='rasterizing processes (default: CPU count)')
+    parser.add_argument('--dpi', type=int, default=DPI, help=f'raster resolution (default: {DPI})')
+    parser.add_argument('--tolerance', type=int, default=TOLERANCE,
+                        help=f'per-channel difference counted as a changed pixel (default: {TOLERANCE})')
+    parser.add_argument('--max-changed', type=float, default=MAX_CHANGED,
+                        help=f'changed-pixel fraction still accepted as minor (default: {MAX_CHANGED})')
+    args = parser.parse_args()
+
+    try:
+        figures = select(load_figures(), args.figures)
+    except KeyError as e:
+        parser.error(e.args[0])
+
+    if args.update:
+        sys.exit(1 if update_baselines(figures, args.dpi, args.workers) else 0)
+    report = check(figures, args.dpi, args.workers, args.tolerance, args.max_changed)
+    print_summary(report)
+    print(f'Report: {REPORT_DIR / "index.html"}')
+    sys.exit(1 if any(r['status'] in ('changed', 'new', 'error') for r in report['figures']) else 0)
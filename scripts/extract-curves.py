@@ -0,0 +1,51 @@
+"""
+Batch curve extraction from figure images (NumPy port of lib/extraction.ts).
+
+Extracts the curve drawn in one color from every image and writes one JSON
+line per image with its data points, using a calibration exported from the
+app (lib/types.ts Calibration JSON).
+
+Usage:
+    python scripts/extract-curves.py figures/*.png --color '#E15759' --calibration cal.json
+    python scripts/extract-curves.py scans/ --color '#1F77B4' --tolerance 20 --step 2 > curves.jsonl
+
+Output (stdout, or --out):
+    {"image": "figures/a.png", "points": [[x, y], ...]}
+"""
+
+import argparse
+import json
+import sys
+import time
+from pathlib import Path
+
+from gallery.calibration import Calibration
+from gallery.extraction import extract_many, hex_to_rgb
+
+IMAGE_SUFFIXES = {'.png', '.jpg', '.jpeg', '.webp', '.bmp', '.gif', '.tif', '.tiff'}
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description='Extract curves from many figure images.')
+    parser.add_argument('images', nargs='+', help='image files or directories')
+    parser.add_argument('--color', required=True, help='curve color as #RRGGBB')
+    parser.add_argument('--calibration', required=True, help='calibration JSON file')
+    parser.add_argument('--tolerance', type=float, default=30, help='RGB distance tolerance (default: 30)')
+    parser.add_argument('--step', type=int, default=1, help='column sampling step (default: 1)')
+    parser.add_argument('--workers', type=int, help='extraction threads (default: CPU count)')
+    parser.add_argument('--out', help='write JSON lines here instead of stdout')
+    args = parser.parse_args()
+
+    paths = []
+    for arg in map(Path, args.images):
+        paths.extend(sorted(p for p in arg.rglob('*') if p.suffix.lower() in IMAGE_SUFFIXES)
+                     if arg.is_dir() else [arg])
+    calibration = Calibration.from_json(json.loads(Path(args.calibration).read_text(encoding='utf-8')))
+
+    out = open(args.out, 'w', encoding='utf-8') if args.out else sys.stdout
+    t0 = time.perf_counter()
+    for path, (x, y) in extract_many(paths, hex_to_rgb(args.color), args.tolerance,
+                                     calibration, args.step, args.workers):
+        out.write(json.dumps({'image': str(path), 'points': [[a, b] for a, b in zip(x.tolist(), y.tolist())]}) + '\n')
+    if out is not sys.stdout:
+        out.close()
+    print(f'Extracted {len(paths)} images in {time.perf_counter() - t0:.2f}s', file=sys.stderr)
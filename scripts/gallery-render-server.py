@@ -0,0 +1,45 @@
+"""
+Warm render server for on-demand gallery figure previews.
+
+Keeps matplotlib, seaborn, scipy and the font cache loaded and answers
+JSON-lines render requests (see scripts/gallery/server.py for the protocol)
+from a worker pool with a bounded request queue.
+
+Usage:
+    python scripts/gallery-render-server.py                          # stdin/stdout
+    python scripts/gallery-render-server.py --port 8765              # TCP on 127.0.0.1
+    python scripts/gallery-render-server.py --socket /tmp/gallery.sock
+
+Example:
+    echo '{"id": 1, "figure": "g-011", "style": "ieee"}' | python scripts/gallery-render-server.py
+"""
+
+import argparse
+import sys
+import time
+
+from gallery.registry import load_figures
+from gallery.server import RenderServer, serve_socket, serve_stdio
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description='Serve gallery renders over JSON lines.')
+    transport = parser.add_mutually_exclusive_group()
+    transport.add_argument('--port', type=int, help='listen on 127.0.0.1:PORT (0 picks a free port)')
+    transport.add_argument('--socket', help='listen on a Unix domain socket')
+    parser.add_argument('--workers', type=int, default=4, help='render threads (default: 4)')
+    parser.add_argument('--max-queue', type=int, default=64,
+                        help='requests queued beyond the workers before reads block (default: 64)')
+    parser.add_argument('--no-warm-up', action='store_true', help='skip the start-up warm-up render')
+    args = parser.parse_args()
+
+    t0 = time.perf_counter()
+    server = RenderServer(load_figures(), workers=args.workers, max_queue=args.max_queue)
+    if not args.no_warm_up:
+        server.warm_up()
+    print(f'Render server ready in {time.perf_counter() - t0:.2f}s '
+          f'({args.workers} workers)', file=sys.stderr)
+
+    if args.port is not None or args.socket:
+        serve_socket(server, port=args.port or 0, unix_path=args.socket)
+    else:
+        serve_stdio(server)
@@ -0,0 +1,30 @@
+"""
+Watch the gallery generator scripts and hot re-render changed figures.
+
+Only figures whose data or drawing functions changed (compared by AST, so
+formatting and comments are ignored) are re-rendered into gallery_output/
+(gallery_output/variants/<style>/<palette>/ with --style or --palette);
+everything else stays as it is.
+
+Usage:
+    python scripts/gallery-watch.py
+    python scripts/gallery-watch.py --build-first --style nature
+"""
+
+import argparse
+
+from gallery.style import ORIGINAL, PALETTES, STYLES
+from gallery.watch import Watcher
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description='Hot re-render gallery figures on change.')
+    parser.add_argument('scripts', nargs='*', help='scripts to watch (default: scripts/generate-gallery-*.py)')
+    parser.add_argument('--build-first', action='store_true', help='render every figure once before watching')
+    parser.add_argument('--style', choices=list(STYLES), help='journal style preset to render with')
+    parser.add_argument('--palette', choices=[ORIGINAL, *PALETTES], help='palette to render with')
+    parser.add_argument('--interval', type=float, default=0.5, help='poll interval in seconds (default: 0.5)')
+    args = parser.parse_args()
+
+    watcher = Watcher(args.scripts, style=args.style, palette=args.palette)
+    watcher.load(render_all=args.build_first)
+    watcher.run(args.interval)
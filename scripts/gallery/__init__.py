@@ -0,0 +1,13 @@
+"""
+Shared build pipeline for the scientific figure gallery.
+
+The generator scripts (scripts/generate-gallery-*.py) only describe figures:
+each one registers a data stage and a drawing stage per gallery id. This
+package loads those registries and owns everything around them — styling,
+rendering and writing gallery_output/.
+"""
+
+from pathlib import Path
+
+ROOT_DIR = Path(__file__).resolve().parent.parent.parent
+OUTPUT_DIR = ROOT_DIR / 'gallery_output'
@@ -0,0 +1,143 @@
+"""
+Thumbnail sprite atlases for the gallery grid.
+
+The published thumbnails (see manifest.py) are packed into a few large
+images so the grid needs one request and decode per page instead of one per
+card. Gallery cards show thumbnails in a 4:3 box with ``object-cover``, so
+every thumbnail is cover-cropped into a CELL-sized slot of a fixed grid and
+the front end can position the sprite exactly where the <img> would be.
+
+atlas.json maps gallery ids to sprites:
+
+    {"version": 1, "cell": [320, 240], "columns": 8, "rows": 8,
+     "pages": [{"webp": {"path": "/gallery/atlas-0.1f2e3d4c5b.webp", "bytes": ...},
+                "png": {...}, "width": 2560, "height": 960}],
+     "sprites": {"g-001": {"page": 0, "slot": 0, "x": 0, "y": 0, "w": 320, "h": 240, "sha256": "..."}}}
+
+Packing is incremental: a figure keeps its slot across builds, a changed
+thumbnail is redrawn in place, and a new figure takes the first free slot,
+so only the pages that actually changed are re-encoded (and get new names).
+"""
+
+import io
+import json
+
+from PIL import Image, ImageOps
+
+from .manifest import PUBLISH_DIR, URL_PREFIX, hashed_name
+from .output import ChangeLog
+
+CELL = (320, 240)
+COLUMNS, ROWS = 8, 8
+BACKGROUND = (255, 255, 255, 0)
+WEBP_QUALITY = 90
+
+
+def _encode(image, fmt):
+    buf = io.BytesIO()
+    if fmt == 'webp':
+        image.save(buf, format='WEBP', quality=WEBP_QUALITY, method=6)
+    else:
+        image.save(buf, format='PNG', optimize=True)
+    return buf.getvalue()
+
+
+def _slot_xy(slot):
+    return (slot % COLUMNS) * CELL[0], (slot // COLUMNS) * CELL[1]
+
+
+def _load_previous(path):
+    try:
+        atlas = json.loads(path.read_text(encoding='utf-8'))
+    except FileNotFoundError:
+        return None
+    if (atlas.get('version') != 1 or atlas.get('cell') != list(CELL)
+            or atlas.get('columns') != COLUMNS or atlas.get('rows') != ROWS):
+        return None  # layout changed: repack from scratch
+    return atlas
+
+
+def _page_image(page, out_dir):
+    """A full-size page holding its previous pixels (lossless PNG), if any."""
+    image = Image.new('RGBA', (COLUMNS * CELL[0], ROWS * CELL[1]), BACKGROUND)
+    if page is not None:
+        try:
+            with Image.open(out_dir / page['png']['path'].rsplit('/', 1)[-1]) as previous:
+                image.paste(previous.convert('RGBA'), (0, 0))
+        except FileNotFoundError:
+            pass
+    return image
+
+
+def build_atlas(manifest, out_dir=PUBLISH_DIR):
+    """Pack manifest thumbnails into atlas pages; returns the atlas map."""
+    atlas_path = out_dir / 'atlas.json'
+    previous = _load_previous(atlas_path)
+    old_sprites = previous['sprites'] if previous else {}
+    old_pages = previous['pages'] if previous else []
+    per_page = COLUMNS * ROWS
+
+    thumbs = {fid: entry['assets']['thumbnail'] for fid, entry in sorted(manifest['figures'].items())
+              if 'thumbnail' in entry['assets']}
+    # Keep every surviving figure's slot; free the slots of removed figures
+    slots = {fid: s['page'] * per_page + s['slot'] for fid, s in old_sprites.items() if fid in thumbs}
+    dirty = {}  # page -> {slot: figure id or None (clear)}
+    for fid, sprite in old_sprites.items():
+        if fid not in thumbs:
+            dirty.setdefault(sprite['page'], {})[sprite['slot']] = None
+    taken = set(slots.values())
+    free = (i for i in range(per_page * (len(thumbs) + 1)) if i not in taken)
+    for fid, thumb in thumbs.items():
+        if fid not in slots:
+            slots[fid] = next(free)
+        elif old_sprites[fid]['sha256'] == thumb['sha256'] and old_sprites[fid]['page'] < len(old_pages):
+            continue
+        page, slot = divmod(slots[fid], per_page)
+        dirty.setdefault(page, {})[slot] = fid
+
+    n_pages = max((s // per_page for s in slots.values()), default=-1) + 1
+    log = ChangeLog(out_dir.parent)
+    pages = []
+    for index in range(n_pages):
+        old = old_pages[index] if index < len(old_pages) else None
+        if index not in dirty and old is not None:
+            pages.append(old)
+            continue
+        image = _page_image(old, out_dir)
+        for slot, fid in sorted(dirty.get(index, {}).items()):
+            x, y = _slot_xy(slot)
+            image.paste(Image.new('RGBA', CELL, BACKGROUND), (x, y))
+            if fid is None:
+                continue
+            with Image.open(out_dir / thumbs[fid]['path'].rsplit('/', 1)[-1]) as thumb:
+                image.paste(ImageOps.fit(thumb.convert('RGBA'), CELL, Image.LANCZOS), (x, y))
+        # Trim to the rows in use so a part-filled page decodes smaller
+        rows = max((s % per_page // COLUMNS for s in slots.values() if s // per_page == index), default=0) + 1
+        image = image.crop((0, 0, image.width, rows * CELL[1]))
+        entry = {'width': image.width, 'height': image.height}
+        for fmt in ('webp', 'png'):
+            content = _encode(image, fmt)
+            name = hashed_name(f'atlas-{index}.{fmt}', content)
+            log.write(out_dir / name, content)
+            entry[fmt] = {'path': f'{URL_PREFIX}/{name}', 'bytes': len(content)}
+        pages.append(entry)
+
+    sprites = {}
+    for fid, index in sorted(slots.items()):
+        page, slot = divmod(index, per_page)
+        x, y = _slot_xy(slot)
+        sprites[fid] = {'page': page, 'slot': slot, 'x': x, 'y': y, 'w': CELL[0], 'h': CELL[1],
+                        'sha256': thumbs[fid]['sha256']}
+    atlas = {'version': 1, 'cell': list(CELL), 'columns': COLUMNS, 'rows': ROWS,
+             'pages': pages, 'sprites': sprites}
+    log.write(atlas_path, (json.dumps(atlas, indent=2) + '\n').encode('utf-8'))
+
+    live = {p[fmt]['path'].rsplit('/', 1)[-1] for p in pages for fmt in ('webp', 'png')}
+    for stale in out_dir.glob('atlas-*.*.*'):
+        if stale.name not in live and not stale.name.startswith('.'):
+            stale.unlink()
+    redrawn = sum(len(v) for v in dirty.values())
+    print(f'\nAtlas: {len(sprites)} thumbnails on {n_pages} page(s), '
+          f'{redrawn} slot(s) redrawn, {len(dirty)} page(s) re-encoded')
+    print(log.summary())
+    return atlas
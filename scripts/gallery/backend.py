@@ -0,0 +1,166 @@
+"""
+Pyplot-free rendering backend.
+
+Drawing stages build plain ``matplotlib.figure.Figure`` objects through
+``new_figure`` and never touch pyplot, so there is no global figure manager
+to register with or close, and a figure is freed as soon as it goes out of
+scope. Rendering returns the encoded bytes from an explicit Agg/SVG/PDF
+canvas, which makes ``render`` safe to call from a thread pool or from an
+embedding service.
+
+rcParams are still process-global in matplotlib, and parts of a figure (tick
+objects, generic font families) read them lazily while saving. Per-render
+styles are therefore applied through a StyleGate: renders that share a style
+run concurrently, and switching to another style waits until in-flight
+renders have finished, so styles never bleed into each other.
+
+Output is byte-deterministic: SVG ids come from a fixed hash salt (BASE_RC)
+and the creation dates that SVG and PDF would otherwise embed are dropped.
+"""
+
+import io
+import threading
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from contextlib import contextmanager
+
+import matplotlib
+from matplotlib.backends.backend_agg import FigureCanvasAgg
+from matplotlib.backends.backend_pdf import FigureCanvasPdf
+from matplotlib.backends.backend_svg import FigureCanvasSVG
+from matplotlib.figure import Figure
+from matplotlib.mathtext import MathTextParser
+
+from .style import fit_palette, style_rc
+
+CANVASES = {
+    'svg': FigureCanvasSVG,
+    'png': FigureCanvasAgg,
+    'pdf': FigureCanvasPdf,
+}
+
+# Drop embedded timestamps so identical figures encode to identical bytes
+METADATA = {
+    'svg': {'Date': None},
+    'pdf': {'CreationDate': None},
+}
+
+
+def new_figure(**kwargs):
+    """A standalone Figure bound to an Agg canvas (for layout and text metrics)."""
+    fig = Figure(**kwargs)
+    FigureCanvasAgg(fig)
+    return fig
+
+
+class StyleGate:
+    """Share the process-wide rcParams between concurrent renders.
+
+    Any number of threads may hold the gate for the same style. A thread that
+    needs another style becomes the pending style: new entrants queue behind
+    it, and once the current holders drain rcParams are swapped. This keeps a
+    steady stream of one style from starving the others.
+    """
+
+    def __init__(self):
+        self._cond = threading.Condition()
+        self._style = None
+        self._pending = None
+        self._active = 0
+        self._defaults = None
+
+    def _admissible(self, key):
+        if self._pending is None:
+            return not self._active or self._style == key
+        return not self._active and self._pending == key
+
+    @contextmanager
+    def use(self, style=None):
+        key = style or 'custom'
+        rc = style_rc(key)
+        with self._cond:
+            try:
+                while not self._admissible(key):
+                    if self._pending is None:
+                        self._pending = key
+                    self._cond.wait()
+            except BaseException:
+                if self._pending == key:
+                    self._pending = None
+                    self._cond.notify_all()
+                raise
+            if self._pending == key:
+                self._pending = None
+            if self._style != key:
+                if self._defaults is None:
+                    self._defaults = dict(matplotlib.rcParams.copy())
+                    del self._defaults['backend']
+                matplotlib.rcParams.update(self._defaults)
+                matplotlib.rcParams.update(rc)
+                self._style = key
+            self._active += 1
+        try:
+            yield
+        finally:
+            with self._cond:
+                self._active -= 1
+                self._cond.notify_all()
+
+
+GATE = StyleGate()
+
+# matplotlib keeps a single mathtext parser per process and its parse state
+# is not re-entrant; serialize parsing (results stay lru-cached).
+_MATHTEXT_LOCK = threading.Lock()
+_parse_cached = MathTextParser._parse_cached
+
+
+def _locked_parse_cached(self, *args):
+    with _MATHTEXT_LOCK:
+        return _parse_cached(self, *args)
+
+
+MathTextParser._parse_cached = _locked_parse_cached
+
+
+def render(figure, data, style=None, palette=None, fmt='svg', dpi=None):
+    """Draw a registered figure and return the encoded bytes.
+
+    ``dpi`` overrides the figure dpi for raster output (e.g. thumbnails).
+    """
+    if fmt not in CANVASES:
+        raise ValueError(f'Unsupported format {fmt!r}; choose from {", ".join(CANVASES)}')
+    composite = getattr(figure.draw, 'render_svg', None)
+    if fmt == 'svg' and composite is not None:
+        # Multi-panel figures render and cache panel by panel (panels.py)
+        return composite(data, fit_palette(palette, figure.palette), style)
+    buf = io.BytesIO()
+    with GATE.use(style):
+        fig = figure.draw(data, fit_palette(palette, figure.palette))
+        CANVASES[fmt](fig)
+        fig.savefig(buf, format=fmt, dpi=dpi or 'figure', bbox_inches='tight',
+                    metadata=METADATA.get(fmt))
+    return buf.getvalue()
+
+
+def render_many(jobs, workers=None, on_start=None):
+    """Render ``(figure, data, style, palette, fmt)`` jobs on a thread pool.
+
+    Yields ``(job, bytes_or_exception)`` in completion order. Jobs are
+    submitted grouped by style so the gate swaps rcParams as rarely as
+    possible. ``on_start(job)`` is called from the worker thread just before
+    each job renders.
+    """
+    def run(job):
+        if on_start is not None:
+            on_start(job)
+        return render(*job)
+
+    jobs = sorted(jobs, key=lambda job: job[2] or '')
+    with ThreadPoolExecutor(max_workers=workers) as pool:
+        futures = {pool.submit(run, job): job for job in jobs}
+        for future in as_completed(futures):
+            try:
+                yield futures[future], future.result()
+            except Exception as e:
+                yield futures[future], e
+
@@ -0,0 +1,227 @@
+"""
+Static comparison charts for lib/benchmark-data.json.
+
+The JSON is parsed once into compact tables: per dataset/task, one
+``(settings, algorithms, metrics)`` float array (NaN for missing results)
+plus its labels. Three charts are drawn per table through the gallery
+backend, so they take the journal styles and palettes:
+
+* ``bars``  — grouped bars, one panel per metric, grouped by setting;
+* ``ranks`` — ranking heatmap (competition ranks per setting × metric);
+* ``radar`` — rank scores (1 = best) of the top algorithms.
+
+Charts are rendered on a thread pool. Each one is keyed by a digest of its
+table, style and palette (the rcParams and colors they resolve to) and
+drawing code (the chart function, the module helpers it reaches and the
+module's top-level code, as in watch mode), so
+after an edit to the JSON only the affected tables are re-rendered.
+index.json lists the charts per table for the benchmark pages.
+"""
+
+import hashlib
+import json
+import time
+from dataclasses import dataclass
+from pathlib import Path
+
+import numpy as np
+
+from . import OUTPUT_DIR, ROOT_DIR
+from .backend import new_figure, render_many
+from .output import ChangeLog
+from .panels import code_digest
+from .registry import Figure
+from .style import PALETTES, style_key
+
+DATA_PATH = ROOT_DIR / 'lib' / 'benchmark-data.json'
+CHART_DIR = OUTPUT_DIR / 'benchmarks' / 'charts'
+RADAR_TOP = 5
+
+
+@dataclass(frozen=True)
+class Table:
+    dataset: str
+    dataset_name: str
+    task: str
+    task_name: str
+    setting_label: str
+    settings: tuple
+    algorithms: tuple
+    metrics: tuple
+    lower_is_better: np.ndarray  # (metrics,) bool
+    values: np.ndarray           # (settings, algorithms, metrics) float32
+    digest: str                  # of the source JSON for this table
+
+    @property
+    def key(self):
+        return f'{self.dataset}-{self.task}'
+
+    def ranks(self):
+        """Competition ranks (1 = best, ties share) per setting/metric; NaN if missing."""
+        score = np.where(self.lower_is_better, self.values, -self.values).astype(np.float64)
+        missing = np.isnan(score)
+        score[missing] = np.inf
+        # ranks[s, a, m] = 1 + number of algorithms strictly better than a
+        better = score[:, None, :, :] < score[:, :, None, :]
+        ranks = 1 + better.sum(axis=2).astype(np.float64)
+        ranks[missing] = np.nan
+        return ranks
+
+    def rank_scores(self):
+        """Ranks mapped to [0, 1] per setting/metric, 1 = best.
+
+        Rank-based rather than min-max so one far-off result (Informer on
+        long horizons) doesn't squash everyone else together.
+        """
+        n = len(self.algorithms)
+        return (n - self.ranks()) / max(1, n - 1)
+
+
+def _digest(obj):
+    return hashlib.sha1(json.dumps(obj, sort_keys=True).encode('utf-8')).hexdigest()
+
+
+def load_tables(path=DATA_PATH):
+    raw = json.loads(Path(path).read_text(encoding='utf-8'))
+    datasets = {d['id']: d['name'] for d in raw['datasets']}
+    tasks = {t['id']: t['name'] for t in raw['taskCategories']}
+    tables = []
+    for table in raw['tables']:
+        settings = tuple(s['name'] for s in table['settings'])
+        algorithms = tuple(dict.fromkeys(r['algorithm'] for s in table['settings'] for r in s['results']))
+        column = {name: i for i, name in enumerate(algorithms)}
+        values = np.full((len(settings), len(algorithms), len(table['metricNames'])), np.nan, dtype=np.float32)
+        for i, setting in enumerate(table['settings']):
+            for result in setting['results']:
+                values[i, column[result['algorithm']]] = [np.nan if v is None else v for v in result['values']]
+        tables.append(Table(
+            table['datasetId'], datasets.get(table['datasetId'], table['datasetId']),
+            table['taskId'], tasks.get(table['taskId'], table['taskId']),
+            table['settingLabel'], settings, algorithms, tuple(table['metricNames']),
+            np.asarray(table['lowerIsBetter'], dtype=bool), values, _digest(table),
+        ))
+    return tables
+
+
+def _title(t):
+    return f'{t.dataset_name} — {t.task_name}'
+
+
+def draw_bars(t, colors):
+    n_settings, n_algos, n_metrics = t.values.shape
+    fig = new_figure(figsize=(max(6, 3.2 * n_metrics), 3.8))
+    axes = fig.subplots(1, n_metrics, squeeze=False)[0]
+    width = 0.8 / n_algos
+    x = np.arange(n_settings)
+    for m, ax in enumerate(axes):
+        for a, name in enumerate(t.algorithms):
+            ax.bar(x + (a - (n_algos - 1) / 2) * width, t.values[:, a, m], width,
+                   color=colors[a % len(colors)], label=name, linewidth=0)
+        ax.set_xticks(x)
+        ax.set_xticklabels(t.settings)
+        ax.set_xlabel(t.setting_label)
+        arrow = '↓' if t.lower_is_better[m] else '↑'
+        ax.set_title(f'{t.metrics[m]} {arrow}', fontsize=10, fontweight='bold')
+        ax.spines['top'].set_visible(False)
+        ax.spines['right'].set_visible(False)
+        ax.grid(True, axis='y', alpha=0.2, linewidth=0.5)
+    axes[-1].legend(frameon=False, fontsize=7, loc='upper left', bbox_to_anchor=(1.0, 1.0))
+    fig.suptitle(_title(t), fontsize=12, fontweight='bold')
+    fig.tight_layout()
+    return fig
+
+
+def draw_ranks(t, colors):
+    ranks = t.ranks()
+    order = np.argsort(np.nanmean(ranks, axis=(0, 2)))
+    grid = ranks[:, order, :].transpose(0, 2, 1).reshape(-1, len(order))  # (setting × metric, algos)
+    rows = [f'{s} · {m}' if len(t.settings) > 1 else m for s in t.settings for m in t.metrics]
+    fig = new_figure(figsize=(1.0 + 0.75 * len(order), 1.2 + 0.38 * len(rows)))
+    ax = fig.subplots()
+    im = ax.imshow(grid, cmap='YlGnBu_r', vmin=1, vmax=len(order), aspect='auto')
+    for (i, j), rank in np.ndenumerate(grid):
+        if not np.isnan(rank):
+            ax.text(j, i, f'{rank:.0f}', ha='center', va='center', fontsize=8,
+                    color='white' if rank <= len(order) / 2 else 'black')
+    ax.set_xticks(range(len(order)))
+    ax.set_xticklabels([t.algorithms[a] for a in order], rotation=35, ha='right', fontsize=8)
+    ax.set_yticks(range(len(rows)))
+    ax.set_yticklabels(rows, fontsize=8)
+    cbar = fig.colorbar(im, ax=ax, fraction=0.04, pad=0.02)
+    cbar.set_label('Rank (1 = best)', fontsize=8)
+    ax.set_title(_title(t), fontsize=11, fontweight='bold')
+    fig.tight_layout()
+    return fig
+
+
+def draw_radar(t, colors):
+    scores = t.rank_scores().transpose(0, 2, 1).reshape(-1, len(t.algorithms))  # (spokes, algos)
+    spokes = [f'{m}\n{s}' if len(t.settings) > 1 else m for s in t.settings for m in t.metrics]
+    top = np.argsort(np.nanmean(t.ranks(), axis=(0, 2)))[:RADAR_TOP]
+    angles = np.linspace(0, 2 * np.pi, len(spokes), endpoint=False)
+    closed = np.append(angles, angles[0])
+    fig = new_figure(figsize=(5.5, 5.5))
+    ax = fig.add_subplot(projection='polar')
+    for a in top:
+        values = np.nan_to_num(scores[:, a])
+        color = colors[a % len(colors)]  # same color as in the bar chart
+        ax.plot(closed, np.append(values, values[0]), color=color, linewidth=1.6, label=t.algorithms[a])
+        ax.fill(closed, np.append(values, values[0]), color=color, alpha=0.08)
+    ax.set_xticks(angles)
+    ax.set_xticklabels(spokes, fontsize=8)
+    ax.set_ylim(0, 1.05)
+    ax.set_yticks([0.25, 0.5, 0.75, 1.0])
+    ax.set_yticklabels([])
+    ax.legend(loc='upper right', bbox_to_anchor=(1.3, 1.1), frameon=False, fontsize=8)
+    ax.set_title(f'{_title(t)}\n(rank score, 1 = best)', fontsize=11, fontweight='bold', pad=18)
+    fig.tight_layout()
+    return fig
+
+
+CHARTS = {'bars': draw_bars, 'ranks': draw_ranks, 'radar': draw_radar}
+# Covers the helpers each chart calls (_title, ...) and module-level constants
+_CODE = {kind: code_digest(fn) for kind, fn in CHARTS.items()}
+
+
+def build_charts(tables, style='nature', palette='muted', workers=None, out_dir=CHART_DIR, force=False):
+    """Render every table's charts that changed since the last run."""
+    index_path = out_dir / 'index.json'
+    try:
+        previous = json.loads(index_path.read_text(encoding='utf-8'))['tables']
+    except FileNotFoundError:
+        previous = {}
+    colors = PALETTES[palette]
+    look = [style_key(style), repr(colors)]  # what the names resolve to, not just the names
+    jobs, index = [], {}
+    for t in tables:
+        entry = index.setdefault(t.key, {'dataset': t.dataset, 'task': t.task, 'charts': {}})
+        for kind, draw in CHARTS.items():
+            filename = f'{t.key}-{kind}.svg'
+            digest = _digest([t.digest, kind, style, palette, *look, _CODE[kind]])
+            entry['charts'][kind] = {'path': filename, 'digest': digest}
+            old = previous.get(t.key, {}).get('charts', {}).get(kind, {})
+            if force or old.get('digest') != digest or not (out_dir / filename).exists():
+                figure = Figure(f'{t.key}:{kind}', filename, lambda rng, t=t: t, draw, colors)
+                jobs.append((figure, t, style, None, 'svg'))
+
+    total = len(tables) * len(CHARTS)
+    print(f'{len(tables)} benchmark tables, {len(jobs)}/{total} charts to render into {out_dir}/ ...')
+    log = ChangeLog(OUTPUT_DIR)
+    failed = set()
+    t0 = time.perf_counter()
+    for (figure, *_), result in render_many(jobs, workers):
+        if isinstance(result, Exception):
+            print(f'[{figure.id}]   FAIL: {result}')
+            failed.add(figure.id)
+            continue
+        log.write(out_dir / figure.filename, result)
+        print(f'[{figure.id}]   OK: {figure.filename}')
+    for key, entry in index.items():
+        for kind, chart in entry['charts'].items():
+            if f'{key}:{kind}' in failed:
+                chart['digest'] = None  # retry next run
+    log.write(index_path, (json.dumps({'style': style, 'palette': palette, 'tables': index},
+                                      indent=2, ensure_ascii=False) + '\n').encode('utf-8'))
+    print(f'Done in {time.perf_counter() - t0:.2f}s, {len(failed)} failed')
+    print(log.summary())
+    return len(failed)
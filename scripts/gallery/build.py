@@ -0,0 +1,243 @@
+"""
+Command-line build loop shared by the generator scripts.
+
+Default mode renders each figure once into gallery_output/. Passing
+--styles and/or --palettes renders the style × palette matrix into
+gallery_output/variants/<style>/<palette>/, computing each figure's data
+once and re-running only its drawing stage per variant. --workers renders
+on a thread pool through the pyplot-free backend. --supervised renders each
+figure in a killable worker process with a timeout and RSS ceiling (see
+supervise.py) and exits non-zero if any figure failed.
+
+Next to each SVG goes a binary sidecar with the figure's data (see
+sidecar.py). Files are only rewritten when their bytes change; each run
+ends with a list of the files it changed. --publish then copies the build to content-hashed
+names with thumbnails and a manifest (see manifest.py), and --compress adds
+max-level .br/.gz siblings for every text asset (see compress.py). --atlas
+packs the published thumbnails into sprite atlases (see atlas.py).
+--events streams per-figure start/finish records as JSON lines and
+--metrics exports them as OpenMetrics histograms (see events.py).
+--search-index writes the front end's text, facet and palette index for the
+whole catalog (see search.py).
+
+--shard I/N renders one cost-balanced share of the registry into a shared
+shard directory, under the registry's ``name``, and --merge combines the
+finished shards into gallery_output/ with one manifest and build report
+(see shard.py).
+"""
+
+import argparse
+import sys
+import time
+from pathlib import Path
+
+from . import OUTPUT_DIR
+from .atlas import build_atlas
+from .backend import render_many
+from .compress import precompress, text_assets
+from .events import EventLog, write_openmetrics
+from .manifest import EXTRA_FORMATS, PUBLISH_DIR, load_manifest, publish
+from .output import ChangeLog, variant_path
+from .registry import select
+from .search import build_search_index
+from .shard import SHARD_DIR, merge, parse_shard, prepare, write_report
+from .sidecar import encode, sidecar_name
+from .style import ORIGINAL, PALETTES, STYLES
+from .supervise import rss_bytes, supervise
+
+
+def build(figures, label, workers=1, events=None, out_dir=OUTPUT_DIR):
+    """Render figures on a thread pool.
+
+    Returns the run's finish records and the computed data by figure id, so
+    publishing can reuse both instead of computing again.
+    """
+    print(f'Generating {len(figures)} {label} into {out_dir}/ ...\n')
+    events = events or EventLog()
+    first = len(events.finished)
+    events.emit('build_start', mode='threads', workers=workers, figures=len(figures))
+    log = ChangeLog(out_dir)
+    jobs = []
+    data_time, sidecars, computed = {}, {}, {}
+    for figure in figures:
+        t0 = time.perf_counter()
+        try:
+            data = figure.compute()
+            sidecar = encode(figure, data)
+        except Exception as e:
+            print(f'[{figure.name}]   FAIL: {e}')
+            events.finish(figure.id, 'error', error=type(e).__name__, seconds=time.perf_counter() - t0)
+            continue
+        log.write(out_dir / sidecar_name(figure.filename), sidecar)
+        data_time[figure.id], sidecars[figure.id] = time.perf_counter() - t0, len(sidecar)
+        computed[figure.id] = data
+        jobs.append((figure, data, None, None, 'svg'))
+
+    def on_start(job):
+        events.start(job[0].id, data_time[job[0].id])
+
+    for (figure, *_), result in render_many(jobs, workers, on_start):
+        if isinstance(result, Exception):
+            print(f'[{figure.name}]   FAIL: {result}')
+            events.finish(figure.id, 'error', error=type(result).__name__, rss=rss_bytes())
+            continue
+        changed = log.write(out_dir / figure.filename, result)
+        events.finish(figure.id, size=len(result) + sidecars[figure.id], changed=changed, rss=rss_bytes())
+        print(f'[{figure.name}]   OK: {figure.filename}{"" if changed else "  (unchanged)"}')
+    finished = events.finished[first:]
+    ok = sum(1 for r in finished if r['status'] == 'ok')
+    print(f'\nDone! {ok}/{len(figures)} SVGs saved to {out_dir}/')
+    print(log.summary())
+    return finished, computed
+
+
+def build_variants(figures, styles, palettes, workers=1, root=OUTPUT_DIR):
+    """Render every figure under every style × palette pair."""
+    out_dir = root / 'variants'
+    n_variants = len(styles) * len(palettes)
+    print(f'Rendering {len(figures)} figures × {n_variants} variants into {out_dir}/ ...\n')
+    log = ChangeLog(root)
+    jobs = []
+    data_time = 0.0
+    for figure in figures:
+        t0 = time.perf_counter()
+        try:
+            data = figure.compute()
+        except Exception as e:
+            print(f'[{figure.name}]   FAIL (data): {e}')
+            continue
+        data_time += time.perf_counter() - t0
+        jobs.extend((figure, data, style, palette, 'svg') for style in styles for palette in palettes)
+
+    t0 = time.perf_counter()
+    ok = {}
+    for (figure, _, style, palette, _), result in render_many(jobs, workers):
+        if isinstance(result, Exception):
+            print(f'[{figure.name}]   FAIL ({style}/{palette}): {result}')
+            continue
+        log.write(variant_path(root, figure.filename, style, palette), result)
+        ok[figure.name] = ok.get(figure.name, 0) + 1
+    draw_time = time.perf_counter() - t0
+
+    for figure in figures:
+        print(f'[{figure.name}]   OK: {ok.get(figure.name, 0)}/{n_variants} variants')
+    total = len(figures) * n_variants
+    print(f'\nDone! {sum(ok.values())}/{total} variants saved to {out_dir}/')
+    print(f'Data stage {data_time:.2f}s (once per figure), drawing stage {draw_time:.2f}s '
+          f'({workers} worker{"s" if workers != 1 else ""})')
+    print(log.summary())
+
+
+def _shard_arg(text):
+    try:
+        return parse_shard(text)
+    except ValueError:
+        raise argparse.ArgumentTypeError(f'expected I/N with 1 <= I <= N, got {text!r}') from None
+
+
+def main(figures, label='gallery figures', argv=None, name='gallery'):
+    parser = argparse.ArgumentParser(description=f'Render {label}.')
+    parser.add_argument('figures', nargs='*', metavar='ID',
+                        help="figure ids to render, e.g. g-001 or g001 (default: all)")
+    parser.add_argument('--styles', nargs='+', choices=list(STYLES), metavar='STYLE',
+                        help=f'journal style presets: {", ".join(STYLES)}')
+    parser.add_argument('--palettes', nargs='+', choices=[ORIGINAL, *PALETTES], metavar='PALETTE',
+                        help=f'palettes: {ORIGINAL}, {", ".join(PALETTES)}')
+    parser.add_argument('--workers', type=int, default=1,
+                        help='render threads (default: 1)')
+    parser.add_argument('--publish', action='store_true',
+                        help='write content-hashed assets, thumbnails and manifest.json to gallery_output/gallery/')
+    parser.add_argument('--formats', nargs='+', choices=EXTRA_FORMATS, default=[], metavar='FMT',
+                        help=f'extra formats to publish alongside SVG: {", ".join(EXTRA_FORMATS)}')
+    parser.add_argument('--atlas', action='store_true',
+                        help='pack published thumbnails into sprite atlases (gallery_output/gallery/atlas.json)')
+    parser.add_argument('--search-index', action='store_true',
+                        help='write the text, facet and palette index (gallery_output/gallery/search-index.json)')
+    parser.add_argument('--compress', action='store_true',
+                        help='write .br/.gz siblings for the SVG and JSON outputs')
+    parser.add_argument('--events', metavar='FILE',
+                        help="append JSON-lines build events to FILE ('-' for stdout)")
+    parser.add_argument('--metrics', metavar='FILE',
+                        help='write OpenMetrics render-time histograms to FILE')
+    supervised = parser.add_argument_group('supervised mode')
+    supervised.add_argument('--supervised', action='store_true',
+                            help='render each figure in a killable worker process')
+    supervised.add_argument('--timeout', type=float, default=120.0, metavar='SEC',
+                            help='wall-clock limit per figure (default: 120)')
+    supervised.add_argument('--max-rss', type=float, metavar='MB',
+                            help='kill a worker whose resident memory exceeds this')
+    supervised.add_argument('--recycle-after', type=int, default=10, metavar='N',
+                            help='replace each worker after N figures (default: 10)')
+    sharded = parser.add_argument_group('sharded builds')
+    sharded.add_argument('--shard', type=_shard_arg, metavar='I/N',
+                         help=f'render only shard I of N (1-based) into <shard dir>/{name}/I-of-N')
+    sharded.add_argument('--merge', action='store_true',
+                         help='combine the finished shards into gallery_output/')
+    sharded.add_argument('--shard-dir', type=Path, default=SHARD_DIR, metavar='DIR',
+                         help='directory shared by all shards and the merge (default: gallery_output/shards)')
+    args = parser.parse_args(argv)
+
+    registry = figures
+    try:
+        figures = select(figures, args.figures)
+    except KeyError as e:
+        parser.error(e.args[0])
+    if ((args.supervised or args.publish or args.atlas or args.search_index or args.compress or args.events
+            or args.metrics) and (args.styles or args.palettes)):
+        parser.error('--supervised, --publish, --atlas, --search-index, --compress, --events and --metrics '
+                     'work on the default variant only')
+    if args.shard and args.merge:
+        parser.error('--shard and --merge are separate steps')
+    if (args.shard or args.merge) and args.figures:
+        parser.error('--shard and --merge work on the whole registry, not selected figures')
+    if args.shard and (args.atlas or args.search_index or args.compress):
+        parser.error('--atlas, --search-index and --compress run once, with --merge')
+    if args.merge and (args.styles or args.palettes or args.supervised or args.publish or args.events):
+        parser.error('--merge only combines shard outputs (plus --atlas, --search-index, --compress, --metrics)')
+
+    if args.merge:
+        finished = merge(registry, args.shard_dir, registry=name)
+        if args.metrics:
+            write_openmetrics(args.metrics, finished)
+        if args.atlas:
+            build_atlas(load_manifest())
+        if args.search_index:
+            build_search_index(registry, load_manifest())
+        if args.compress:
+            precompress(text_assets(OUTPUT_DIR, PUBLISH_DIR))
+        sys.exit(int(any(r['status'] != 'ok' for r in finished)))
+
+    out_dir = OUTPUT_DIR
+    if args.shard:
+        figures, out_dir, split = prepare(figures, *args.shard, args.shard_dir, name)
+    events = EventLog(args.events)
+    if args.styles or args.palettes:
+        build_variants(figures, args.styles or ['custom'], args.palettes or [ORIGINAL], args.workers, out_dir)
+        if args.shard:
+            write_report(out_dir, *args.shard, figures, events, split)
+        return
+    computed = {}
+    if args.supervised:
+        status = supervise(figures, args.timeout, args.max_rss, args.recycle_after, args.workers,
+                           out_dir=out_dir, events=events)
+    else:
+        finished, computed = build(figures, label, args.workers, events, out_dir)
+        status = int(any(r['status'] != 'ok' for r in finished))
+    events.close()
+    if args.shard:
+        write_report(out_dir, *args.shard, figures, events, split)
+    if args.metrics:
+        write_openmetrics(args.metrics, events.finished)
+    manifest = None
+    if args.publish:
+        # Workers of a supervised build keep their data; publish computes it again
+        manifest = publish(figures, args.formats, out_dir, out_dir / PUBLISH_DIR.name,
+                           finished=events.finished, data=computed)
+    if args.atlas:
+        build_atlas(manifest or load_manifest())
+    if args.search_index:
+        # The index covers the whole catalog, not just the figures rebuilt now
+        build_search_index(registry, manifest or load_manifest())
+    if args.compress:
+        precompress(text_assets(OUTPUT_DIR, PUBLISH_DIR))
+    sys.exit(status)
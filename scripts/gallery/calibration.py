@@ -0,0 +1,92 @@
+"""
+Pixel <-> data mapping, ported from lib/calibration.ts.
+
+Calibrations use the app's JSON shape (lib/types.ts), so one exported from
+the editor can be used here unchanged:
+
+    {"points": [{"pixel": {"x": 80, "y": 400}, "data": {"x": 0, "y": 0}}, ...],
+     "xAxis": {"type": "linear"}, "yAxis": {"type": "log"}}
+
+The axis extremes are resolved once per calibration instead of once per
+point, and both directions accept NumPy arrays.
+"""
+
+from dataclasses import dataclass
+
+import numpy as np
+
+
+@dataclass(frozen=True)
+class Axis:
+    """One axis: data values at the smallest and largest calibrated pixel."""
+    pixel_min: float
+    pixel_max: float
+    data_at_min: float
+    data_at_max: float
+    type: str = 'linear'
+
+    @classmethod
+    def from_points(cls, pixels, data, type):
+        # Math.min/indexOf semantics: the first point at each extreme wins
+        lo, hi = int(np.argmin(pixels)), int(np.argmax(pixels))
+        return cls(float(pixels[lo]), float(pixels[hi]), float(data[lo]), float(data[hi]), type)
+
+    def _is_log(self):
+        return self.type == 'log' and self.data_at_min > 0 and self.data_at_max > 0
+
+    def to_data(self, pixel):
+        pixel = np.asarray(pixel, dtype=float)
+        if self.pixel_max == self.pixel_min:
+            return np.full_like(pixel, self.data_at_min)
+        t = (pixel - self.pixel_min) / (self.pixel_max - self.pixel_min)
+        if self._is_log():
+            return self.data_at_min * np.power(self.data_at_max / self.data_at_min, t)
+        return self.data_at_min + t * (self.data_at_max - self.data_at_min)
+
+    def to_pixel(self, data):
+        data = np.asarray(data, dtype=float)
+        if self.data_at_max == self.data_at_min:
+            return np.full_like(data, self.pixel_min)
+        linear = (data - self.data_at_min) / (self.data_at_max - self.data_at_min)
+        if self._is_log():
+            with np.errstate(divide='ignore', invalid='ignore'):
+                log = np.log(data / self.data_at_min) / np.log(self.data_at_max / self.data_at_min)
+            t = np.where(data > 0, log, linear)
+        else:
+            t = linear
+        return self.pixel_min + t * (self.pixel_max - self.pixel_min)
+
+
+@dataclass(frozen=True)
+class Calibration:
+    x: Axis
+    y: Axis
+
+    @classmethod
+    def from_json(cls, calibration):
+        """From the lib/types.ts ``Calibration`` shape (needs at least 2 points)."""
+        points = calibration['points']
+        px = [p['pixel']['x'] for p in points]
+        py = [p['pixel']['y'] for p in points]
+        dx = [p['data']['x'] for p in points]
+        dy = [p['data']['y'] for p in points]
+        return cls(Axis.from_points(px, dx, calibration['xAxis']['type']),
+                   Axis.from_points(py, dy, calibration['yAxis']['type']))
+
+    def to_json(self):
+        return {
+            'points': [
+                {'pixel': {'x': self.x.pixel_min, 'y': self.y.pixel_max},
+                 'data': {'x': self.x.data_at_min, 'y': self.y.data_at_max}},
+                {'pixel': {'x': self.x.pixel_max, 'y': self.y.pixel_min},
+                 'data': {'x': self.x.data_at_max, 'y': self.y.data_at_min}},
+            ],
+            'xAxis': {'type': self.x.type},
+            'yAxis': {'type': self.y.type},
+        }
+
+    def pixel_to_data(self, px, py):
+        return self.x.to_data(px), self.y.to_data(py)
+
+    def data_to_pixel(self, x, y):
+        return self.x.to_pixel(x), self.y.to_pixel(y)
@@ -0,0 +1,51 @@
+"""
+Gallery item metadata read from lib/galleryData.ts.
+
+The TypeScript file stays the single source of titles, descriptions and
+facets (chartTypes, journalStyles, colorTones, colorPalette); the build reads
+the flat string and string-array fields of each ``galleryItems`` entry, plus
+its source name (as ``sourceName``), with a few regular expressions instead
+of keeping a copy in Python.
+"""
+
+import re
+from pathlib import Path
+
+from . import ROOT_DIR
+
+GALLERY_DATA = ROOT_DIR / 'lib' / 'galleryData.ts'
+
+_ITEMS = re.compile(r'galleryItems\s*:[^=]*=\s*\[(.*?)\n\]', re.S)
+_ENTRY = re.compile(r'\n  \{(.*?)\n  \},?', re.S)
+_STRING = re.compile(r"^\s{4}(\w+): '((?:[^'\\]|\\.)*)',?$", re.M)
+_ARRAY = re.compile(r'^\s{4}(\w+): \[([^\]]*)\],?$', re.M)
+_ITEM = re.compile(r"'((?:[^'\\]|\\.)*)'")
+_SOURCE_NAME = re.compile(r"^\s{4}source: \{[^\n]*?\bname: '((?:[^'\\]|\\.)*)'", re.M)
+
+
+def _unescape(text):
+    return re.sub(r'\\(.)', r'\1', text)
+
+
+def load_catalog(path=GALLERY_DATA):
+    """``{id: {field: str | [str]}}`` for every gallery item, in file order."""
+    source = Path(path).read_text(encoding='utf-8')
+    match = _ITEMS.search(source)
+    if match is None:
+        raise ValueError(f'no galleryItems array in {path}')
+    catalog = {}
+    for entry in _ENTRY.finditer(match.group(1)):
+        body = entry.group(1)
+        item = {key: _unescape(value) for key, value in _STRING.findall(body)}
+        item.update((key, [_unescape(v) for v in _ITEM.findall(values)]) for key, values in _ARRAY.findall(body))
+        source = _SOURCE_NAME.search(body)
+        if source:
+            item['sourceName'] = _unescape(source.group(1))
+        if 'id' in item:
+            catalog[item['id']] = item
+    return catalog
+
+
+def chart_types(catalog, figure_id):
+    """The figure's chartTypes, or ['other'] if it isn't in the catalog."""
+    return catalog.get(figure_id, {}).get('chartTypes') or ['other']
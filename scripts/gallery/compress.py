@@ -0,0 +1,184 @@
+"""
+Precompressed .br/.gz siblings for text assets.
+
+Every SVG and JSON file gets ``<name>.gz`` (gzip level 9, zero mtime so the
+bytes are reproducible) and ``<name>.br`` (Brotli quality 11, needs the
+``brotli`` package) next to it, so the CDN can serve them as-is instead of
+compressing per request. A variant that isn't smaller than the original is
+not kept, and that outcome is remembered per content (in
+``SKIPPED_PATH``) so it isn't recompressed to find out again. Siblings newer
+than their source are reused, so unchanged assets aren't compressed again,
+and files with identical bytes (a fixed-name SVG and its content-hashed copy)
+are compressed once.
+
+Each run writes its sizes, ratios and timings to
+gallery_output/compress-report.json (reports themselves are not compressed).
+"""
+
+import gzip
+import hashlib
+import json
+import os
+import time
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+
+from . import OUTPUT_DIR
+from .output import write
+
+TEXT_SUFFIXES = ('.svg', '.json')
+ENCODINGS = {'.br': 'br', '.gz': 'gzip'}
+REPORT_PATH = OUTPUT_DIR / 'compress-report.json'
+SKIPPED_PATH = OUTPUT_DIR / '.cache' / 'compress-skipped.json'
+
+try:
+    import brotli
+except ImportError:
+    brotli = None
+
+
+def _gzip(data):
+    return gzip.compress(data, compresslevel=9, mtime=0)
+
+
+def _brotli(data):
+    return brotli.compress(data, mode=brotli.MODE_TEXT, quality=11)
+
+
+CODECS = {'.gz': _gzip, '.br': _brotli}
+
+
+@dataclass
+class Result:
+    paths: list  # every file holding this content
+    size: int
+    variants: dict  # suffix -> compressed size, or None if not kept
+    seconds: float
+    reused: bool
+
+
+def text_assets(*dirs):
+    """Compressible files directly inside the given directories."""
+    return sorted(p for d in dirs if d.exists() for p in d.iterdir()
+                  if p.is_file() and p.suffix in TEXT_SUFFIXES and not p.name.startswith('.')
+                  and not p.name.endswith('-report.json'))
+
+
+def _up_to_date(path, suffix):
+    sibling = path.with_name(path.name + suffix)
+    return sibling.exists() and sibling.stat().st_mtime_ns >= path.stat().st_mtime_ns
+
+
+def compress_group(paths, data, suffixes, skipped=None):
+    """Compress one content and write its siblings next to every path holding it.
+
+    ``skipped`` lists the suffixes already known not to beat this content;
+    the returned Result's ``variants`` say which ones didn't this time.
+    """
+    t0 = time.perf_counter()
+    variants, reused = {}, True
+    for suffix in suffixes:
+        if suffix in (skipped or ()):
+            for path in paths:
+                path.with_name(path.name + suffix).unlink(missing_ok=True)
+            variants[suffix] = None
+            continue
+        if all(_up_to_date(p, suffix) for p in paths):
+            variants[suffix] = paths[0].with_name(paths[0].name + suffix).stat().st_size
+            continue
+        reused = False
+        packed = CODECS[suffix](data)
+        keep = len(packed) < len(data)
+        for path in paths:
+            sibling = path.with_name(path.name + suffix)
+            if not keep:
+                sibling.unlink(missing_ok=True)
+            elif not write(sibling, packed):
+                os.utime(sibling)  # same bytes; mark as up to date with the source
+        variants[suffix] = len(packed) if keep else None
+    return Result(paths, len(data), variants, time.perf_counter() - t0, reused)
+
+
+def _load_skipped(path):
+    try:
+        return json.loads(path.read_text(encoding='utf-8'))
+    except FileNotFoundError:
+        return {}
+
+
+def precompress(paths, jobs=None, report_path=REPORT_PATH, skipped_path=SKIPPED_PATH):
+    """Compress ``paths`` on a thread pool (zlib and brotli release the GIL)."""
+    suffixes = ['.gz'] + (['.br'] if brotli is not None else [])
+    jobs = jobs or os.cpu_count() or 1
+    t0 = time.perf_counter()
+    groups = {}
+    for path in paths:
+        data = path.read_bytes()
+        groups.setdefault(hashlib.sha256(data).hexdigest(), (data, []))[1].append(path)
+    skipped = _load_skipped(skipped_path)
+    # Largest first so one big SVG doesn't end up last on its own thread
+    work = sorted(groups.items(), key=lambda g: len(g[1][0]), reverse=True)
+    with ThreadPoolExecutor(max_workers=jobs) as pool:
+        results = list(pool.map(lambda g: compress_group(g[1][1], g[1][0], suffixes, skipped.get(g[0])), work))
+    # Only the current contents are remembered, so the file stays small
+    skipped = {digest: [s for s, v in r.variants.items() if v is None]
+               for (digest, _), r in zip(work, results) if None in r.variants.values()}
+    write(skipped_path, (json.dumps(dict(sorted(skipped.items())), indent=2) + '\n').encode('utf-8'))
+    seconds = time.perf_counter() - t0
+    report(results, suffixes, seconds, jobs)
+    write_report(report_path, results, suffixes, seconds, jobs)
+    return results
+
+
+def _served(results, suffix):
+    """(variants kept, bytes served) when clients accept ``suffix``."""
+    kept = [r for r in results if r.variants.get(suffix)]
+    # Content without a kept variant is served uncompressed
+    return len(kept), sum(r.variants[suffix] for r in kept) + sum(r.size for r in results if r not in kept)
+
+
+def _relative(path):
+    try:
+        return str(path.relative_to(OUTPUT_DIR))
+    except ValueError:
+        return str(path)
+
+
+def write_report(path, results, suffixes, seconds, jobs):
+    """Persist one run's totals and per-content sizes, ratios and timings as JSON."""
+    original = sum(r.size for r in results)
+    totals = {}
+    for suffix in suffixes:
+        kept, served = _served(results, suffix)
+        totals[suffix] = {'kept': kept, 'bytes': served, 'ratio': round(served / original, 4) if original else 1}
+    report = {
+        'seconds': round(seconds, 3), 'jobs': jobs, 'files': sum(len(r.paths) for r in results),
+        'distinct': len(results), 'reused': sum(r.reused for r in results), 'bytes': original,
+        'encodings': totals,
+        'assets': [{'paths': [_relative(p) for p in r.paths], 'bytes': r.size,
+                    'variants': {s: ({'bytes': v, 'ratio': round(v / r.size, 4)} if v else None)
+                                 for s, v in r.variants.items()},
+                    'seconds': round(r.seconds, 4), 'reused': r.reused}
+                   for r in sorted(results, key=lambda r: str(r.paths[0]))],
+    }
+    write(path, (json.dumps(report, indent=2) + '\n').encode('utf-8'))
+
+
+def report(results, suffixes, seconds, jobs):
+    n_files = sum(len(r.paths) for r in results)
+    print(f'\nPrecompressed {n_files} text assets ({len(results)} distinct) in {seconds:.2f}s '
+          f'({jobs} thread{"s" if jobs != 1 else ""}, {sum(r.reused for r in results)} reused)')
+    if brotli is None:
+        print('  brotli not installed: .br variants skipped (pip install brotli)')
+    original = sum(r.size for r in results)
+    for suffix in suffixes:
+        kept, served = _served(results, suffix)
+        ratio = served / original if original else 1
+        print(f'  {suffix:<4} {kept:>3}/{len(results)} kept, '
+              f'{original / 1024:.0f} KB -> {served / 1024:.0f} KB ({ratio:.1%})')
+    slowest = sorted((r for r in results if not r.reused), key=lambda r: r.seconds, reverse=True)[:3]
+    for r in slowest:
+        ratios = ', '.join(f'{s} {v / r.size:.1%}' for s, v in r.variants.items() if v)
+        copies = len(r.paths) - 1
+        name = r.paths[0].name + (f' (+{copies} cop{"ies" if copies > 1 else "y"})' if copies else '')
+        print(f'  {name}: {r.size / 1024:.0f} KB, {r.seconds * 1000:.0f} ms ({ratios})')
@@ -0,0 +1,127 @@
+"""
+Machine-readable build events and OpenMetrics export.
+
+``EventLog`` appends one JSON object per line for every build and figure:
+
+    {"ts": 1760860800.12, "run": "20261019T080000-4242", "event": "figure_start", "figure": "g-001"}
+    {"ts": 1760860800.49, "run": "...", "event": "figure_finish", "figure": "g-001",
+     "status": "ok", "seconds": 0.371, "bytes": 131826, "changed": true, "rss": 123731968}
+    {"ts": ..., "event": "figure_finish", "figure": "g-021", "status": "error",
+     "error": "timeout", "seconds": 120.0, "bytes": 0, "rss": null}
+
+``error`` is the exception type, or crash/timeout/memory for supervised
+workers that had to be killed; ``rss`` is the resident memory of the process
+that rendered the figure. ``write_openmetrics`` turns a run's finish events
+into a text file for a node_exporter-style textfile collector: render-time
+histograms per figure and per chart type (from lib/galleryData.ts), output
+size and RSS gauges, and failure counts by error type.
+"""
+
+import json
+import os
+import sys
+import threading
+import time
+from collections import Counter, defaultdict
+from pathlib import Path
+
+from .catalog import chart_types, load_catalog
+from .output import write
+
+BUCKETS = (0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0, 120.0)
+
+
+class EventLog:
+    """JSON-lines event writer; safe to call from render threads."""
+
+    def __init__(self, path=None):
+        self.run = time.strftime('%Y%m%dT%H%M%S') + f'-{os.getpid()}'
+        self.finished = []
+        self._file = None
+        self._started = {}
+        self._lock = threading.Lock()
+        if path == '-':
+            self._file = sys.stdout
+        elif path is not None:
+            self._file = open(path, 'a', encoding='utf-8')
+
+    def emit(self, event, **fields):
+        record = {'ts': round(time.time(), 3), 'run': self.run, 'event': event, **fields}
+        with self._lock:
+            if event == 'figure_finish':
+                self.finished.append(record)
+            if self._file is not None:
+                self._file.write(json.dumps(record, ensure_ascii=False) + '\n')
+                self._file.flush()
+
+    def start(self, figure_id, elapsed=0.0):
+        """Start a figure's clock, already ``elapsed`` seconds in (e.g. its data stage)."""
+        self._started[figure_id] = time.perf_counter() - elapsed
+        self.emit('figure_start', figure=figure_id)
+
+    def finish(self, figure_id, status='ok', size=0, error=None, seconds=None, rss=None, **fields):
+        """Record a figure's result; ``seconds`` defaults to the time since ``start``."""
+        started = self._started.pop(figure_id, None)
+        if seconds is None and started is not None:
+            seconds = time.perf_counter() - started
+        record = {'status': status, 'seconds': round(seconds or 0.0, 4), 'bytes': size, 'rss': rss}
+        if error is not None:
+            record['error'] = error
+        self.emit('figure_finish', figure=figure_id, **record, **fields)
+
+    def close(self, **fields):
+        ok = sum(1 for r in self.finished if r['status'] == 'ok')
+        self.emit('build_finish', figures=len(self.finished), ok=ok, **fields)
+        if self._file is not None and self._file is not sys.stdout:
+            self._file.close()
+        self._file = None
+
+
+def _labels(**labels):
+    return '{' + ','.join(f'{k}="{v}"' for k, v in labels.items()) + '}'
+
+
+def _histogram(name, help_text, groups):
+    lines = [f'# TYPE {name} histogram', f'# UNIT {name} seconds', f'# HELP {name} {help_text}']
+    for label, values in sorted(groups.items()):
+        key, value = label
+        for bound in BUCKETS:
+            count = sum(1 for v in values if v <= bound)
+            lines.append(f'{name}_bucket{_labels(**{key: value}, le=bound)} {count}')
+        lines.append(f'{name}_bucket{_labels(**{key: value}, le="+Inf")} {len(values)}')
+        lines.append(f'{name}_count{_labels(**{key: value})} {len(values)}')
+        lines.append(f'{name}_sum{_labels(**{key: value})} {sum(values):.6f}')
+    return lines
+
+
+def openmetrics(finished, catalog=None):
+    """OpenMetrics text for a list of ``figure_finish`` records."""
+    catalog = load_catalog() if catalog is None else catalog
+    by_figure, by_type = defaultdict(list), defaultdict(list)
+    lines = []
+    for record in finished:
+        if record['status'] != 'ok':
+            continue
+        by_figure[('figure', record['figure'])].append(record['seconds'])
+        for chart_type in chart_types(catalog, record['figure']):
+            by_type[('chart_type', chart_type)].append(record['seconds'])
+    lines += _histogram('gallery_figure_render_seconds', 'Render time per figure.', by_figure)
+    lines += _histogram('gallery_chart_type_render_seconds', 'Render time per chart type.', by_type)
+
+    for name, field, help_text in (('gallery_figure_output_bytes', 'bytes', 'Bytes written per figure.'),
+                                   ('gallery_figure_rss_bytes', 'rss', 'Resident memory after rendering.')):
+        lines += [f'# TYPE {name} gauge', f'# UNIT {name} bytes', f'# HELP {name} {help_text}']
+        lines += [f'{name}{_labels(figure=r["figure"])} {r[field]}'
+                  for r in sorted(finished, key=lambda r: r['figure'])
+                  if r['status'] == 'ok' and r.get(field) is not None]
+
+    failures = Counter(r.get('error', 'unknown') for r in finished if r['status'] != 'ok')
+    lines += ['# TYPE gallery_figure_failures counter', '# HELP gallery_figure_failures Failed figures by error type.']
+    lines += [f'gallery_figure_failures_total{_labels(error_type=kind)} {n}' for kind, n in sorted(failures.items())]
+    lines.append('# EOF')
+    return '\n'.join(lines) + '\n'
+
+
+def write_openmetrics(path, finished, catalog=None):
+    """Write the metrics file atomically (collectors may read it mid-build)."""
+    write(Path(path), openmetrics(finished, catalog).encode('utf-8'))
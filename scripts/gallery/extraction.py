@@ -0,0 +1,121 @@
+"""
+Vectorized curve extraction, ported from lib/extraction.ts for batch use.
+
+Same algorithm and results as ``extractCurve``/``findMatchingPixels`` in
+the app, but on whole image arrays instead of per-pixel loops:
+
+* color matching compares squared RGB distances against tolerance², with no
+  square roots;
+* the per-column median of matching rows comes from a running count of
+  matches down each column: the median ranks are found with one reduction
+  per rank instead of sorting each column;
+* the 3-sigma rolling-window outlier filter uses cumulative sums of y and y²
+  for every window's mean and variance, instead of re-slicing the window.
+
+Images are ``(height, width, 3|4)`` uint8 arrays (RGBA as in ImageData, or
+RGB); ``load_image`` reads any file Pillow can open.
+"""
+
+from concurrent.futures import ThreadPoolExecutor
+
+import numpy as np
+from PIL import Image
+
+OUTLIER_WINDOW = 11
+OUTLIER_SIGMAS = 3
+
+
+def hex_to_rgb(color):
+    clean = color.lstrip('#')
+    return tuple(int(clean[i:i + 2], 16) for i in (0, 2, 4))
+
+
+def rgb_to_hex(r, g, b):
+    return f'#{r:02x}{g:02x}{b:02x}'
+
+
+def load_image(path):
+    with Image.open(path) as image:
+        return np.asarray(image.convert('RGBA'))
+
+
+def color_mask(image, color, tolerance):
+    """Boolean (height, width) mask of pixels within ``tolerance`` of ``color``."""
+    if tolerance <= 0:
+        return np.zeros(image.shape[:2], dtype=bool)
+    rgb = image[..., :3].astype(np.int32)
+    rgb -= np.asarray(color, dtype=np.int32)
+    dist2 = np.einsum('...c,...c->...', rgb, rgb)
+    return dist2 < tolerance * tolerance
+
+
+def find_matching_pixels(image, color, tolerance):
+    """uint8 mask, 1 = matched (``.ravel()`` gives the app's flat layout)."""
+    return color_mask(image, color, tolerance).view(np.uint8)
+
+
+def column_medians(mask):
+    """Median matching row per column, or NaN where a column has no match.
+
+    Matching rows are already sorted within a column, so the median is read
+    off the running match count: the row where the count first exceeds the
+    lower and upper median ranks.
+    """
+    counts = np.cumsum(mask, axis=0, dtype=np.int32)
+    total = counts[-1] if len(counts) else np.zeros(mask.shape[1], dtype=np.int32)
+    lo = np.argmax(counts > (total - 1) // 2, axis=0)
+    hi = np.argmax(counts > total // 2, axis=0)
+    return np.where(total > 0, (lo + hi) / 2, np.nan)
+
+
+def outlier_mask(y, window=OUTLIER_WINDOW, sigmas=OUTLIER_SIGMAS):
+    """Points to keep under the app's rolling 3-sigma filter (removeOutliers)."""
+    n = len(y)
+    if n < window:
+        return np.ones(n, dtype=bool)
+    half = window // 2
+    idx = np.arange(n)
+    start = np.maximum(0, idx - half)
+    end = np.minimum(n, idx + half + 1)
+    count = end - start
+    # Centered first so the E[y²] - E[y]² variance doesn't lose precision
+    centered = y - y.mean()
+    s1 = np.concatenate(([0.0], np.cumsum(centered)))
+    s2 = np.concatenate(([0.0], np.cumsum(centered * centered)))
+    mean = (s1[end] - s1[start]) / count
+    var = np.maximum((s2[end] - s2[start]) / count - mean * mean, 0.0)
+    sigma = np.sqrt(var)
+    return (sigma == 0) | (np.abs(centered - mean) <= sigmas * sigma)
+
+
+def extract_curve(image, color, tolerance, calibration, step=1,
+                  window=OUTLIER_WINDOW, sigmas=OUTLIER_SIGMAS):
+    """Data points ``(x, y)`` of the curve drawn in ``color``.
+
+    ``calibration`` is a calibration.Calibration; returns two float arrays.
+    ``window``/``sigmas`` tune the outlier filter (the app uses 11 and 3).
+    """
+    step = max(1, round(step))
+    columns = image[:, ::step]
+    medians = column_medians(color_mask(columns, color, tolerance))
+    found = ~np.isnan(medians)
+    px = np.arange(0, image.shape[1], step)[found]
+    x, y = calibration.pixel_to_data(px, medians[found])
+    keep = outlier_mask(y, window, sigmas)
+    return x[keep], y[keep]
+
+
+def extract_many(images, color, tolerance, calibration, step=1, workers=None):
+    """Extract from many images (arrays or paths) on a thread pool.
+
+    NumPy releases the GIL for the array work, so threads scale with cores.
+    Yields ``(image, (x, y))`` in input order.
+    """
+    images = list(images)
+
+    def run(image):
+        array = load_image(image) if not isinstance(image, np.ndarray) else image
+        return extract_curve(array, color, tolerance, calibration, step)
+
+    with ThreadPoolExecutor(max_workers=workers) as pool:
+        yield from zip(images, pool.map(run, images))
@@ -0,0 +1,210 @@
+"""
+Collision-free label placement for dense scatter plots.
+
+Each label gets a fixed set of candidate positions around its point (eight
+directions at a near and a far distance; the far ones get a leader line).
+Everything is laid out in points, so placement is independent of dpi:
+
+* text extents come from per-character advance widths, measured once per
+  font size, weight and dpi and summed per label. Raster output rounds each
+  advance to whole pixels, so a character takes the larger of its width at
+  the figure's dpi and unhinted (as in SVG); kerning is ignored, which
+  only ever errs slightly wide;
+* the points to avoid are binned into a grid of label-height cells whose
+  summed-area table gives the number of points under every candidate box
+  of every label in one vectorized lookup;
+* labels are then placed greedily in priority order, each taking its
+  cheapest candidate that stays inside the axes and doesn't overlap an
+  already placed label (one broadcast box test against all of them).
+  Labels with no free candidate are left out rather than overlapped.
+
+A few hundred labels among 10^5 points place in a few tens of
+milliseconds; drawing the annotations is the larger cost.
+"""
+
+from dataclasses import dataclass
+from functools import lru_cache
+
+import numpy as np
+from matplotlib.backends.backend_agg import RendererAgg
+from matplotlib.font_manager import FontProperties
+from matplotlib.transforms import Affine2D
+
+# Unit directions in preference order: above, right, left, below, then diagonals
+DIRECTIONS = np.array([(0, 1), (1, 0), (-1, 0), (0, -1), (1, 1), (-1, 1), (1, -1), (-1, -1)], dtype=float)
+NEAR, FAR = 2.0, 12.0        # gap between point and label, in points
+PAD = 1.0                    # clearance kept around each label, in points
+POINT_COST = 1.0             # per covered point
+RANK_COST = 0.01             # per step down the direction preference
+FAR_COST = 0.5               # for needing a leader line
+UNHINTED_DPI = 720           # fine enough that glyph advances are not rounded
+
+
+@dataclass
+class Placement:
+    """Where each label went: ``placed`` mask plus offsets (points) and alignment."""
+    placed: np.ndarray
+    offsets: np.ndarray
+    ha: list
+    va: list
+
+
+@lru_cache(maxsize=None)
+def _metrics(size, weight, family, dpi):
+    """(advance widths by character, height, descent) in points for one font setting."""
+    return {}, *_measure('Ag', size, weight, family, dpi)[1:]
+
+
+def _measure(text, size, weight, family, dpi):
+    renderer = _renderer(dpi)
+    prop = FontProperties(size=size, weight=weight, family=family)
+    return [v * 72 / dpi for v in renderer.get_text_width_height_descent(text, prop, ismath=False)]
+
+
+@lru_cache(maxsize=None)
+def _renderer(dpi):
+    return RendererAgg(1, 1, dpi)
+
+
+def text_extents(texts, size, weight='normal', family='sans-serif', dpi=UNHINTED_DPI):
+    """``(widths, height)`` in points; each character is measured once per font setting."""
+    resolutions = sorted({dpi, UNHINTED_DPI})
+    metrics = [_metrics(size, weight, family, d) for d in resolutions]
+    chars = set(''.join(texts))
+    for d, (widths, _, _) in zip(resolutions, metrics):
+        for ch in chars - widths.keys():
+            widths[ch] = _measure(ch, size, weight, family, d)[0]
+    widths = {ch: max(m[0][ch] for m in metrics) for ch in chars}
+    height = max(m[1] for m in metrics)
+    lengths = np.fromiter((len(t) for t in texts), dtype=int, count=len(texts))
+    advances = np.fromiter((widths[ch] for t in texts for ch in t), dtype=float)
+    starts = np.concatenate([[0], np.cumsum(lengths)[:-1]])
+    totals = np.add.reduceat(advances, starts) if advances.size else np.zeros(len(texts))
+    return np.where(lengths > 0, totals, 0.0), height
+
+
+def candidates(anchors, widths, height):
+    """Candidate boxes ``(n, k, 4)`` as x0, y0, x1, y1 with their offsets and alignment."""
+    gaps = np.repeat([NEAR, FAR], len(DIRECTIONS))
+    dirs = np.tile(DIRECTIONS, (2, 1))
+    # Fraction of the box left of / below the offset point: 0 for left/bottom alignment
+    fx = (1 - dirs[:, 0]) / 2
+    fy = (1 - dirs[:, 1]) / 2
+    offsets = dirs * gaps[:, None]
+    x0 = anchors[:, None, 0] + offsets[None, :, 0] - fx[None, :] * widths[:, None]
+    y0 = anchors[:, None, 1] + offsets[None, :, 1] - fy[None, :] * height
+    boxes = np.stack([x0 - PAD, y0 - PAD, x0 + widths[:, None] + PAD, y0 + height + PAD], axis=-1)
+    ha = [{0: 'left', 0.5: 'center', 1: 'right'}[f] for f in fx]
+    va = [{0: 'bottom', 0.5: 'center', 1: 'top'}[f] for f in fy]
+    return boxes, offsets, ha, va
+
+
+class PointGrid:
+    """Summed-area table of point counts on a regular grid."""
+
+    def __init__(self, points, bounds, cell):
+        self.x0, self.y0, x1, y1 = bounds
+        self.cell = cell
+        self.shape = (max(1, int(np.ceil((y1 - self.y0) / cell))), max(1, int(np.ceil((x1 - self.x0) / cell))))
+        col, row = self._cells(points[:, 0], points[:, 1])
+        inside = (row >= 0) & (row < self.shape[0]) & (col >= 0) & (col < self.shape[1])
+        counts = np.bincount(row[inside] * self.shape[1] + col[inside], minlength=self.shape[0] * self.shape[1])
+        self.table = np.zeros((self.shape[0] + 1, self.shape[1] + 1), dtype=np.int64)
+        self.table[1:, 1:] = counts.reshape(self.shape).cumsum(0).cumsum(1)
+
+    def _cells(self, x, y):
+        return (np.floor((x - self.x0) / self.cell).astype(int),
+                np.floor((y - self.y0) / self.cell).astype(int))
+
+    def _range(self, boxes):
+        c0, r0 = self._cells(boxes[..., 0], boxes[..., 1])
+        c1, r1 = self._cells(boxes[..., 2], boxes[..., 3])
+        return (np.clip(c0, 0, self.shape[1]), np.clip(r0, 0, self.shape[0]),
+                np.clip(c1 + 1, 0, self.shape[1]), np.clip(r1 + 1, 0, self.shape[0]))
+
+    def count(self, boxes, exclude=None):
+        """Points in the cells each box (``x0, y0, x1, y1``) touches.
+
+        ``exclude`` holds one point per box (the box's own anchor), not
+        counted when its cell is among them.
+        """
+        c0, r0, c1, r1 = self._range(boxes)
+        t = self.table
+        n = t[r1, c1] - t[r0, c1] - t[r1, c0] + t[r0, c0]
+        if exclude is not None:
+            col, row = self._cells(exclude[..., 0], exclude[..., 1])
+            n = n - ((col >= c0) & (col < c1) & (row >= r0) & (row < r1))
+        return n
+
+
+def solve(anchors, widths, height, points, bounds, blocked=()):
+    """Choose a candidate per label (``-1`` when none is free), in priority order.
+
+    ``blocked`` boxes (e.g. the legend) are treated as already placed labels.
+    """
+    boxes, offsets, ha, va = candidates(anchors, widths, height)
+    grid = PointGrid(points, bounds, height)
+    covered = grid.count(boxes, exclude=anchors[:, None, :])
+    k = boxes.shape[1]
+    cost = (POINT_COST * covered + RANK_COST * (np.arange(k) % len(DIRECTIONS))
+            + FAR_COST * (np.arange(k) >= len(DIRECTIONS)))
+    x0, y0, x1, y1 = bounds
+    outside = (boxes[..., 0] < x0) | (boxes[..., 1] < y0) | (boxes[..., 2] > x1) | (boxes[..., 3] > y1)
+    cost[outside] = np.inf
+
+    choice = np.full(len(anchors), -1)
+    placed = np.array(blocked, dtype=float).reshape(-1, 4)
+    for i in range(len(anchors)):
+        if placed.size:
+            b = boxes[i][:, None, :]
+            hit = ((b[..., 0] < placed[:, 2]) & (b[..., 2] > placed[:, 0])
+                   & (b[..., 1] < placed[:, 3]) & (b[..., 3] > placed[:, 1])).any(axis=1)
+            c = np.where(hit, np.inf, cost[i])
+        else:
+            c = cost[i]
+        best = int(np.argmin(c))
+        if np.isfinite(c[best]):
+            choice[i] = best
+            placed = np.vstack([placed, boxes[i, best]])
+    return choice, offsets, ha, va
+
+
+def _avoid_points(ax):
+    """Data-space offsets of the axes' scatter collections."""
+    arrays = [c.get_offsets() for c in ax.collections if c.get_offset_transform() == ax.transData]
+    arrays = [np.asarray(a, dtype=float) for a in arrays if len(a)]
+    return np.concatenate(arrays) if arrays else np.empty((0, 2))
+
+
+def place_labels(ax, x, y, texts, fontsize=7, weight='normal', color='#333333',
+                 line_color='#555555', points=None):
+    """Annotate points without overlaps; returns the Placement.
+
+    Labels are placed in the order given, so pass the most important first.
+    ``points`` (data coordinates) are the markers to keep clear of, by
+    default every scatter drawn on ``ax`` so far; the legend is kept clear
+    too. Call after the final layout (e.g. after ``tight_layout``), since
+    placement is done in points.
+    """
+    ax.get_xlim(), ax.get_ylim()  # settle autoscaling before transforming
+    pixels_to_points = Affine2D().scale(72 / ax.figure.dpi)
+    to_points = ax.transData + pixels_to_points
+    anchors = to_points.transform(np.column_stack([x, y]))
+    avoid = to_points.transform(_avoid_points(ax) if points is None else np.asarray(points, dtype=float))
+    bbox = ax.get_window_extent().transformed(pixels_to_points)
+    blocked = []
+    if ax.get_legend() is not None:
+        legend = ax.get_legend().get_window_extent(ax.figure.canvas.get_renderer())
+        blocked.append(legend.transformed(pixels_to_points).extents)
+    widths, height = text_extents(texts, fontsize, weight, dpi=ax.figure.dpi)
+
+    choice, offsets, ha, va = solve(anchors, widths, height, avoid, bbox.extents, blocked)
+    placed = choice >= 0
+    for i in np.flatnonzero(placed):
+        c = choice[i]
+        arrow = dict(arrowstyle='-', color=line_color, lw=0.5, shrinkA=0, shrinkB=2) if c >= len(DIRECTIONS) else None
+        ax.annotate(texts[i], (x[i], y[i]), xytext=tuple(offsets[c]), textcoords='offset points',
+                    ha=ha[c], va=va[c], fontsize=fontsize, fontweight=weight, color=color,
+                    arrowprops=arrow)
+    return Placement(placed, np.where(placed[:, None], offsets[np.maximum(choice, 0)], np.nan),
+                     [ha[c] if c >= 0 else None for c in choice], [va[c] if c >= 0 else None for c in choice])
@@ -0,0 +1,176 @@
+"""
+Content-hashed gallery assets and their manifest.
+
+Publishing copies each built figure to gallery_output/gallery/ under a name
+that embeds a hash of its bytes (nature-timeseries.3f2a9c1d0e.svg), together
+with its binary data sidecar (see sidecar.py), a PNG thumbnail and any
+extra formats. Because a name never changes its content, the CDN can serve
+all of them with ``immutable`` caching; only manifest.json, which maps
+gallery ids to the current names, needs a short cache lifetime:
+
+    {"version": 1, "base": "/gallery", "figures": {
+      "g-001": {"filename": "nature-timeseries.svg", "assets": {
+        "svg": {"path": "/gallery/nature-timeseries.3f2a9c1d0e.svg",
+                "bytes": 114312, "width": 672, "height": 403, "sha256": "..."},
+        "data": {"path": "/gallery/nature-timeseries.data.5d41402abc.bin", ...},
+        "thumbnail": {"path": "/gallery/nature-timeseries.thumb.8be0c2a411.png", ...}}}}}
+
+Paths are relative to GALLERY_CDN_BASE, like imagePath in lib/galleryData.ts;
+width and height are CSS pixels.
+"""
+
+import hashlib
+import json
+import re
+import struct
+from pathlib import Path
+
+from . import OUTPUT_DIR
+from .backend import render
+from .compress import ENCODINGS
+from .output import ChangeLog
+from .sidecar import encode
+
+PUBLISH_DIR = OUTPUT_DIR / 'gallery'
+MANIFEST_PATH = PUBLISH_DIR / 'manifest.json'
+URL_PREFIX = '/gallery'
+HASH_LENGTH = 10
+THUMBNAIL_DPI = 48
+EXTRA_FORMATS = ('png', 'pdf')
+
+_PT_TO_PX = 96 / 72
+_SVG_SIZE = re.compile(rb'<svg[^>]*?\swidth="([\d.]+)(pt|px)?"[^>]*?\sheight="([\d.]+)(pt|px)?"')
+_PDF_MEDIABOX = re.compile(rb'/MediaBox\s*\[\s*[\d.]+\s+[\d.]+\s+([\d.]+)\s+([\d.]+)\s*\]')
+
+
+def content_hash(content):
+    return hashlib.sha256(content).hexdigest()
+
+
+def hashed_name(filename, content, tag=None, suffix=None):
+    """'ieee-bar.svg' -> 'ieee-bar.<hash>.svg' (or 'ieee-bar.<tag>.<hash>.png')."""
+    path = Path(filename)
+    parts = [path.stem, *([tag] if tag else []), content_hash(content)[:HASH_LENGTH]]
+    return '.'.join(parts) + (suffix or path.suffix)
+
+
+def dimensions(content, fmt):
+    """(width, height) in CSS pixels, or None if the header can't be read."""
+    if fmt == 'png' and content[:8] == b'\x89PNG\r\n\x1a\n':
+        return struct.unpack('>II', content[16:24])
+    scale = _PT_TO_PX
+    if fmt == 'svg':
+        match = _SVG_SIZE.search(content[:4096])
+        if match is None:
+            return None
+        width, unit, height = match.group(1), match.group(2), match.group(3)
+        scale = 1 if unit == b'px' else _PT_TO_PX
+    elif fmt == 'pdf':
+        match = _PDF_MEDIABOX.search(content)
+        if match is None:
+            return None
+        width, height = match.groups()
+    else:
+        return None
+    return round(float(width) * scale), round(float(height) * scale)
+
+
+def asset_entry(name, content, fmt):
+    entry = {'path': f'{URL_PREFIX}/{name}', 'bytes': len(content)}
+    size = dimensions(content, fmt)
+    if size:
+        entry['width'], entry['height'] = size
+    entry['sha256'] = content_hash(content)
+    return entry
+
+
+def load_manifest(path=MANIFEST_PATH):
+    try:
+        return json.loads(Path(path).read_text(encoding='utf-8'))
+    except FileNotFoundError:
+        return {'version': 1, 'base': URL_PREFIX, 'figures': {}}
+
+
+def dump_manifest(manifest):
+    figures = dict(sorted(manifest['figures'].items()))
+    return (json.dumps({**manifest, 'figures': figures}, indent=2, ensure_ascii=False) + '\n').encode('utf-8')
+
+
+def referenced_names(obj):
+    """File names of every ``"path"`` in a manifest-like JSON object."""
+    if isinstance(obj, dict):
+        names = {obj['path'].rsplit('/', 1)[-1]} if isinstance(obj.get('path'), str) else set()
+        return names.union(*(referenced_names(v) for v in obj.values()))
+    if isinstance(obj, list):
+        return set().union(*(referenced_names(v) for v in obj))
+    return set()
+
+
+def prune_assets(manifest, out_dir=PUBLISH_DIR):
+    """Remove hashed files that neither the manifest nor atlas.json references."""
+    # Sprite atlases (atlas.py) reference hashed pages of their own
+    live = referenced_names(manifest) | referenced_names(load_manifest(out_dir / 'atlas.json'))
+    live |= {'manifest.json', 'atlas.json', 'search-index.json'}
+    stale = [p for p in out_dir.glob('*.*.*') if not p.name.startswith('.')
+             and (p.stem if p.suffix in ENCODINGS else p.name) not in live]
+    for path in stale:
+        path.unlink()
+    return stale
+
+
+def publish(figures, formats=(), src_dir=OUTPUT_DIR, out_dir=PUBLISH_DIR, finished=None, data=None):
+    """Hash the built SVGs, add data sidecars, thumbnails and extra formats, update the manifest.
+
+    Figures without a built SVG in ``src_dir`` are skipped, and so are those
+    whose record in ``finished`` (the build's finish records) is not ``ok``:
+    their SVG is left over from an earlier run. ``data`` maps figure ids to
+    the data the build computed; figures missing from it compute theirs
+    again. Their manifest entries stay as they were. Hashed files that
+    no longer appear in the manifest are removed locally (remote copies stay
+    valid for clients still holding an old manifest).
+    """
+    manifest_path = out_dir / 'manifest.json'
+    manifest = load_manifest(manifest_path)
+    log = ChangeLog(src_dir)
+    status = {r['figure']: r['status'] for r in finished or ()}
+    data = data or {}
+    print(f'\nPublishing content-hashed assets into {out_dir}/ ...')
+    for figure in figures:
+        if status.get(figure.id, 'ok') != 'ok':
+            print(f'[{figure.name}]   SKIP: {figure.filename} failed to build ({status[figure.id]})')
+            continue
+        svg_path = src_dir / figure.filename
+        if not svg_path.exists():
+            print(f'[{figure.name}]   SKIP: {figure.filename} not built')
+            continue
+        svg = svg_path.read_bytes()
+        outputs = [('svg', hashed_name(figure.filename, svg), svg)]
+        try:
+            d = data[figure.id] if figure.id in data else figure.compute()
+            sidecar = encode(figure, d)
+            outputs.append(('data', hashed_name(figure.filename, sidecar, 'data', '.bin'), sidecar))
+            for fmt in ('thumbnail', *formats):
+                if fmt == 'thumbnail':
+                    content = render(figure, d, fmt='png', dpi=THUMBNAIL_DPI)
+                    name = hashed_name(figure.filename, content, 'thumb', '.png')
+                else:
+                    content = render(figure, d, fmt=fmt)
+                    name = hashed_name(figure.filename, content, suffix=f'.{fmt}')
+                outputs.append((fmt, name, content))
+        except Exception as e:
+            print(f'[{figure.name}]   FAIL: {e}')
+            continue
+
+        assets = {}
+        for key, name, content in outputs:
+            log.write(out_dir / name, content)
+            assets[key] = asset_entry(name, content, 'png' if key == 'thumbnail' else key)
+        manifest['figures'][figure.id] = {'filename': figure.filename, 'assets': assets}
+        print(f'[{figure.name}]   OK: {", ".join(name for _, name, _ in outputs)}')
+
+    log.write(manifest_path, dump_manifest(manifest))
+    stale = prune_assets(manifest, out_dir)
+    print(f'Manifest: {manifest_path} ({len(manifest["figures"])} figures)'
+          + (f', removed {len(stale)} stale asset(s)' if stale else ''))
+    print(log.summary())
+    return manifest
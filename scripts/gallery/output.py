@@ -0,0 +1,75 @@
+"""
+Writing files into gallery_output/.
+
+Renders are byte-deterministic (see backend.render), so a file whose content
+hasn't changed is left untouched: its mtime survives and rsync/CDN diffing
+only sees real changes. Changed files are written to a temp file in the same
+directory and renamed over the target, so readers never see a partial file.
+"""
+
+import os
+import tempfile
+
+from .style import ORIGINAL
+
+# mkstemp creates files 0600; published outputs should get the usual mode
+_UMASK = os.umask(0)
+os.umask(_UMASK)
+FILE_MODE = 0o666 & ~_UMASK
+
+
+def variant_path(root, filename, style=None, palette=None):
+    """Where a render in a style/palette goes: ``root/variants/<style>/<palette>/<filename>``."""
+    return root / 'variants' / (style or 'custom') / (palette or ORIGINAL) / filename
+
+
+def write(path, content):
+    """Atomically write ``content`` to ``path`` unless it already holds it.
+
+    Returns True if the file was created or changed.
+    """
+    try:
+        if path.stat().st_size == len(content) and path.read_bytes() == content:
+            return False
+    except FileNotFoundError:
+        pass
+    path.parent.mkdir(parents=True, exist_ok=True)
+    fd, tmp = tempfile.mkstemp(dir=path.parent, prefix=f'.{path.name}.', suffix='.tmp')
+    try:
+        with os.fdopen(fd, 'wb') as f:
+            f.write(content)
+        os.chmod(tmp, FILE_MODE)
+        os.replace(tmp, path)
+    except BaseException:
+        os.unlink(tmp)
+        raise
+    return True
+
+
+class ChangeLog:
+    """Collects which outputs a run actually changed, for the run summary."""
+
+    def __init__(self, root):
+        self.root = root
+        self.changed = []
+        self.unchanged = 0
+
+    def record(self, path, changed):
+        if changed:
+            self.changed.append(path)
+        else:
+            self.unchanged += 1
+        return changed
+
+    def write(self, path, content):
+        return self.record(path, write(path, content))
+
+    def summary(self, limit=40):
+        if not self.changed:
+            return f'No files changed ({self.unchanged} up to date).'
+        lines = [f'{len(self.changed)} file(s) changed, {self.unchanged} unchanged:']
+        names = sorted(str(p.relative_to(self.root)) for p in self.changed)
+        lines += [f'  {name}' for name in names[:limit]]
+        if len(names) > limit:
+            lines.append(f'  ... and {len(names) - limit} more')
+        return '\n'.join(lines)
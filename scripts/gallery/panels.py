@@ -0,0 +1,258 @@
+"""
+Multi-panel figures composed from independently rendered panels.
+
+A ``Composition`` is a drawing stage made of ``Panel`` units laid out on a
+grid, with a shared title and panel labels (A, B, C, ...). Each panel draws
+into its own (sub)figure of one grid cell, so it can be rendered on its own:
+
+* SVG output renders the panels in parallel, each into a fixed-size SVG
+  cached under ``PANEL_CACHE`` by a key of everything it depends on: the
+  panel's code (AST digest of the function and the module helpers it
+  reaches, as in watch mode), its slice of the data, colors, the rcParams
+  of its style, cell size and matplotlib version. Unchanged panels are read back from the cache
+  and spliced as nested ``<svg>`` elements into a frame that carries the
+  background, title and labels. Reading an entry marks it used; whenever
+  new entries are written, the least recently used ones beyond
+  ``CACHE_BYTES`` in total are deleted.
+* Every other caller gets an ordinary Figure: calling the composition draws
+  the same panels serially into subfigures of the same cells.
+
+Panels use fixed subplot margins (no tight layout) so both paths give the
+same geometry; the composited SVG is exactly ``figsize``.
+"""
+
+import hashlib
+import inspect
+import io
+import os
+import pickle
+import re
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
+from functools import lru_cache
+from pathlib import Path
+from typing import Callable
+
+import matplotlib
+
+from . import OUTPUT_DIR
+from .backend import GATE, METADATA, new_figure
+from .output import write
+from .style import style_key
+from .watch import snapshot
+
+PANEL_CACHE = OUTPUT_DIR / '.cache' / 'panels'
+CACHE_BYTES = 256 * 1024 * 1024  # every style x palette variant of the compositions takes ~90 MB
+MARGINS = {'left': 0.15, 'right': 0.95, 'bottom': 0.14, 'top': 0.88}
+LABEL_STYLE = {'fontsize': 16, 'fontweight': 'bold'}
+
+_SVG_ROOT = re.compile(rb'^.*?<svg\b[^>]*>', re.S)
+_METADATA = re.compile(rb'\s*<metadata>.*?</metadata>', re.S)
+_IDS = re.compile(rb'(id="|url\(#|href="#)')
+_FRAME_PATCH = re.compile(rb'<g id="patch_1">.*?</g>\n', re.S)
+_PRUNE_LOCK = threading.Lock()
+_POOL_LOCK = threading.Lock()
+_POOL = None, None  # (pid, executor); a forked child starts its own
+
+
+@dataclass(frozen=True)
+class Panel:
+    """One independently renderable panel.
+
+    ``draw(fig, d, colors, *args)`` adds its axes to ``fig`` (a Figure or
+    SubFigure of one cell). ``keys`` name the data it reads, either a key or
+    ``(key, index)`` for one row of it; only that slice invalidates the
+    panel's cache entry. No keys means the whole data.
+    """
+    draw: Callable
+    keys: tuple = ()
+    args: tuple = ()
+    margins: dict = field(default_factory=dict)
+
+
+@lru_cache(maxsize=None)
+def _module_snapshot(path, mtime):
+    return snapshot(Path(path).read_text(encoding='utf-8'))
+
+
+@lru_cache(maxsize=None)
+def _code_digest(path, mtime, name):
+    snap = _module_snapshot(path, mtime)
+    parts = [snap.module] + [f'{fn}:{snap.functions[fn]}' for fn in sorted(snap.closure(name))]
+    return hashlib.sha1('\n'.join(parts).encode('utf-8')).hexdigest()
+
+
+def code_digest(fn):
+    """Digest of a function plus the module functions it reaches.
+
+    Memoized per function and source file mtime, so an edited file (watch
+    mode) is parsed again and everything else costs one stat.
+    """
+    path = inspect.getsourcefile(fn)
+    return _code_digest(path, Path(path).stat().st_mtime_ns, fn.__name__)
+
+
+def _panel_pool():
+    """The process's one thread pool for panel renders, shared by every composition."""
+    global _POOL
+    with _POOL_LOCK:
+        pid, pool = _POOL
+        if pid != os.getpid():
+            pool = ThreadPoolExecutor(os.cpu_count(), thread_name_prefix='panel')
+            _POOL = os.getpid(), pool
+        return pool
+
+
+def _cached(path):
+    """A cache entry's bytes, marked as just used, or None."""
+    try:
+        svg = path.read_bytes()
+        os.utime(path)
+    except FileNotFoundError:  # never written, or evicted meanwhile
+        return None
+    return svg
+
+
+def prune_cache(cache_dir=PANEL_CACHE, limit=CACHE_BYTES):
+    """Delete the least recently used entries until the cache fits in ``limit`` bytes."""
+    with _PRUNE_LOCK:
+        entries = []
+        for path in cache_dir.glob('*.svg'):
+            try:
+                stat = path.stat()
+            except FileNotFoundError:
+                continue
+            entries.append((stat.st_mtime_ns, stat.st_size, path))
+        total = sum(size for _, size, _ in entries)
+        removed = 0
+        for _, size, path in sorted(entries, key=lambda e: e[0]):
+            if total <= limit:
+                break
+            path.unlink(missing_ok=True)
+            total -= size
+            removed += 1
+        return removed
+
+
+def _slice(d, key):
+    if isinstance(key, tuple):
+        key, index = key
+        return d[key][index]
+    return d[key]
+
+
+def _nest(svg, x, y, prefix):
+    """A standalone panel SVG as a nested <svg> at (x, y) with prefixed ids."""
+    width, height = re.search(rb'viewBox="0 0 ([\d.]+) ([\d.]+)"', svg).groups()
+    body = _METADATA.sub(b'', _SVG_ROOT.sub(b'', svg, count=1), count=1).rstrip()
+    body = _IDS.sub(lambda m: m.group(1) + prefix, body)
+    return (b'<svg x="%g" y="%g" width="%s" height="%s" viewBox="0 0 %s %s">'
+            % (x, y, width, height, width, height)) + body + b'\n'
+
+
+@dataclass(frozen=True)
+class Composition:
+    """A drawing stage laid out as ``grid`` (rows, cols) of panels."""
+    name: str
+    panels: tuple
+    grid: tuple
+    figsize: tuple
+    suptitle: str = None
+    title_kw: dict = field(default_factory=lambda: {'fontsize': 13, 'fontweight': 'bold'})
+    title_height: float = 0.5
+    labels: str = None
+    facecolor: str = 'white'
+    margins: dict = field(default_factory=lambda: dict(MARGINS))
+
+    @property
+    def __name__(self):
+        # Drawing stages are otherwise functions; watch mode and logs use the name
+        return self.name
+
+    @property
+    def cell(self):
+        rows, cols = self.grid
+        width, height = self.figsize
+        return width / cols, (height - self._title_height) / rows
+
+    @property
+    def _title_height(self):
+        return self.title_height if self.suptitle else 0.0
+
+    def _origin(self, index):
+        """Top-left corner of a panel's cell, in inches from the top-left."""
+        row, col = divmod(index, self.grid[1])
+        cw, ch = self.cell
+        return col * cw, self._title_height + row * ch
+
+    def _draw_panel(self, fig, panel, d, colors):
+        panel.draw(fig, d, colors, *panel.args)
+        fig.subplots_adjust(**{**self.margins, **panel.margins})
+
+    def _decorate(self, fig):
+        """Title and panel labels, in figure coordinates of the full layout."""
+        width, height = self.figsize
+        if self.suptitle:
+            fig.suptitle(self.suptitle, y=1 - self._title_height / 2 / height, va='center', **self.title_kw)
+        for index, label in zip(range(len(self.panels)), self.labels or ''):
+            x, y = self._origin(index)
+            fig.text((x + 0.08) / width, 1 - (y + 0.06) / height, label, va='top', ha='left',
+                     color=self.title_kw.get('color'), **LABEL_STYLE)
+
+    def __call__(self, d, colors):
+        """The whole figure drawn serially, one subfigure per panel."""
+        fig = new_figure(figsize=self.figsize, facecolor=self.facecolor)
+        rows, cols = self.grid
+        # Subfigures only follow grid ratios, so the title band is a row of its own
+        top = 1 if self.suptitle else 0
+        gs = fig.add_gridspec(rows + top, cols, height_ratios=[self._title_height] * top + [self.cell[1]] * rows)
+        for index, panel in enumerate(self.panels):
+            row, col = divmod(index, cols)
+            sub = fig.add_subfigure(gs[row + top, col], facecolor=self.facecolor)
+            self._draw_panel(sub, panel, d, colors)
+        self._decorate(fig)
+        return fig
+
+    def panel_key(self, panel, d, colors, style):
+        data = [_slice(d, key) for key in panel.keys] if panel.keys else d
+        h = hashlib.sha256()
+        for part in (matplotlib.__version__, style_key(style), repr(list(colors)), repr(self.cell),
+                     repr(sorted({**self.margins, **panel.margins}.items())), self.facecolor,
+                     code_digest(panel.draw), repr(panel.args)):
+            h.update(part.encode('utf-8') + b'\0')
+        h.update(pickle.dumps(data, protocol=4))
+        return h.hexdigest()[:24]
+
+    def render_panel(self, panel, d, colors, style=None):
+        """SVG bytes of one panel at its cell size."""
+        buf = io.BytesIO()
+        with GATE.use(style):
+            fig = new_figure(figsize=self.cell, facecolor=self.facecolor)
+            self._draw_panel(fig, panel, d, colors)
+            fig.savefig(buf, format='svg', bbox_inches=fig.bbox_inches, metadata=METADATA['svg'])
+        return buf.getvalue()
+
+    def render_svg(self, d, colors, style=None, cache_dir=PANEL_CACHE):
+        """The composited SVG: changed panels in parallel, the rest from the cache."""
+        paths = [cache_dir / f'{self.name}-{self.panel_key(p, d, colors, style)}.svg' for p in self.panels]
+        panels = [_cached(path) for path in paths]
+        stale = [i for i, svg in enumerate(panels) if svg is None]
+        if stale:
+            # Not under the style gate: each panel enters it itself
+            rendered = _panel_pool().map(lambda i: self.render_panel(self.panels[i], d, colors, style), stale)
+            for i, svg in zip(stale, rendered):
+                write(paths[i], svg)
+                panels[i] = svg
+            prune_cache(cache_dir)
+        buf = io.BytesIO()
+        with GATE.use(style):
+            fig = new_figure(figsize=self.figsize, facecolor=self.facecolor)
+            self._decorate(fig)
+            fig.savefig(buf, format='svg', bbox_inches=fig.bbox_inches, metadata=METADATA['svg'])
+        frame = buf.getvalue()
+        nested = b''.join(_nest(svg, *(v * 72 for v in self._origin(index)), b'p%d-' % index)
+                          for index, svg in enumerate(panels))
+        # Above the frame's background, below its title and labels
+        patch = _FRAME_PATCH.search(frame)
+        return frame[:patch.end()] + nested + frame[patch.end():]
@@ -0,0 +1,106 @@
+"""
+Figure registry shared by the generator scripts.
+
+Every gallery figure is split into a data stage, ``data(rng) -> dict``, and a
+drawing stage, ``draw(data, colors) -> Figure``. The data stage is the only
+place randomness happens, so its result can be computed once and drawn many
+times (style variants, palettes, re-renders). Data stages that accept a
+``scale`` keyword can also generate proportionally larger data (stress.py).
+"""
+
+import importlib.util
+import inspect
+import sys
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Callable
+
+import numpy as np
+
+SCRIPTS_DIR = Path(__file__).resolve().parent.parent
+GENERATOR_SCRIPTS = [
+    SCRIPTS_DIR / 'generate-gallery-figures.py',
+    SCRIPTS_DIR / 'generate-gallery-supplement.py',
+]
+
+
+@dataclass(frozen=True)
+class Figure:
+    """One gallery figure: id from lib/galleryData.ts plus its two stages."""
+    id: str
+    filename: str
+    data: Callable = field(repr=False)
+    draw: Callable = field(repr=False)
+    palette: list = field(default_factory=list, repr=False)
+    derived: tuple = field(default=(), repr=False)  # data keys computed from others; not in the sidecar
+
+    @property
+    def name(self):
+        """Short name used in logs, e.g. 'g001' for 'g-001'."""
+        return self.id.replace('-', '')
+
+    @property
+    def number(self):
+        return int(self.id.split('-')[1])
+
+    @property
+    def scalable(self):
+        """Whether the data stage takes a ``scale`` factor for its data size."""
+        return 'scale' in inspect.signature(self.data).parameters
+
+    def compute(self, scale=1):
+        # Seeded per figure so any subset renders identically to a full run
+        rng = np.random.RandomState(self.number)
+        if scale == 1:
+            return self.data(rng)
+        if not self.scalable:
+            raise ValueError(f'{self.id} has a fixed data size')
+        return self.data(rng, scale=scale)
+
+
+def load_script(path, source=None):
+    """Import a generator script by path (their file names are not importable).
+
+    Passing ``source`` re-executes the script from that exact text even if it
+    was loaded before, bypassing any cached bytecode.
+    """
+    path = Path(path)
+    module_name = path.stem.replace('-', '_')
+    if module_name in sys.modules and source is None:
+        return sys.modules[module_name]
+    spec = importlib.util.spec_from_file_location(module_name, path)
+    module = importlib.util.module_from_spec(spec)
+    previous = sys.modules.get(module_name)
+    sys.modules[module_name] = module
+    try:
+        if source is None:
+            spec.loader.exec_module(module)
+        else:
+            exec(compile(source, str(path), 'exec'), module.__dict__)
+    except BaseException:
+        if previous is None:
+            del sys.modules[module_name]
+        else:
+            sys.modules[module_name] = previous
+        raise
+    return module
+
+
+def load_figures(scripts=None):
+    """All registered figures across the generator scripts, ordered by id."""
+    figures = []
+    for path in scripts or GENERATOR_SCRIPTS:
+        figures.extend(load_script(path).FIGURES)
+    return sorted(figures, key=lambda f: f.number)
+
+
+def select(figures, ids):
+    """Filter figures by id ('g-001') or short name ('g001'), keeping order."""
+    if not ids:
+        return list(figures)
+    wanted = set(ids)
+    chosen = [f for f in figures if f.id in wanted or f.name in wanted]
+    unknown = wanted - {f.id for f in chosen} - {f.name for f in chosen}
+    if unknown:
+        raise KeyError(f'Unknown figure(s): {", ".join(sorted(unknown))}')
+    return chosen
@@ -0,0 +1,259 @@
+"""
+Visual regression checks for the gallery against stored baselines.
+
+Each figure's built SVG (gallery_output/<filename>, the file the site
+publishes, including compositions spliced by ``render_svg``) is rasterized
+to PNG with PyMuPDF (pip install pymupdf) in a process pool (rasterizing is
+CPU-bound, so threads wouldn't help). Build the gallery first; a figure
+without an SVG is reported as an error. Without PyMuPDF, figures are drawn
+again through Agg instead, which misses anything that only happens on the
+SVG path. Baselines record the rasterizer, and a figure whose baseline came
+from the other one is reported as ``new``. Comparison is tiered so a
+full-gallery check stays cheap:
+
+1. identical raster bytes (sha256) -> ``same``;
+2. perceptual hashes, computed in the worker: a 64-bit DCT hash for overall
+   structure plus a 256-bit gradient hash for finer edges. Equal hashes mean
+   no visible change -> ``same``;
+3. only figures whose hashes differ get a pixel diff against the baseline
+   PNG: ``changed`` if more than ``max_changed`` of the pixels moved by more
+   than ``tolerance`` per channel, otherwise ``minor``.
+
+Baselines live in gallery_output/regression/baseline/ (PNG per figure plus
+hashes.json); a run writes report.json, a side-by-side diff image per
+changed figure (baseline | current | changed pixels) and index.html to
+gallery_output/regression/report/.
+"""
+
+import hashlib
+import html
+import io
+import json
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+from PIL import Image
+
+from . import OUTPUT_DIR
+from .backend import render
+from .registry import load_figures
+from .supervise import script_paths
+
+REGRESSION_DIR = OUTPUT_DIR / 'regression'
+BASELINE_DIR = REGRESSION_DIR / 'baseline'
+REPORT_DIR = REGRESSION_DIR / 'report'
+DPI = 72
+TOLERANCE = 16        # per-channel difference that counts as a changed pixel
+MAX_CHANGED = 0.001   # fraction of changed pixels still reported as 'minor'
+_DCT_SIZE, _DCT_KEEP = 32, 8
+_GRADIENT_SIZE = 16
+
+
+def _dct_matrix(n):
+    k = np.arange(n)
+    m = np.cos(np.pi * (2 * k[None, :] + 1) * k[:, None] / (2 * n)) * np.sqrt(2 / n)
+    m[0] /= np.sqrt(2)
+    return m
+
+
+_DCT = _dct_matrix(_DCT_SIZE)
+
+
+def _gray(image, size):
+    return np.asarray(image.convert('L').resize(size, Image.LANCZOS), dtype=np.float64)
+
+
+def _bits_hex(bits):
+    return np.packbits(bits.ravel()).tobytes().hex()
+
+
+def perceptual_hashes(image):
+    """``{'dct': hex, 'gradient': hex}`` for a PIL image."""
+    pixels = _gray(image, (_DCT_SIZE, _DCT_SIZE))
+    low = (_DCT @ pixels @ _DCT.T)[:_DCT_KEEP, :_DCT_KEEP].ravel()
+    dct = low > np.median(low[1:])  # DC term skews the median
+    gray = _gray(image, (_GRADIENT_SIZE + 1, _GRADIENT_SIZE))
+    gradient = gray[:, 1:] > gray[:, :-1]
+    return {'dct': _bits_hex(dct), 'gradient': _bits_hex(gradient)}
+
+
+def hash_distance(a, b):
+    """Hamming distance between two hex hashes of equal length."""
+    x = np.frombuffer(bytes.fromhex(a), np.uint8) ^ np.frombuffer(bytes.fromhex(b), np.uint8)
+    return int(np.unpackbits(x).sum())
+
+
+def svg_rasterizer():
+    """PyMuPDF, or None when it isn't installed."""
+    try:
+        import pymupdf
+    except ImportError:
+        return None
+    return pymupdf
+
+
+def _svg_png(path, dpi):
+    # matplotlib sizes SVGs in pt, so dpi maps them to pixels as savefig would
+    with svg_rasterizer().open(path) as doc:
+        return doc[0].get_pixmap(dpi=dpi, alpha=False).tobytes('png')
+
+
+_FIGURES = {}
+
+
+def _init_worker(scripts):
+    _FIGURES.update((f.id, f) for f in load_figures(scripts))
+
+
+def _rasterize(job):
+    """``(figure id, png bytes or None, info)`` for one figure.
+
+    ``path`` is the built SVG to rasterize, or None to draw the figure
+    again through Agg.
+    """
+    fid, path, dpi = job
+    t0 = time.perf_counter()
+    try:
+        if path is None:
+            figure = _FIGURES[fid]
+            content = render(figure, figure.compute(), fmt='png', dpi=dpi)
+        elif not path.exists():
+            return fid, None, {'error': f'{path} not built'}
+        else:
+            content = _svg_png(path, dpi)
+    except Exception as e:
+        return fid, None, {'error': f'{type(e).__name__}: {e}'}
+    with Image.open(io.BytesIO(content)) as image:
+        info = {'sha256': hashlib.sha256(content).hexdigest(), 'size': list(image.size),
+                **perceptual_hashes(image)}
+    info['rasterizer'] = 'agg' if path is None else 'pymupdf'
+    info['seconds'] = round(time.perf_counter() - t0, 3)
+    return fid, content, info
+
+
+def rasterize_all(figures, dpi=DPI, workers=None, out_dir=OUTPUT_DIR):
+    """Yield ``(figure id, png bytes or None, info)`` as workers finish."""
+    if svg_rasterizer():
+        jobs = [(f.id, out_dir / f.filename, dpi) for f in figures]
+        pool = ProcessPoolExecutor(workers)
+    else:
+        print('PyMuPDF not installed (pip install pymupdf): drawing figures again through Agg, '
+              'so the built SVGs themselves are not checked\n')
+        jobs = [(f.id, None, dpi) for f in figures]
+        pool = ProcessPoolExecutor(workers, initializer=_init_worker, initargs=(script_paths(figures),))
+    with pool:
+        yield from pool.map(_rasterize, jobs)
+
+
+def _load_rgb(source):
+    with Image.open(source) as image:
+        return np.asarray(image.convert('RGB'))
+
+
+def _pad(a, shape):
+    out = np.full((*shape, 3), 255, dtype=np.uint8)
+    out[:a.shape[0], :a.shape[1]] = a
+    return out
+
+
+def pixel_diff(baseline, current, tolerance=TOLERANCE):
+    """``(changed fraction, diff image)`` for two RGB arrays of any size."""
+    shape = (max(baseline.shape[0], current.shape[0]), max(baseline.shape[1], current.shape[1]))
+    a, b = _pad(baseline, shape), _pad(current, shape)
+    changed = (np.abs(a.astype(np.int16) - b).max(axis=2) > tolerance)
+    # Changed pixels in red over a faded copy of the current raster
+    overlay = (b.mean(axis=2, keepdims=True) * 0.3 + 178).astype(np.uint8).repeat(3, axis=2)
+    overlay[changed] = (220, 30, 30)
+    strip = np.concatenate([a, b, overlay], axis=1)
+    return float(changed.mean()), Image.fromarray(strip)
+
+
+def update_baselines(figures, dpi=DPI, workers=None, baseline_dir=BASELINE_DIR, out_dir=OUTPUT_DIR):
+    """Rasterize the built SVGs and store them as the new baselines."""
+    baseline_dir.mkdir(parents=True, exist_ok=True)
+    index_path = baseline_dir / 'hashes.json'
+    index = json.loads(index_path.read_text(encoding='utf-8')) if index_path.exists() else {}
+    failed = 0
+    for fid, content, info in rasterize_all(figures, dpi, workers, out_dir):
+        if content is None:
+            print(f'[{fid}]   FAIL: {info["error"]}')
+            failed += 1
+            continue
+        (baseline_dir / f'{fid}.png').write_bytes(content)
+        index[fid] = {**{k: v for k, v in info.items() if k != 'seconds'}, 'dpi': dpi}
+        print(f'[{fid}]   baseline updated')
+    index_path.write_text(json.dumps(dict(sorted(index.items())), indent=2) + '\n', encoding='utf-8')
+    return failed
+
+
+def check(figures, dpi=DPI, workers=None, tolerance=TOLERANCE, max_changed=MAX_CHANGED,
+          baseline_dir=BASELINE_DIR, report_dir=REPORT_DIR, out_dir=OUTPUT_DIR):
+    """Compare the built SVGs against the baselines; returns the report rows."""
+    index_path = baseline_dir / 'hashes.json'
+    baselines = json.loads(index_path.read_text(encoding='utf-8')) if index_path.exists() else {}
+    report_dir.mkdir(parents=True, exist_ok=True)
+    for stale in report_dir.glob('*.diff.png'):
+        stale.unlink()
+    rows = []
+    t0 = time.perf_counter()
+    for fid, content, info in rasterize_all(figures, dpi, workers, out_dir):
+        row = {'figure': fid, **info}
+        base = baselines.get(fid)
+        if content is None:
+            row['status'] = 'error'
+        elif base is None or base.get('dpi') != dpi or base.get('rasterizer') != info['rasterizer']:
+            row['status'] = 'new'
+        elif base['sha256'] == info['sha256']:
+            row['status'] = 'same'
+        else:
+            row['dct_distance'] = hash_distance(base['dct'], info['dct'])
+            row['gradient_distance'] = hash_distance(base['gradient'], info['gradient'])
+            if not (row['dct_distance'] or row['gradient_distance']) and base['size'] == info['size']:
+                row['status'] = 'same'
+            else:
+                fraction, image = pixel_diff(_load_rgb(baseline_dir / f'{fid}.png'),
+                                             _load_rgb(io.BytesIO(content)), tolerance)
+                row['changed_pixels'] = round(fraction, 6)
+                row['status'] = 'changed' if fraction > max_changed else 'minor'
+                if row['status'] == 'changed':
+                    row['diff'] = f'{fid}.diff.png'
+                    image.save(report_dir / row['diff'], optimize=True)
+        rows.append(row)
+    seconds = time.perf_counter() - t0
+    report = {'dpi': dpi, 'tolerance': tolerance, 'max_changed': max_changed,
+              'seconds': round(seconds, 2), 'figures': rows}
+    (report_dir / 'report.json').write_text(json.dumps(report, indent=2) + '\n', encoding='utf-8')
+    (report_dir / 'index.html').write_text(_html(report), encoding='utf-8')
+    return report
+
+
+def _html(report):
+    rows = []
+    for r in report['figures']:
+        if r['status'] == 'same':
+            continue
+        detail = html.escape(r.get('error', ''))
+        if 'changed_pixels' in r:
+            detail = (f'{r["changed_pixels"]:.3%} pixels changed, hash distance '
+                      f'{r["dct_distance"]}/64 (DCT), {r["gradient_distance"]}/256 (gradient)')
+        image = f'<img src="{r["diff"]}" alt="{r["figure"]} diff">' if 'diff' in r else ''
+        rows.append(f'<section><h2>{r["figure"]} — {r["status"]}</h2><p>{detail}</p>{image}</section>')
+    body = '\n'.join(rows) or '<p>No visual changes.</p>'
+    return (f'<!doctype html><meta charset="utf-8"><title>Gallery visual regression</title>\n'
+            f'<style>body{{font-family:sans-serif;margin:2rem}}img{{max-width:100%;border:1px solid #ccc}}</style>\n'
+            f'<h1>Gallery visual regression</h1>\n'
+            f'<p>{len(report["figures"])} figures at {report["dpi"]} dpi in {report["seconds"]}s. '
+            f'Columns: baseline | current | changed pixels.</p>\n{body}\n')
+
+
+def print_summary(report):
+    counts = {}
+    for r in report['figures']:
+        counts[r['status']] = counts.get(r['status'], 0) + 1
+        if r['status'] != 'same':
+            extra = f' ({r["changed_pixels"]:.3%} pixels)' if 'changed_pixels' in r else ''
+            extra = f' ({r["error"]})' if 'error' in r else extra
+            print(f'[{r["figure"]}]   {r["status"].upper()}{extra}')
+    print(f'\n{len(report["figures"])} figures checked in {report["seconds"]}s: '
+          + ', '.join(f'{n} {status}' for status, n in sorted(counts.items())))
@@ -0,0 +1,181 @@
+"""
+Round-trip extraction benchmark: generated line figures as ground truth.
+
+The line figures (g-001, g-009, g-011, g-015, g-020) are rasterized at
+several DPIs. Each plotted series is then extracted back out of its axes'
+plot area with gallery/extraction.py, using an exact calibration taken from
+matplotlib's own data -> pixel transform. Accuracy is the RMSE between the
+extracted points and the true series (interpolated at the extracted x),
+also normalized by the series' y range so figures compare. Throughput is
+scanned pixels per second.
+
+``write_fixtures`` saves each raster with its true series and app-shaped
+calibration as PNG + JSON, so lib/extraction.ts can be scored on the same
+inputs.
+"""
+
+import json
+import math
+import time
+from dataclasses import dataclass
+
+import numpy as np
+from matplotlib.backends.backend_agg import FigureCanvasAgg
+
+from . import OUTPUT_DIR
+from .backend import GATE
+from .calibration import Axis, Calibration
+from .extraction import OUTLIER_SIGMAS, OUTLIER_WINDOW, extract_curve, hex_to_rgb
+from .style import fit_palette
+
+BENCH_DIR = OUTPUT_DIR / 'benchmarks' / 'extraction'
+DEFAULT_DPIS = (72, 150, 300)
+
+
+def _series(figure_id, d, colors):
+    """(axes index, x, true y, color, label) for every line a figure draws."""
+    if figure_id == 'g-001':
+        return [(p, d['x'], d['y'][p][i], colors[i], f'{d["titles"][p]} / Method {i + 1}')
+                for p in range(len(d['y'])) for i in range(len(d['y'][p]))]
+    if figure_id == 'g-009':
+        return [(0, d['x'], d['y1'], colors[0], 'Temperature'),
+                (1, d['x'], d['y2'], colors[1], 'Pressure')]
+    if figure_id == 'g-011':
+        return [(0, d['x'], y, colors[i], f'Series {i + 1}') for i, y in enumerate(d['y'])]
+    if figure_id == 'g-015':
+        return [(0, d['x'], m, colors[i * 2], f'Method {i + 1}') for i, m in enumerate(d['mean'])]
+    if figure_id == 'g-020':
+        return [(0, d['x'], y, colors[i], label) for i, (y, label) in enumerate(zip(d['y'], d['labels']))]
+    raise KeyError(figure_id)
+
+
+TARGETS = ('g-001', 'g-009', 'g-011', 'g-015', 'g-020')
+
+
+@dataclass
+class Case:
+    """One series in one raster: what extraction sees and what it should find."""
+    figure: str
+    dpi: int
+    label: str
+    color: str
+    x: np.ndarray
+    y: np.ndarray
+    crop: tuple  # (top, bottom, left, right) rows/columns of the plot area
+    calibration: Calibration
+
+
+def rasterize(figure, data, dpi):
+    """RGBA raster of a figure plus one (crop, calibration) per axes.
+
+    No tight bbox here: the canvas is the image, so transData maps data
+    straight to pixel coordinates (flipped to image rows).
+    """
+    with GATE.use(None):
+        fig = figure.draw(data, fit_palette(None, figure.palette))
+        fig.set_dpi(dpi)
+        canvas = FigureCanvasAgg(fig)
+        canvas.draw()
+        image = np.asarray(canvas.buffer_rgba()).copy()
+    height = image.shape[0]
+    frames = []
+    for ax in fig.axes:
+        (x0, y0), (x1, y1) = ax.bbox.get_points()
+        top, bottom = max(0, math.floor(height - y1)), min(height, math.ceil(height - y0))
+        left, right = max(0, math.floor(x0)), min(image.shape[1], math.ceil(x1))
+        (xmin, xmax), (ymin, ymax) = ax.get_xlim(), ax.get_ylim()
+        (px0, py0), (px1, py1) = ax.transData.transform([(xmin, ymin), (xmax, ymax)])
+        calibration = Calibration(
+            Axis(px0 - left, px1 - left, xmin, xmax),
+            # Image rows grow downwards: the top pixel row holds ymax
+            Axis(height - py1 - top, height - py0 - top, ymax, ymin),
+        )
+        frames.append(((top, bottom, left, right), calibration))
+    return image, frames
+
+
+def cases(figures, dpis=DEFAULT_DPIS):
+    """Yield ``(image, [Case, ...])`` per figure and DPI."""
+    for figure in figures:
+        data = figure.compute()
+        colors = fit_palette(None, figure.palette)
+        series = _series(figure.id, data, colors)
+        for dpi in dpis:
+            image, frames = rasterize(figure, data, dpi)
+            yield image, [Case(figure.id, dpi, label, color, np.asarray(x, float), np.asarray(y, float),
+                               *frames[axes]) for axes, x, y, color, label in series]
+
+
+def score(image, case, tolerance, step=1, window=OUTLIER_WINDOW, sigmas=OUTLIER_SIGMAS):
+    top, bottom, left, right = case.crop
+    plot = image[top:bottom, left:right]
+    t0 = time.perf_counter()
+    x, y = extract_curve(plot, hex_to_rgb(case.color), tolerance, case.calibration, step, window, sigmas)
+    seconds = time.perf_counter() - t0
+    inside = (x >= case.x[0]) & (x <= case.x[-1])
+    x, y = x[inside], y[inside]
+    truth = np.interp(x, case.x, case.y)
+    rmse = float(np.sqrt(np.mean((y - truth) ** 2))) if len(x) else math.nan
+    span = float(np.ptp(case.y)) or 1.0
+    # Columns the true series spans that produced a point
+    px_lo, px_hi = case.calibration.x.to_pixel([case.x[0], case.x[-1]])
+    expected = max(1, int((px_hi - px_lo) // max(1, step)))
+    return {
+        'figure': case.figure, 'dpi': case.dpi, 'series': case.label,
+        'points': int(len(x)), 'coverage': round(min(1.0, len(x) / expected), 3),
+        'rmse': round(rmse, 4), 'nrmse': round(rmse / span, 4),
+        'pixels': int(plot.shape[0] * plot.shape[1]), 'seconds': seconds,
+    }
+
+
+def run(figures, dpis=DEFAULT_DPIS, tolerance=30, step=1, window=OUTLIER_WINDOW, sigmas=OUTLIER_SIGMAS):
+    results = []
+    for image, batch in cases(figures, dpis):
+        results.extend(score(image, case, tolerance, step, window, sigmas) for case in batch)
+    return results
+
+
+def summarize(results):
+    """Per figure × DPI: mean NRMSE, coverage and throughput."""
+    rows = {}
+    for r in results:
+        rows.setdefault((r['figure'], r['dpi']), []).append(r)
+    summary = []
+    for (figure, dpi), group in rows.items():
+        nrmse = [r['nrmse'] for r in group if not math.isnan(r['nrmse'])]
+        pixels = sum(r['pixels'] for r in group)
+        seconds = sum(r['seconds'] for r in group)
+        summary.append({
+            'figure': figure, 'dpi': dpi, 'series': len(group),
+            'nrmse': round(float(np.mean(nrmse)), 4) if nrmse else math.nan,
+            'worst_nrmse': round(max(nrmse), 4) if nrmse else math.nan,
+            'coverage': round(float(np.mean([r['coverage'] for r in group])), 3),
+            'mpx_per_s': round(pixels / seconds / 1e6, 1) if seconds else math.inf,
+        })
+    return summary
+
+
+def print_report(summary, settings):
+    print(f'Round-trip extraction ({settings})\n')
+    print(f'{"figure":<8} {"dpi":>4} {"series":>6} {"NRMSE":>8} {"worst":>8} {"cover":>6} {"Mpx/s":>7}')
+    for s in summary:
+        print(f'{s["figure"]:<8} {s["dpi"]:>4} {s["series"]:>6} {s["nrmse"]:>8.2%} '
+              f'{s["worst_nrmse"]:>8.2%} {s["coverage"]:>6.0%} {s["mpx_per_s"]:>7.1f}')
+
+
+def write_fixtures(figures, dpis=DEFAULT_DPIS, out_dir=BENCH_DIR):
+    """Save ``<id>@<dpi>.png`` plus a JSON file with true series and calibration."""
+    from PIL import Image
+
+    out_dir.mkdir(parents=True, exist_ok=True)
+    for image, batch in cases(figures, dpis):
+        name = f'{batch[0].figure}@{batch[0].dpi}'
+        Image.fromarray(image).save(out_dir / f'{name}.png')
+        fixture = {'image': f'{name}.png', 'series': [{
+            'label': c.label, 'color': c.color,
+            'crop': dict(zip(('top', 'bottom', 'left', 'right'), c.crop)),
+            'calibration': c.calibration.to_json(),
+            'truth': {'x': c.x.tolist(), 'y': c.y.tolist()},
+        } for c in batch]}
+        (out_dir / f'{name}.json').write_text(json.dumps(fixture), encoding='utf-8')
+    return out_dir
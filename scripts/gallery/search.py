@@ -0,0 +1,264 @@
+"""
+Precomputed search and palette index for the gallery front end.
+
+The gallery page filters and searches client-side. Scanning every item's
+strings on each keystroke stops scaling long before the gallery does, so the
+build writes gallery_output/gallery/search-index.json, which answers each
+kind of query with map lookups (see lib/galleryIndex.ts):
+
+    {"version": 1, "items": ["g-001", ...],
+     "text": {"heatmap": [3, 17], "热图": [3, 17], "热": [3, 9, 17], ...},
+     "facets": {"chartTypes": {"line": [0, 5]}, "journalStyles": {...}, "colorTones": {...}},
+     "palettes": {"space": "CIELAB-D65", "cell": 20,
+                  "declared": [[[52.1, -3.4, -28.0], ...], ...],
+                  "rendered": [[[52.3, -3.1, -27.2, 0.412], ...], ...],
+                  "cells": {"2,0,-2": [0, 4], ...},
+                  "similar": [[12, 4, 27, ...], ...]}}
+
+Items are referred to by their position in ``items`` (catalog order);
+posting lists are sorted positions.
+
+* Text: title, description and source name in both languages, NFKC-folded
+  and lowercased. Latin-script words are indexed whole (the front end
+  matches a query word against every indexed word containing it); Chinese has
+  no word breaks, so every CJK character and character bigram is indexed,
+  and a query run is the intersection of its bigrams.
+* Facets: one posting list per chartTypes, journalStyles and colorTones value.
+* Palettes: each item's ``colorPalette`` in CIELAB, plus the dominant colors
+  of its rendered thumbnail with their pixel shares (the background, and
+  grey ink when the figure has enough color, left out). Palette distance is
+  the weighted mean CIE76 ΔE from each color to the nearest color of the
+  other palette, both ways. ``similar`` holds every item's nearest
+  palettes; ``cells`` buckets all palette colors into ``cell``-sized Lab
+  cubes, so an ad-hoc palette query only ranks the items sharing a cube
+  with (or next to) one of its colors.
+"""
+
+import io
+import json
+import re
+import unicodedata
+
+import numpy as np
+from matplotlib.colors import to_rgba_array
+from PIL import Image
+
+from . import OUTPUT_DIR
+from .backend import render
+from .catalog import load_catalog
+from .manifest import PUBLISH_DIR, THUMBNAIL_DPI
+from .output import ChangeLog
+
+INDEX_NAME = 'search-index.json'
+TEXT_FIELDS = ('title', 'titleZh', 'description', 'descriptionZh', 'sourceName')
+FACETS = ('chartTypes', 'journalStyles', 'colorTones')
+PALETTE_SIZE = 6       # dominant colors kept per thumbnail
+MIN_SHARE = 0.03       # ... each covering at least this share of the ink
+MERGE_DE = 15.0        # colors closer than this (ΔE) count as one
+BACKGROUND_DE = 6.0    # pixels this close to the most common color are background
+NEUTRAL_CHROMA = 8.0   # below this chroma a color is grey ink (text, axes, grid)
+MIN_CHROMATIC = 0.2    # drop grey ink when at least this share of the ink has color
+CELL = 20              # Lab cube size for palette query buckets
+SIMILAR = 8            # precomputed nearest palettes per item
+
+_CJK = '\u3400-\u4dbf\u4e00-\u9fff\uf900-\ufaff'
+_TOKENS = re.compile(f'([{_CJK}]+)|[0-9a-z\u00c0-\u024f]+')
+
+# sRGB (D65) to CIE XYZ, and the D65 white point
+_SRGB_TO_XYZ = np.array([[0.4124564, 0.3575761, 0.1804375],
+                         [0.2126729, 0.7151522, 0.0721750],
+                         [0.0193339, 0.1191920, 0.9503041]])
+_WHITE = np.array([0.95047, 1.0, 1.08883])
+_EPSILON, _KAPPA = 216 / 24389, 24389 / 27
+_FAR = 1e3  # Lab position of palette padding, far from every real color
+
+
+def tokenize(text):
+    """Index terms of a string: Latin-script words, CJK characters and bigrams."""
+    terms = []
+    for match in _TOKENS.finditer(unicodedata.normalize('NFKC', text).lower()):
+        run = match.group(1)
+        if run is None:
+            terms.append(match.group(0))
+            continue
+        terms.extend(run)
+        terms.extend(run[i:i + 2] for i in range(len(run) - 1))
+    return terms
+
+
+def srgb_to_lab(rgb):
+    """CIELAB (D65) of sRGB values in [0, 1], shape (..., 3)."""
+    rgb = np.asarray(rgb, dtype=float)
+    linear = np.where(rgb <= 0.04045, rgb / 12.92, ((rgb + 0.055) / 1.055) ** 2.4)
+    xyz = linear @ _SRGB_TO_XYZ.T / _WHITE
+    f = np.where(xyz > _EPSILON, np.cbrt(xyz), (_KAPPA * xyz + 16) / 116)
+    return np.stack([116 * f[..., 1] - 16, 500 * (f[..., 0] - f[..., 1]), 200 * (f[..., 1] - f[..., 2])], axis=-1)
+
+
+def palette_lab(colors):
+    """Lab rows for a list of color strings (``colorPalette``)."""
+    return srgb_to_lab(to_rgba_array(colors)[:, :3]) if colors else np.empty((0, 3))
+
+
+def dominant_colors(pixels, k=PALETTE_SIZE):
+    """``(lab, shares)`` of up to ``k`` dominant colors of an RGB(A) uint8 image.
+
+    Pixels are binned at 4 bits per channel; the most common bin is the
+    background. The most common remaining bins at least MERGE_DE apart seed
+    the colors, and every bin is then folded into its nearest seed.
+    """
+    rgb = pixels[..., :3].reshape(-1, 3)
+    if pixels.shape[-1] == 4:
+        rgb = rgb[pixels[..., 3].reshape(-1) >= 128]
+    code = (rgb[:, 0] >> 4).astype(np.int64) << 8 | (rgb[:, 1] >> 4).astype(np.int64) << 4 | rgb[:, 2] >> 4
+    counts = np.bincount(code, minlength=4096)
+    sums = np.stack([np.bincount(code, weights=rgb[:, c], minlength=4096) for c in range(3)], axis=1)
+    used = counts > 0
+    counts = counts[used].astype(float)
+    lab = srgb_to_lab(sums[used] / counts[:, None] / 255)
+
+    ink = np.linalg.norm(lab - lab[np.argmax(counts)], axis=1) > BACKGROUND_DE
+    chromatic = ink & (np.hypot(lab[:, 1], lab[:, 2]) >= NEUTRAL_CHROMA)
+    if counts[chromatic].sum() >= MIN_CHROMATIC * counts[ink].sum():
+        ink = chromatic
+    counts, lab = counts[ink], lab[ink]
+    if not len(counts):
+        return np.empty((0, 3)), np.empty(0)
+
+    seeds = []
+    for i in np.argsort(-counts, kind='stable'):
+        if all(np.linalg.norm(lab[i] - lab[j]) > MERGE_DE for j in seeds):
+            seeds.append(i)
+            if len(seeds) == k:
+                break
+    nearest = np.argmin(((lab[:, None, :] - lab[seeds][None, :, :]) ** 2).sum(axis=-1), axis=1)
+    weight = np.bincount(nearest, weights=counts, minlength=len(seeds))
+    centres = np.stack([np.bincount(nearest, weights=counts * lab[:, c], minlength=len(seeds))
+                        for c in range(3)], axis=1) / weight[:, None]
+    shares = weight / weight.sum()
+    keep = np.flatnonzero(shares >= MIN_SHARE)
+    keep = keep[np.argsort(-shares[keep], kind='stable')]
+    return centres[keep], shares[keep] / shares[keep].sum()
+
+
+def palette_distances(colors, weights, others, other_weights):
+    """``(m, n)`` distances between padded palettes ``(m, k, 3)`` and ``(n, k', 3)``.
+
+    Padding (zero weight) sits at ``_FAR``, so it is never anyone's nearest
+    color; pairs where either palette is empty are NaN.
+    """
+    # Others color-major, so both reductions run over whole (n,) rows
+    a, b = colors.reshape(-1, 3), others.transpose(1, 0, 2).reshape(-1, 3)
+    squared = (a * a).sum(axis=1)[:, None] + (b * b).sum(axis=1)[None, :] - 2 * a @ b.T
+    squared = np.maximum(squared, 0).reshape(weights.shape[0], weights.shape[1], other_weights.shape[1], -1)
+    forward = np.einsum('mkn,mk->mn', np.sqrt(squared.min(axis=2)), weights)
+    backward = np.einsum('mkn,nk->mn', np.sqrt(squared.min(axis=1)), other_weights)
+    distance = (forward + backward) / 2
+    distance[(weights.sum(axis=1) <= 0)[:, None] | (other_weights.sum(axis=1) <= 0)[None, :]] = np.nan
+    return distance
+
+
+def _padded(palettes):
+    """Stack ``(lab, weights)`` pairs into ``(n, k, 3)`` colors and ``(n, k)`` weights (float32)."""
+    k = max((len(w) for _, w in palettes), default=0) or 1
+    colors = np.full((len(palettes), k, 3), _FAR, dtype=np.float32)
+    weights = np.zeros((len(palettes), k), dtype=np.float32)
+    for i, (lab, w) in enumerate(palettes):
+        colors[i, :len(w)], weights[i, :len(w)] = lab, w
+    return colors, weights
+
+
+def nearest_palettes(declared, rendered, count=SIMILAR, block=32):
+    """Each item's ``count`` nearest items by declared and rendered palette distance."""
+    kinds = [_padded(palettes) for palettes in (declared, rendered) if any(len(w) for _, w in palettes)]
+    similar = []
+    for start in range(0, len(declared) if kinds else 0, block):
+        rows = slice(start, start + block)
+        stacked = np.stack([palette_distances(colors[rows], weights[rows], colors, weights)
+                            for colors, weights in kinds])
+        # Mean over the kinds both items have
+        found = ~np.isnan(stacked)
+        distance = np.where(found, stacked, 0).sum(axis=0) / np.maximum(found.sum(axis=0), 1)
+        distance[~found.any(axis=0)] = np.inf
+        own = np.arange(distance.shape[0])
+        distance[own, start + own] = np.inf
+        for row, order in zip(distance, np.argsort(distance, axis=1, kind='stable')[:, :count]):
+            similar.append([int(j) for j in order if np.isfinite(row[j])])
+    return similar or [[] for _ in declared]
+
+
+def _cell(lab):
+    return ','.join(str(int(v)) for v in np.floor(lab / CELL))
+
+
+def _postings(values):
+    return {key: sorted(ordinals) for key, ordinals in sorted(values.items())}
+
+
+def _thumbnail(figure, manifest, publish_dir):
+    """The published thumbnail's pixels, or a fresh thumbnail render."""
+    thumb = manifest.get('figures', {}).get(figure.id, {}).get('assets', {}).get('thumbnail') if manifest else None
+    path = publish_dir / thumb['path'].rsplit('/', 1)[-1] if thumb else None
+    content = (path.read_bytes() if path and path.exists()
+               else render(figure, figure.compute(), fmt='png', dpi=THUMBNAIL_DPI))
+    with Image.open(io.BytesIO(content)) as image:
+        return np.asarray(image.convert('RGBA'))
+
+
+def build_index(catalog, figures=(), manifest=None, publish_dir=PUBLISH_DIR):
+    """The index as a JSON-ready dict; rendered palettes for the given figures."""
+    items = list(catalog)
+    text, facets = {}, {facet: {} for facet in FACETS}
+    for n, item in enumerate(catalog.values()):
+        for term in {t for field in TEXT_FIELDS for t in tokenize(item.get(field, ''))}:
+            text.setdefault(term, []).append(n)
+        for facet in FACETS:
+            for value in set(item.get(facet, ())):
+                facets[facet].setdefault(value, []).append(n)
+
+    declared = []
+    for item in catalog.values():
+        lab = palette_lab(item.get('colorPalette', []))
+        declared.append((lab, np.full(len(lab), 1 / len(lab)) if len(lab) else np.empty(0)))
+    rendered = [(np.empty((0, 3)), np.empty(0))] * len(items)
+    ordinal = {fid: n for n, fid in enumerate(items)}
+    for figure in figures:
+        if figure.id not in ordinal:
+            continue
+        try:
+            rendered[ordinal[figure.id]] = dominant_colors(_thumbnail(figure, manifest, publish_dir))
+        except Exception as e:
+            print(f'[{figure.name}]   FAIL (palette): {e}')
+
+    cells = {}
+    for n, palettes in enumerate(zip(declared, rendered)):
+        for cell in {_cell(color) for colors, _ in palettes for color in colors}:
+            cells.setdefault(cell, []).append(n)
+    return {
+        'version': 1,
+        'items': items,
+        'text': _postings(text),
+        'facets': {facet: _postings(values) for facet, values in facets.items()},
+        'palettes': {
+            'space': 'CIELAB-D65',
+            'cell': CELL,
+            'declared': [np.round(lab, 1).tolist() for lab, _ in declared],
+            'rendered': [[[*np.round(color, 1).tolist(), round(float(share), 3)] for color, share in zip(lab, w)]
+                         for lab, w in rendered],
+            'cells': _postings(cells),
+            'similar': nearest_palettes(declared, rendered),
+        },
+    }
+
+
+def build_search_index(figures, manifest=None, out_dir=PUBLISH_DIR):
+    """Write search-index.json for the whole catalog; returns the index."""
+    index = build_index(load_catalog(), figures, manifest, out_dir)
+    log = ChangeLog(OUTPUT_DIR)
+    content = json.dumps(index, ensure_ascii=False, separators=(',', ':')).encode('utf-8')
+    log.write(out_dir / INDEX_NAME, content + b'\n')
+    palettes = sum(1 for p in index['palettes']['rendered'] if p)
+    print(f'\nSearch index: {len(index["items"])} items, {len(index["text"])} terms, '
+          f'{palettes} rendered palettes, {len(content) / 1024:.1f} KiB')
+    print(log.summary())
+    return index
@@ -0,0 +1,263 @@
+"""
+Long-lived render server for on-demand gallery previews.
+
+Interpreter startup, matplotlib's font cache and the seaborn/scipy imports are
+paid once; afterwards each request only runs a figure's drawing stage. Data
+stages are cached per figure, so repeated requests for the same figure in
+different styles never recompute data.
+
+Requests and responses are JSON objects, one per line:
+
+    {"id": 1, "figure": "g-001", "style": "nature", "palette": "vibrant", "format": "svg"}
+    {"id": 1, "ok": true, "figure": "g-001", "path": ".../g-001.svg", "bytes": 51234,
+     "queue_ms": 0.4, "render_ms": 212.9, "total_ms": 213.5}
+
+Optional request fields: "dataset" (a dict merged over the figure's computed
+data, e.g. {"y": [[...]]}), "path" (where to write the file, relative to
+gallery_output/renders/; paths leading outside it are rejected) and
+"return": "bytes" (reply with base64 "content" instead of writing a file).
+{"cmd": "stats"} returns latency percentiles, {"cmd": "ping"} a heartbeat.
+"""
+
+import base64
+import json
+import socketserver
+import sys
+import threading
+import time
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+
+import numpy as np
+from matplotlib import font_manager
+
+from . import OUTPUT_DIR
+from .backend import CANVASES, render
+from .output import write
+from .style import STYLES, style_rc
+
+RENDER_DIR = OUTPUT_DIR / 'renders'
+
+
+class LatencyStats:
+    """Rolling per-request latency metrics."""
+
+    def __init__(self, window=1000):
+        self._lock = threading.Lock()
+        self._total = deque(maxlen=window)
+        self._render = deque(maxlen=window)
+        self.requests = 0
+        self.errors = 0
+
+    def record(self, queue_ms, render_ms, ok):
+        with self._lock:
+            self.requests += 1
+            self.errors += not ok
+            self._total.append(queue_ms + render_ms)
+            self._render.append(render_ms)
+
+    @staticmethod
+    def _summary(values):
+        if not values:
+            return {}
+        arr = np.fromiter(values, dtype=float)
+        p50, p95, p99 = np.percentile(arr, [50, 95, 99])
+        return {'mean': round(arr.mean(), 1), 'p50': round(p50, 1), 'p95': round(p95, 1),
+                'p99': round(p99, 1), 'max': round(arr.max(), 1)}
+
+    def snapshot(self):
+        with self._lock:
+            return {
+                'requests': self.requests,
+                'errors': self.errors,
+                'total_ms': self._summary(self._total),
+                'render_ms': self._summary(self._render),
+            }
+
+
+def _render_path(requested):
+    """A client-chosen output path, confined to RENDER_DIR."""
+    root = RENDER_DIR.resolve()
+    path = (root / requested).resolve()
+    if not path.is_relative_to(root) or path == root:
+        raise ValueError(f'path {requested!r} is outside {RENDER_DIR}')
+    return path
+
+
+def _as_data(value):
+    if isinstance(value, list):
+        try:
+            return np.asarray(value, dtype=float)
+        except (TypeError, ValueError):
+            return value
+    return value
+
+
+class RenderServer:
+    """Worker pool plus a bounded request queue in front of backend.render."""
+
+    def __init__(self, figures, workers=4, max_queue=64):
+        self.figures = {}
+        self._figures = list(figures)
+        for figure in self._figures:
+            self.figures[figure.id] = self.figures[figure.name] = figure
+        self.stats = LatencyStats()
+        self._pool = ThreadPoolExecutor(max_workers=workers, thread_name_prefix='render')
+        self._slots = threading.BoundedSemaphore(workers + max_queue)
+        self._data = {}
+        self._data_lock = threading.Lock()
+
+    def warm_up(self, styles=None):
+        """Resolve every style's fonts, compute all data stages and do one full render."""
+        for style in styles or STYLES:
+            rc = style_rc(style)
+            family = rc['font.family']
+            family = family if isinstance(family, str) else family[0]
+            for name in rc.get(f'font.{family}', [family]):
+                font_manager.findfont(font_manager.FontProperties(family=name), fallback_to_default=True)
+        for figure in self._figures:
+            self._figure_data(figure)
+        render(self._figures[0], self._figure_data(self._figures[0]))
+
+    def _figure_data(self, figure):
+        with self._data_lock:
+            if figure.id not in self._data:
+                self._data[figure.id] = figure.compute()
+            return self._data[figure.id]
+
+    def submit(self, request, callback):
+        """Queue a request; blocks while the queue is full (backpressure)."""
+        queued = time.perf_counter()
+        self._slots.acquire()
+
+        def run():
+            try:
+                callback(self.handle(request, queued))
+            finally:
+                self._slots.release()
+
+        self._pool.submit(run)
+
+    def handle(self, request, queued=None):
+        started = time.perf_counter()
+        queue_ms = (started - (queued or started)) * 1000
+        reply = {'id': request.get('id')}
+        cmd = request.get('cmd', 'render')
+        if cmd == 'ping':
+            return {**reply, 'ok': True}
+        if cmd == 'stats':
+            return {**reply, 'ok': True, **self.stats.snapshot()}
+        try:
+            reply.update(self._render(request))
+            reply['ok'] = True
+        except Exception as e:
+            reply.update(ok=False, error=f'{type(e).__name__}: {e}')
+        render_ms = (time.perf_counter() - started) * 1000
+        self.stats.record(queue_ms, render_ms, reply['ok'])
+        reply.update(queue_ms=round(queue_ms, 1), render_ms=round(render_ms, 1),
+                     total_ms=round(queue_ms + render_ms, 1))
+        return reply
+
+    def _render(self, request):
+        figure = self.figures.get(request.get('figure'))
+        if figure is None:
+            raise KeyError(f'unknown figure {request.get("figure")!r}')
+        fmt = request.get('format', 'svg')
+        if fmt not in CANVASES:
+            raise ValueError(f'unsupported format {fmt!r}')
+        style, palette = request.get('style'), request.get('palette')
+        # Checked before rendering so a rejected path costs nothing
+        path = _render_path(request['path']) if request.get('path') else None
+
+        data = self._figure_data(figure)
+        if request.get('dataset'):
+            data = {**data, **{k: _as_data(v) for k, v in request['dataset'].items()}}
+        content = render(figure, data, style, palette, fmt)
+
+        result = {'figure': figure.id, 'bytes': len(content)}
+        if request.get('return') == 'bytes':
+            result['content'] = base64.b64encode(content).decode('ascii')
+            return result
+        path = path or (RENDER_DIR / (style or 'custom') / (palette or 'original')
+                        / Path(figure.filename).with_suffix(f'.{fmt}'))
+        result['changed'] = write(path, content)
+        result['path'] = str(path)
+        return result
+
+    def shutdown(self):
+        self._pool.shutdown(wait=True)
+
+
+def serve_lines(server, lines, send):
+    """Feed JSON-lines requests to the server and return once all are answered.
+
+    Replies are written as renders finish, so they may come back out of order;
+    clients match them up by "id".
+    """
+    send_lock = threading.Lock()
+    finished = threading.Semaphore(0)
+    submitted = 0
+
+    def reply(obj):
+        with send_lock:
+            send(json.dumps(obj) + '\n')
+
+    def on_done(obj):
+        try:
+            reply(obj)
+        finally:
+            finished.release()
+
+    for line in lines:
+        line = line.strip()
+        if not line:
+            continue
+        try:
+            request = json.loads(line)
+        except json.JSONDecodeError as e:
+            reply({'ok': False, 'error': f'invalid JSON: {e}'})
+            continue
+        if not isinstance(request, dict):
+            reply({'ok': False, 'error': 'request must be a JSON object'})
+            continue
+        server.submit(request, on_done)
+        submitted += 1
+    for _ in range(submitted):
+        finished.acquire()
+
+
+def serve_stdio(server):
+    def send(text):
+        sys.stdout.write(text)
+        sys.stdout.flush()
+
+    serve_lines(server, sys.stdin, send)
+    server.shutdown()
+
+
+def serve_socket(server, port=0, unix_path=None):
+    class Handler(socketserver.StreamRequestHandler):
+        def handle(self):
+            def send(text):
+                self.wfile.write(text.encode('utf-8'))
+                self.wfile.flush()
+
+            serve_lines(server, (raw.decode('utf-8') for raw in self.rfile), send)
+
+    if unix_path:
+        Path(unix_path).unlink(missing_ok=True)
+        srv = socketserver.ThreadingUnixStreamServer(unix_path, Handler)
+        where = unix_path
+    else:
+        srv = socketserver.ThreadingTCPServer(('127.0.0.1', port), Handler)
+        where = f'127.0.0.1:{srv.server_address[1]}'
+    srv.daemon_threads = True
+    print(f'Render server listening on {where}', file=sys.stderr)
+    try:
+        srv.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        srv.server_close()
+        server.shutdown()
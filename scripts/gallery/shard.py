@@ -0,0 +1,210 @@
+"""
+Sharded builds coordinated through a shared directory.
+
+``--shard I/N`` (1-based, as in CI matrices) renders one deterministic share
+of a registry into ``<shard dir>/<registry>/<I>-of-<N>/``, and ``--merge``
+combines all N shares into gallery_output/ once every shard has finished.
+The registry name ('gallery', 'figures', 'supplement') comes from the
+entry point, so the generator scripts never overwrite each other's shards.
+Shards never talk to each other or to a service; the shared directory (a
+mounted volume or a CI artifact passed between jobs) is the only
+coordination:
+
+    <shard dir>/costs.json                  render seconds per figure, from merged runs
+    <shard dir>/gallery/2-of-4/report.json  a shard's figures, split, results and run id
+    <shard dir>/gallery/2-of-4/...          its SVGs, sidecars, gallery/ (with --publish)
+
+Figures are split by historical render cost: longest first, each to the
+least-loaded shard (ties by id and shard number), so every shard computes
+the same split from the same costs.json. Figures without history weigh the
+median known cost. Each report records the split's fingerprint, a digest
+of costs.json as the shard read it plus the registry's ids. The merge
+refuses to run until all N reports are there, share one fingerprint (a
+shard re-run after costs.json changed is split differently) and list
+every registry figure exactly once. It then copies shard outputs over with
+the change-only writer, unions the shard manifests into
+gallery_output/gallery/manifest.json, writes one build-report.json and
+folds the measured times into costs.json.
+"""
+
+import hashlib
+import json
+import re
+import shutil
+from collections import Counter
+from pathlib import Path
+
+import numpy as np
+
+from . import OUTPUT_DIR
+from .manifest import PUBLISH_DIR, dump_manifest, load_manifest, prune_assets
+from .output import ChangeLog, write
+
+SHARD_DIR = OUTPUT_DIR / 'shards'
+COSTS = 'costs.json'
+REPORT = 'report.json'
+BUILD_REPORT = 'build-report.json'
+SMOOTHING = 0.5  # weight of the newest measurement in costs.json
+_SHARD_NAME = re.compile(r'^(\d+)-of-(\d+)$')
+
+
+def parse_shard(text):
+    """'2/4' -> (2, 4); raises ValueError unless 1 <= I <= N."""
+    index, _, total = text.partition('/')
+    index, total = int(index), int(total)
+    if not 1 <= index <= total:
+        raise ValueError(f'shard {text!r} is not I/N with 1 <= I <= N')
+    return index, total
+
+
+def shard_dir(index, total, root=SHARD_DIR, registry='gallery'):
+    return root / registry / f'{index}-of-{total}'
+
+
+def _read_costs(root):
+    try:
+        return (root / COSTS).read_bytes()
+    except FileNotFoundError:
+        return b''
+
+
+def load_costs(root=SHARD_DIR):
+    content = _read_costs(root)
+    return json.loads(content) if content else {}
+
+
+def split_fingerprint(costs, figures):
+    """Digest of the costs.json bytes a split was computed from plus the ids split."""
+    h = hashlib.sha256(costs)
+    h.update(b'\0' + '\n'.join(f.id for f in figures).encode('utf-8'))
+    return h.hexdigest()[:16]
+
+
+def assign(figures, total, costs):
+    """Split figures into ``total`` lists of roughly equal historical cost."""
+    default = float(np.median(list(costs.values()))) if costs else 1.0
+    weight = {f.id: costs.get(f.id, default) for f in figures}
+    shards = [[] for _ in range(total)]
+    load = [0.0] * total
+    for figure in sorted(figures, key=lambda f: (-weight[f.id], f.id)):
+        i = min(range(total), key=lambda i: (load[i], i))
+        shards[i].append(figure)
+        load[i] += weight[figure.id]
+    # Keep registry order within a shard
+    order = {f.id: n for n, f in enumerate(figures)}
+    return [sorted(shard, key=lambda f: order[f.id]) for shard in shards], load
+
+
+def prepare(figures, index, total, root=SHARD_DIR, registry='gallery'):
+    """This shard's figures, a fresh output directory for them and the split's fingerprint."""
+    costs = _read_costs(root)
+    shards, load = assign(figures, total, json.loads(costs) if costs else {})
+    out_dir = shard_dir(index, total, root, registry)
+    # A shard's directory is its own scratch space; leftovers from an
+    # earlier split would otherwise be merged again
+    shutil.rmtree(out_dir, ignore_errors=True)
+    out_dir.mkdir(parents=True)
+    print(f'Shard {index}/{total}: {len(shards[index - 1])} of {len(figures)} figures '
+          f'(~{load[index - 1]:.1f}s of ~{sum(load):.1f}s by past render times)')
+    return shards[index - 1], out_dir, split_fingerprint(costs, figures)
+
+
+def write_report(out_dir, index, total, figures, events, split):
+    report = {'shard': index, 'of': total, 'split': split, 'run': events.run,
+              'figures': [f.id for f in figures], 'results': events.finished}
+    write(out_dir / REPORT, (json.dumps(report, indent=2) + '\n').encode('utf-8'))
+
+
+def _reports(root):
+    """All shard reports of one split, or a SystemExit naming what's missing."""
+    found = {}
+    for path in sorted(root.glob(f'*-of-*/{REPORT}')):
+        match = _SHARD_NAME.match(path.parent.name)
+        if match:
+            found.setdefault(int(match.group(2)), {})[int(match.group(1))] = path
+    if not found:
+        raise SystemExit(f'No shard reports under {root}/')
+    if len(found) > 1:
+        raise SystemExit(f'Shard reports from different splits ({", ".join(f"N={n}" for n in sorted(found))}) '
+                         f'under {root}/; remove the stale ones')
+    (total, paths), = found.items()
+    missing = sorted(set(range(1, total + 1)) - paths.keys())
+    if missing:
+        raise SystemExit(f'Shard(s) {", ".join(f"{i}/{total}" for i in missing)} have not reported yet')
+    return [json.loads(paths[i].read_text(encoding='utf-8')) for i in range(1, total + 1)]
+
+
+def _check_split(reports, figures, where):
+    """SystemExit unless the reports share one split that covers ``figures`` exactly once."""
+    splits = {r.get('split') for r in reports}
+    if len(splits) > 1:
+        raise SystemExit(f'Shards under {where}/ were split differently (costs.json or the registry '
+                         f'changed between shard runs); re-run every shard')
+    counts = Counter(f for r in reports for f in r['figures'])
+    ids = [f.id for f in figures]
+    problems = [f'{label}: {", ".join(found)}' for label, found in (
+        ('listed by more than one shard', sorted(f for f, n in counts.items() if n > 1)),
+        ('missing', [f for f in ids if f not in counts]),
+        ('not in this registry', sorted(counts.keys() - set(ids))),
+    ) if found]
+    if problems:
+        raise SystemExit(f'Shards under {where}/ do not cover the registry exactly once ('
+                         + '; '.join(problems) + '); re-run every shard')
+
+
+def merge(figures, root=SHARD_DIR, out_dir=OUTPUT_DIR, registry='gallery'):
+    """Combine the finished shards of ``figures`` (the whole registry) into ``out_dir``.
+
+    Returns the merged finish records.
+    """
+    where = root / registry
+    reports = _reports(where)
+    _check_split(reports, figures, where)
+    total = len(reports)
+    print(f'Merging {total} shards from {where}/ into {out_dir}/ ...\n')
+    log = ChangeLog(out_dir)
+    sources = {}
+    publish_dir = out_dir / PUBLISH_DIR.relative_to(OUTPUT_DIR)
+    manifest = load_manifest(publish_dir / 'manifest.json')
+    published = False
+    for report in reports:
+        src = shard_dir(report['shard'], total, root, registry)
+        for path in sorted(p for p in src.rglob('*') if p.is_file() and not p.name.startswith('.')):
+            rel = path.relative_to(src)
+            if rel == Path(REPORT):
+                continue
+            if rel == Path('gallery', 'manifest.json'):
+                manifest['figures'].update(load_manifest(path)['figures'])
+                published = True
+                continue
+            content = path.read_bytes()
+            if rel in sources and (out_dir / rel).read_bytes() != content:
+                raise SystemExit(f'{rel} differs between shards {sources[rel]} and {report["shard"]}')
+            sources[rel] = report['shard']
+            log.write(out_dir / rel, content)
+        ok = sum(1 for r in report['results'] if r['status'] == 'ok')
+        results = f', {ok} ok' if report['results'] else ''  # variant builds record no results
+        print(f'[shard {report["shard"]}/{total}]   {len(report["figures"])} figures{results}  (run {report["run"]})')
+    if published:
+        log.write(publish_dir / 'manifest.json', dump_manifest(manifest))
+        prune_assets(manifest, publish_dir)
+
+    finished = [r for report in reports for r in report['results']]
+    merged = {'shards': total, 'split': reports[0]['split'], 'runs': [r['run'] for r in reports],
+              'figures': sorted(f for r in reports for f in r['figures']), 'results': finished}
+    log.write(out_dir / BUILD_REPORT, (json.dumps(merged, indent=2) + '\n').encode('utf-8'))
+    update_costs(finished, root)
+    print(log.summary())
+    return finished
+
+
+def update_costs(finished, root=SHARD_DIR):
+    """Fold measured render times into costs.json (failed figures count too)."""
+    costs = load_costs(root)
+    for record in finished:
+        seconds = record.get('seconds')
+        if seconds:
+            old = costs.get(record['figure'])
+            costs[record['figure']] = round(seconds if old is None else
+                                            (1 - SMOOTHING) * old + SMOOTHING * seconds, 4)
+    write(root / COSTS, (json.dumps(dict(sorted(costs.items())), indent=2) + '\n').encode('utf-8'))
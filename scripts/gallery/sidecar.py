@@ -0,0 +1,214 @@
+"""
+Binary data sidecars: the source series behind each figure, in columnar float32.
+
+Every build writes ``<stem>.data.bin`` next to the SVG so the web app can
+load a figure's data (e.g. into ``DataPoint[]``) without parsing CSV:
+
+    bytes 0-3   magic b'FPD1'
+    bytes 4-7   header length H, uint32 little-endian
+    bytes 8-    UTF-8 JSON header, space-padded so the body is 8-byte aligned
+    body        every column back to back, little-endian float32, then the
+                long label lists as NUL-separated UTF-8
+
+The header names the columns and where they live in the body (``offset``
+and ``length`` in float32 elements), plus the string labels, series names
+and palette:
+
+    {"version": 2, "figure": "g-020", "dtype": "float32", "byteOrder": "little",
+     "palette": ["#0C5DA5", ...],
+     "columns": [{"name": "x", "shape": [80], "offset": 0, "length": 80},
+                 {"name": "y", "shape": [5, 80], "offset": 80, "length": 400,
+                  "axes": ["labels", null]}, ...],
+     "labels": {"labels": ["Baseline", ...]}}
+
+Only source series are stored: data keys a figure lists in
+``Figure.derived`` (fits, KDE grids, linkages, jitter) are left out, at any
+depth. String lists are kept out of the way of the header:
+
+* a list with repeated values (a categorical column such as a DataFrame's
+  group) becomes a column of float32 codes with a ``categories`` table;
+* a list of more than INLINE_LABELS distinct strings is stored after the
+  float columns, its label entry giving ``{"offset", "bytes", "count"}``
+  (byte offset from the start of the body).
+
+``axes`` names, per dimension, the label list in the same dict that indexes
+it (when exactly one list has that length). Lists of dicts become one column
+group per element, with a ``series`` name taken the same way, e.g.
+``groups.0.x`` with ``"series": "Group A"``. Because the body is aligned,
+``new Float32Array(buffer, bodyStart + 4 * offset, length)`` is a zero-copy
+view in the browser (lib/figureData.ts), and ``read`` memory-maps it here.
+"""
+
+import json
+import numbers
+import struct
+
+import numpy as np
+
+MAGIC = b'FPD1'
+VERSION = 2
+INLINE_LABELS = 64  # longer label lists go after the float columns
+SUFFIX = '.data.bin'
+_PREAMBLE = struct.Struct('<4sI')
+
+
+def sidecar_name(filename):
+    """'nature-timeseries.svg' -> 'nature-timeseries.data.bin'."""
+    return filename.rsplit('.', 1)[0] + SUFFIX
+
+
+def _is_numeric_list(value):
+    return bool(value) and all(isinstance(v, numbers.Number) for v in value)
+
+
+def _is_string_list(value):
+    return bool(value) and all(isinstance(v, str) for v in value)
+
+
+def _unique_length(labels, n):
+    """The one label list in scope with ``n`` entries, or None."""
+    names = [name for name, values in labels.items() if len(values) == n]
+    return names[0] if len(names) == 1 else None
+
+
+def _categorical(path, values):
+    """A column of codes into the distinct values, in order of first appearance."""
+    categories = {value: code for code, value in enumerate(dict.fromkeys(values))}
+    return {'name': path, 'shape': [len(values)], 'values': [categories[v] for v in values],
+            'categories': list(categories)}
+
+
+def _flatten(value, path, columns, labels, series=None, derived=()):
+    """Split ``value`` into numeric columns and string labels, keyed by dotted path."""
+    if hasattr(value, 'columns') and hasattr(value, 'dtypes'):  # pandas DataFrame
+        value = {str(name): value[name].to_numpy() for name in value.columns}
+    if isinstance(value, dict):
+        scope = {}  # label lists of this dict, for axes/series lookups
+        skip = set()
+        for key, item in value.items():
+            item_path = f'{path}.{key}' if path else str(key)
+            if key in derived:
+                skip.add(item_path)
+                continue
+            if isinstance(item, np.ndarray) and item.dtype.kind in 'OUS':
+                item = item.tolist()
+            if isinstance(item, (list, tuple)) and _is_string_list(item):
+                skip.add(item_path)
+                if len(set(item)) < len(item):
+                    columns.append(_categorical(item_path, item))
+                else:
+                    labels[item_path] = scope[item_path] = list(item)
+        for key, item in value.items():
+            item_path = f'{path}.{key}' if path else str(key)
+            if item_path not in skip:
+                _flatten(item, item_path, columns, labels, scope, derived)
+        return
+    if isinstance(value, str):
+        labels[path] = value
+        return
+    if isinstance(value, (list, tuple)) and not _is_numeric_list(value):
+        if not value:
+            return
+        owner = _unique_length(series or {}, len(value))
+        for i, item in enumerate(value):
+            start = len(columns)
+            _flatten(item, f'{path}.{i}', columns, labels, derived=derived)
+            if owner:
+                for column in columns[start:]:
+                    column.setdefault('series', labels[owner][i])
+        return
+    array = np.asarray(value)
+    if array.dtype.kind not in 'biuf':
+        raise TypeError(f'{path}: cannot store {type(value).__name__} of {array.dtype} as float32')
+    column = {'name': path, 'shape': list(array.shape), 'values': array}
+    axes = [_unique_length(series or {}, n) for n in array.shape]
+    if any(axes):
+        column['axes'] = axes
+    columns.append(column)
+
+
+def encode(figure, data):
+    """Sidecar bytes for one figure's computed data."""
+    columns, labels = [], {}
+    _flatten(data, '', columns, labels, derived=set(getattr(figure, 'derived', ())))
+    body, offset = [], 0
+    for column in columns:
+        values = np.ascontiguousarray(column.pop('values'), dtype='<f4').ravel()
+        column['offset'], column['length'] = offset, len(values)
+        offset += len(values)
+        body.append(values.tobytes())
+    offset *= 4
+    for name, values in labels.items():
+        if isinstance(values, list) and len(values) > INLINE_LABELS:
+            packed = '\0'.join(values).encode('utf-8')
+            labels[name] = {'offset': offset, 'bytes': len(packed), 'count': len(values)}
+            offset += len(packed)
+            body.append(packed)
+    header = json.dumps({
+        'version': VERSION, 'figure': figure.id, 'dtype': 'float32', 'byteOrder': 'little',
+        'palette': list(figure.palette), 'columns': columns, 'labels': labels,
+    }, ensure_ascii=False, separators=(',', ':')).encode('utf-8')
+    header += b' ' * (-(_PREAMBLE.size + len(header)) % 8)
+    return b''.join([_PREAMBLE.pack(MAGIC, len(header)), header, *body])
+
+
+def _parse_header(prefix):
+    magic, size = _PREAMBLE.unpack_from(prefix)
+    if magic != MAGIC:
+        raise ValueError(f'not a figure data sidecar (magic {magic!r})')
+    return size
+
+
+def read(source, mmap=True):
+    """``(header, {name: array})`` from a sidecar path or its bytes.
+
+    Paths are memory-mapped read-only (``mmap=False`` reads them instead);
+    every array is a view into the one body buffer, reshaped to its column.
+    Long label lists are decoded back into ``header['labels']``; categorical
+    columns stay codes into their ``categories``.
+    """
+    if isinstance(source, (bytes, bytearray, memoryview)):
+        content = bytes(source)
+    elif mmap:
+        with open(source, 'rb') as f:
+            size = _parse_header(f.read(_PREAMBLE.size))
+            header = json.loads(f.read(size))
+            start = _PREAMBLE.size + size
+            _check(header)
+            for entry in _packed_labels(header):
+                f.seek(start + entry['offset'])
+                entry['data'] = f.read(entry['bytes'])
+        n = _float_count(header)
+        body = np.memmap(source, dtype='<f4', mode='r', offset=start, shape=(n,)) if n else np.empty(0, '<f4')
+        return _columns(header, body)
+    else:
+        with open(source, 'rb') as f:
+            content = f.read()
+    size = _parse_header(content)
+    start = _PREAMBLE.size + size
+    header = json.loads(content[_PREAMBLE.size:start])
+    _check(header)
+    for entry in _packed_labels(header):
+        entry['data'] = content[start + entry['offset']:start + entry['offset'] + entry['bytes']]
+    return _columns(header, np.frombuffer(content, dtype='<f4', offset=start, count=_float_count(header)))
+
+
+def _check(header):
+    if header.get('version') != VERSION:
+        raise ValueError(f'unsupported sidecar version {header.get("version")}')
+
+
+def _packed_labels(header):
+    return [v for v in header['labels'].values() if isinstance(v, dict)]
+
+
+def _float_count(header):
+    return sum(c['length'] for c in header['columns'])
+
+
+def _columns(header, body):
+    for name, entry in header['labels'].items():
+        if isinstance(entry, dict):
+            header['labels'][name] = entry['data'].decode('utf-8').split('\0') if entry['count'] else []
+    return header, {c['name']: body[c['offset']:c['offset'] + c['length']].reshape(c['shape'])
+                    for c in header['columns']}
@@ -0,0 +1,149 @@
+"""
+Data-size stress runs: how render cost grows with the size of the data.
+
+Figures whose data stage takes a ``scale`` factor (see registry.py) are
+generated at a geometric range of sizes, 1×, 10×, 100× by default. Every
+(figure, scale) step runs in a fresh process, so its peak memory isn't
+masked by earlier steps, and is killed if it overruns the timeout. Each step
+records data and drawing time, peak RSS above the freshly loaded worker,
+and SVG size.
+
+Growth is summarized per metric as a power-law exponent: ``k`` in
+cost ∝ scale^k, from a log-log fit over all steps and over the last step
+alone (the local slope, where cliffs show up first). Fixed per-figure
+overhead keeps small steps flat, so the local slope is the one that flags:
+above ``SUPERLINEAR`` a figure grows faster than its data. Budgets flag any
+step whose time, memory or output size crosses a configured limit.
+"""
+
+import math
+import multiprocessing
+import resource
+import sys
+import time
+
+import numpy as np
+
+from . import OUTPUT_DIR
+from .backend import render
+from .registry import load_figures
+from .supervise import rss_bytes, script_paths
+
+STRESS_DIR = OUTPUT_DIR / 'benchmarks' / 'stress'
+DEFAULT_SCALES = (1, 10, 100)
+TIMEOUT = 300.0
+SUPERLINEAR = 1.2
+BUDGETS = {'seconds': 30.0, 'rss_mb': 2048.0, 'svg_mb': 20.0}
+
+
+def _peak_rss():
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return peak if sys.platform == 'darwin' else peak * 1024
+
+
+def _step_main(conn, scripts, figure_id, scale):
+    figure = {f.id: f for f in load_figures(scripts)}[figure_id]
+    baseline = rss_bytes()
+    try:
+        t0 = time.perf_counter()
+        data = figure.compute(scale)
+        t1 = time.perf_counter()
+        content = render(figure, data)
+        t2 = time.perf_counter()
+        conn.send({'status': 'ok', 'data_seconds': t1 - t0, 'draw_seconds': t2 - t1,
+                   'seconds': t2 - t0, 'rss_mb': (_peak_rss() - baseline) / 2**20,
+                   'svg_mb': len(content) / 2**20})
+    except Exception as e:
+        conn.send({'status': 'error', 'error': f'{type(e).__name__}: {e}'})
+    conn.close()
+
+
+def run_step(figure, scale, timeout=TIMEOUT, ctx=None):
+    """Render one figure at one scale in a fresh process; returns a result dict."""
+    ctx = ctx or multiprocessing.get_context()
+    conn, child = ctx.Pipe()
+    process = ctx.Process(target=_step_main, args=(child, script_paths([figure]), figure.id, scale), daemon=True)
+    t0 = time.monotonic()
+    process.start()
+    child.close()
+    try:
+        if conn.poll(timeout):
+            result = conn.recv()
+        else:
+            result = {'status': 'timeout', 'error': f'exceeded {timeout:g}s', 'seconds': time.monotonic() - t0}
+    except EOFError:
+        result = {'status': 'crash', 'error': 'worker exited before replying'}
+    finally:
+        if process.is_alive():
+            process.kill()
+        process.join()
+        conn.close()
+    return {'figure': figure.id, 'scale': scale, **result}
+
+
+def growth(scales, values):
+    """``(overall, local)`` exponents of a power-law fit, or None with too few points."""
+    points = [(math.log(s), math.log(v)) for s, v in zip(scales, values) if v and v > 0]
+    if len(points) < 2:
+        return None, None
+    x, y = np.array(points).T
+    overall = float(np.polyfit(x, y, 1)[0])
+    local = float((y[-1] - y[-2]) / (x[-1] - x[-2]))
+    return round(overall, 2), round(local, 2)
+
+
+def analyze(steps, budgets=BUDGETS, superlinear=SUPERLINEAR):
+    """Per-figure growth exponents and flags from a list of step results."""
+    by_figure = {}
+    for step in steps:
+        by_figure.setdefault(step['figure'], []).append(step)
+    summary = []
+    for fid, group in by_figure.items():
+        ok = [s for s in sorted(group, key=lambda s: s['scale']) if s['status'] == 'ok']
+        flags = [f'{s["status"]} at {s["scale"]:g}×' for s in group if s['status'] != 'ok']
+        row = {'figure': fid, 'scales': [s['scale'] for s in ok]}
+        for metric in ('seconds', 'rss_mb', 'svg_mb'):
+            overall, local = growth(row['scales'], [s[metric] for s in ok])
+            row[metric] = {'overall': overall, 'local': local}
+            if local is not None and local > superlinear:
+                flags.append(f'{metric} grows ~scale^{local:g}')
+            over = [s['scale'] for s in ok if s[metric] > budgets.get(metric, math.inf)]
+            if over:
+                flags.append(f'{metric} over budget ({budgets[metric]:g}) from {over[0]:g}×')
+        row['flags'] = flags
+        summary.append(row)
+    return summary
+
+
+def run(figures, scales=DEFAULT_SCALES, timeout=TIMEOUT):
+    """Step every figure through the scales, smallest first.
+
+    A figure stops at its first failed step: larger sizes would only fail
+    more slowly.
+    """
+    ctx = multiprocessing.get_context()
+    steps = []
+    for figure in figures:
+        for scale in sorted(scales):
+            step = run_step(figure, scale, timeout, ctx)
+            steps.append(step)
+            if step['status'] == 'ok':
+                print(f'[{figure.name}] {scale:>6g}×  {step["seconds"]:7.2f}s '
+                      f'(data {step["data_seconds"]:.2f}s)  +{step["rss_mb"]:6.0f} MB  '
+                      f'{step["svg_mb"]:7.2f} MB SVG')
+            else:
+                print(f'[{figure.name}] {scale:>6g}×  {step["status"].upper()}: {step["error"]}')
+                break
+    return steps
+
+
+def print_summary(summary):
+    print(f'\n{"figure":<8} {"time k":>13} {"memory k":>13} {"size k":>13}   (overall / last step)')
+    for row in summary:
+        cells = []
+        for metric in ('seconds', 'rss_mb', 'svg_mb'):
+            k = row[metric]
+            cells.append('—' if k['overall'] is None else f'{k["overall"]:.2f} / {k["local"]:.2f}')
+        print(f'{row["figure"]:<8} {cells[0]:>13} {cells[1]:>13} {cells[2]:>13}')
+        for flag in row['flags']:
+            print(f'           ! {flag}')
@@ -0,0 +1,143 @@
+"""
+Journal style presets and color palettes for gallery rendering.
+
+Styles are rcParams overlays applied on top of BASE_RC; palettes mirror the
+template palettes in lib/templates.ts. 'original' keeps each figure's own
+colorPalette from lib/galleryData.ts.
+"""
+
+# Common settings for publication quality
+BASE_RC = {
+    'font.family': 'sans-serif',
+    'font.sans-serif': ['Arial', 'DejaVu Sans', 'Helvetica'],
+    'font.size': 11,
+    'axes.linewidth': 1.2,
+    'axes.labelsize': 12,
+    'xtick.labelsize': 10,
+    'ytick.labelsize': 10,
+    'legend.fontsize': 9,
+    'figure.dpi': 150,
+    'savefig.bbox': 'tight',
+    'savefig.pad_inches': 0.15,
+    # Fixed salt for SVG element ids so re-renders are byte-identical
+    'svg.hashsalt': 'figure-painter',
+}
+
+# Keyed by lower-cased JournalStyle (lib/gallery-types.ts)
+STYLES = {
+    'custom': {},
+    'nature': {
+        'font.sans-serif': ['Arial', 'Helvetica', 'DejaVu Sans'],
+        'axes.linewidth': 0.8,
+        'axes.labelsize': 10,
+        'xtick.labelsize': 8,
+        'ytick.labelsize': 8,
+        'xtick.direction': 'in',
+        'ytick.direction': 'in',
+        'legend.fontsize': 8,
+        'lines.linewidth': 1.2,
+    },
+    'science': {
+        'font.sans-serif': ['Helvetica', 'Arial', 'DejaVu Sans'],
+        'axes.linewidth': 0.6,
+        'axes.labelsize': 9,
+        'xtick.labelsize': 7,
+        'ytick.labelsize': 7,
+        'xtick.direction': 'in',
+        'ytick.direction': 'in',
+        'xtick.major.width': 0.6,
+        'ytick.major.width': 0.6,
+        'legend.fontsize': 7,
+        'lines.linewidth': 0.9,
+    },
+    'ieee': {
+        'font.family': 'serif',
+        'font.serif': ['Times New Roman', 'Times', 'DejaVu Serif'],
+        'mathtext.fontset': 'stix',
+        'axes.linewidth': 0.8,
+        'axes.labelsize': 10,
+        'xtick.labelsize': 8,
+        'ytick.labelsize': 8,
+        'legend.fontsize': 8,
+        'grid.linestyle': ':',
+        'lines.linewidth': 1.0,
+    },
+    'cell': {
+        'font.sans-serif': ['Arial', 'Helvetica', 'DejaVu Sans'],
+        'axes.linewidth': 1.0,
+        'axes.labelsize': 11,
+        'axes.labelweight': 'bold',
+        'xtick.major.size': 4,
+        'ytick.major.size': 4,
+        'legend.fontsize': 8,
+    },
+    'pnas': {
+        'font.sans-serif': ['Helvetica', 'Arial', 'DejaVu Sans'],
+        'axes.linewidth': 0.9,
+        'axes.labelsize': 10,
+        'xtick.labelsize': 9,
+        'ytick.labelsize': 9,
+        'legend.fontsize': 8,
+        'lines.linewidth': 1.3,
+    },
+    'acs': {
+        'font.sans-serif': ['Arial', 'Helvetica', 'DejaVu Sans'],
+        'axes.linewidth': 1.5,
+        'axes.labelsize': 11,
+        'xtick.direction': 'in',
+        'ytick.direction': 'in',
+        'xtick.major.width': 1.2,
+        'ytick.major.width': 1.2,
+        'lines.linewidth': 1.5,
+    },
+    'lancet': {
+        'font.sans-serif': ['Arial', 'Helvetica', 'DejaVu Sans'],
+        'axes.linewidth': 1.0,
+        'axes.labelsize': 11,
+        'axes.titleweight': 'bold',
+        'xtick.labelsize': 9,
+        'ytick.labelsize': 9,
+        'legend.fontsize': 8,
+    },
+}
+
+# Palettes from lib/templates.ts, keyed by template id
+PALETTES = {
+    'default': ['#5470c6', '#91cc75', '#fac858', '#ee6666', '#73c0de', '#3ba272'],
+    'nature': ['#E64B35', '#4DBBD5', '#00A087', '#3C5488', '#F39B7F', '#8491B4', '#91D1C2', '#DC0000'],
+    'ieee': ['#0072BD', '#D95319', '#EDB120', '#7E2F8E', '#77AC30', '#4DBEEE'],
+    'acs': ['#0C5DA5', '#FF2C00', '#00B945', '#FF9500', '#845B97', '#474747'],
+    'science': ['#0C5DA5', '#FF2C00', '#00B945', '#FF9500', '#845B97', '#C20078'],
+    'vibrant': ['#EE7733', '#0077BB', '#33BBEE', '#EE3377', '#CC3311', '#009988', '#BBBBBB'],
+    'muted': ['#CC6677', '#332288', '#DDCC77', '#117733', '#88CCEE', '#882255', '#44AA99', '#999933', '#AA4499', '#DDDDDD'],
+    'highContrast': ['#004488', '#DDAA33', '#BB5566'],
+}
+
+ORIGINAL = 'original'
+
+
+def style_rc(style=None):
+    """Full rcParams dict for a style preset name (None → BASE_RC only)."""
+    if style is not None and style not in STYLES:
+        raise KeyError(f'Unknown style {style!r}; choose from {", ".join(STYLES)}')
+    return {**BASE_RC, **STYLES.get(style or 'custom', {})}
+
+
+def style_key(style=None):
+    """The rcParams a style resolves to, as a string for cache keys."""
+    return repr(sorted(style_rc(style).items()))
+
+
+def fit_palette(palette, default):
+    """Resolve a palette name against a figure's own colors.
+
+    Draw functions index colors up to len(default), so shorter palettes are
+    cycled to that length.
+    """
+    if palette is None or palette == ORIGINAL:
+        return list(default)
+    if palette not in PALETTES:
+        raise KeyError(f'Unknown palette {palette!r}; choose from {ORIGINAL}, {", ".join(PALETTES)}')
+    colors = PALETTES[palette]
+    n = max(len(default), len(colors))
+    return [colors[i % len(colors)] for i in range(n)]
@@ -0,0 +1,205 @@
+"""
+Supervised gallery builds.
+
+Each figure renders in a worker process that the supervisor can kill: a
+figure that runs past its wall-clock timeout or pushes the worker over the
+RSS ceiling is terminated and recorded as failed, while the rest of the
+batch carries on in a fresh worker. A worker that fails to start fails the
+figure it was started for, and the next figure gets a new one. Workers close any leftover figures after
+every task and are recycled after a fixed number of tasks so slow leaks
+can't accumulate. The run ends with a failure summary and a non-zero exit
+status if anything failed.
+"""
+
+import gc
+import multiprocessing
+import os
+import sys
+import time
+from collections import Counter, deque
+from multiprocessing.connection import wait
+from pathlib import Path
+
+from . import OUTPUT_DIR
+from .backend import render
+from .events import EventLog
+from .output import ChangeLog, write
+from .registry import load_figures
+from .sidecar import encode, sidecar_name
+
+POLL_INTERVAL = 0.1
+STARTUP_TIMEOUT = 120
+
+
+def rss_bytes(pid=None):
+    """Resident set size of a process (Linux /proc), or None if unavailable."""
+    try:
+        with open(f'/proc/{pid or "self"}/statm') as f:
+            return int(f.read().split()[1]) * os.sysconf('SC_PAGE_SIZE')
+    except (OSError, ValueError, IndexError):
+        if pid is not None:
+            return None
+    import resource
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return peak if sys.platform == 'darwin' else peak * 1024
+
+
+def _cleanup():
+    pyplot = sys.modules.get('matplotlib.pyplot')
+    if pyplot is not None:
+        pyplot.close('all')
+    gc.collect()
+
+
+def _worker_main(conn, scripts, out_dir):
+    figures = {f.id: f for f in load_figures(scripts)}
+    conn.send('ready')
+    while True:
+        fid = conn.recv()
+        if fid is None:
+            break
+        figure = figures[fid]
+        t0 = time.perf_counter()
+        try:
+            data = figure.compute()
+            sidecar = encode(figure, data)
+            content = render(figure, data)
+            changed = write(out_dir / sidecar_name(figure.filename), sidecar)
+            changed = write(out_dir / figure.filename, content) or changed
+            reply = ('ok', changed, len(content) + len(sidecar))
+        except Exception as e:
+            reply = ('error', f'{type(e).__name__}: {e}', 0)
+        finally:
+            _cleanup()
+        conn.send((*reply, time.perf_counter() - t0, rss_bytes()))
+    conn.close()
+
+
+class _Worker:
+    def __init__(self, ctx, scripts, out_dir):
+        self.conn, child = ctx.Pipe()
+        self.process = ctx.Process(target=_worker_main, args=(child, scripts, out_dir), daemon=True)
+        self.process.start()
+        child.close()
+        # Script loading doesn't count against the first figure's timeout
+        try:
+            ready = self.conn.poll(STARTUP_TIMEOUT) and self.conn.recv() == 'ready'
+        except (EOFError, OSError):  # died while loading the scripts
+            ready = False
+        if not ready:
+            code = self.process.exitcode
+            self.kill()
+            raise RuntimeError('gallery worker failed to start'
+                               + (f' (exit code {code})' if code is not None else ''))
+        self.tasks = 0
+        self.figure = None
+        self.started = 0.0
+
+    def assign(self, figure):
+        self.figure = figure
+        self.started = time.monotonic()
+        self.conn.send(figure.id)
+
+    def stop(self):
+        try:
+            self.conn.send(None)
+        except OSError:
+            pass
+        self.process.join(timeout=5)
+        self.kill()
+
+    def kill(self):
+        if self.process.is_alive():
+            self.process.kill()
+            self.process.join()
+        self.conn.close()
+
+
+def script_paths(figures):
+    """Generator scripts defining these figures, for loading them in a worker."""
+    return sorted({Path(sys.modules[f.data.__module__].__file__).resolve() for f in figures})
+
+
+def supervise(figures, timeout=120.0, max_rss_mb=None, max_tasks=10, jobs=1, out_dir=OUTPUT_DIR, events=None):
+    """Render figures in supervised worker processes; returns a process exit code."""
+    ctx = multiprocessing.get_context()
+    scripts = script_paths(figures)
+    max_rss = max_rss_mb * 1024 * 1024 if max_rss_mb else None
+    queue = deque(figures)
+    idle, busy = [], []
+    failures = {}
+    log = ChangeLog(out_dir)
+    events = events or EventLog()
+    events.emit('build_start', mode='supervised', workers=jobs, figures=len(figures))
+
+    limits = f'timeout {timeout:g}s, recycle after {max_tasks} tasks'
+    if max_rss:
+        limits += f', RSS ≤ {max_rss_mb:g} MB'
+    print(f'Supervising {len(figures)} figures on {jobs} worker(s) ({limits}) ...\n')
+
+    def fail(figure, reason, kind, seconds=None, rss=None):
+        failures[figure.id] = kind
+        events.finish(figure.id, 'error', error=kind, seconds=seconds, rss=rss)
+        print(f'[{figure.name}]   FAIL ({kind}): {reason}')
+
+    while queue or busy:
+        while queue and (idle or len(busy) < jobs):
+            figure = queue.popleft()
+            try:
+                worker = idle.pop() if idle else _Worker(ctx, scripts, out_dir)
+            except (RuntimeError, OSError) as e:
+                # This figure fails; the next one gets a fresh worker
+                fail(figure, e, 'startup')
+                continue
+            worker.assign(figure)
+            events.start(figure.id)
+            busy.append(worker)
+
+        for conn in wait([w.conn for w in busy], timeout=POLL_INTERVAL):
+            worker = next(w for w in busy if w.conn is conn)
+            busy.remove(worker)
+            try:
+                status, detail, size, seconds, rss = conn.recv()
+            except (EOFError, OSError):
+                code = worker.process.exitcode
+                fail(worker.figure, f'worker exited with code {code}', 'crash')
+                worker.kill()
+                continue
+            worker.tasks += 1
+            mem = f'{rss / 2**20:.0f} MB' if rss else 'n/a'
+            if status == 'ok':
+                log.record(out_dir / worker.figure.filename, detail)
+                events.finish(worker.figure.id, size=size, seconds=seconds, rss=rss, changed=detail)
+                print(f'[{worker.figure.name}]   OK: {worker.figure.filename}  '
+                      f'({seconds * 1000:.0f} ms, {size / 1024:.1f} KB, RSS {mem})')
+            else:
+                fail(worker.figure, detail, detail.split(':', 1)[0], seconds, rss)
+            if worker.tasks >= max_tasks or (max_rss and rss and rss > max_rss):
+                worker.stop()
+            else:
+                idle.append(worker)
+
+        now = time.monotonic()
+        for worker in list(busy):
+            if now - worker.started > timeout:
+                reason, kind = f'exceeded {timeout:g}s wall-clock limit', 'timeout'
+            elif max_rss and (rss := rss_bytes(worker.process.pid)) and rss > max_rss:
+                reason, kind = f'RSS {rss / 2**20:.0f} MB over {max_rss_mb:g} MB ceiling', 'memory'
+            else:
+                continue
+            busy.remove(worker)
+            worker.kill()
+            fail(worker.figure, reason, kind)
+
+    for worker in idle:
+        worker.stop()
+
+    ok = len(figures) - len(failures)
+    print(f'\nDone! {ok}/{len(figures)} SVGs saved to {out_dir}/')
+    print(log.summary())
+    if not failures:
+        return 0
+    by_kind = Counter(failures.values())
+    print('Failures: ' + ', '.join(f'{n} {kind}' for kind, n in by_kind.most_common()))
+    print('  ' + ' '.join(sorted(failures)))
+    return 1
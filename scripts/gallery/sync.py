@@ -0,0 +1,175 @@
+"""
+Incremental upload of gallery_output/ to S3-compatible storage (Cloudflare R2).
+
+Local files are mapped to ``<prefix>/<name>`` keys (the layout expected behind
+GALLERY_CDN_BASE): the fixed-name SVGs at the top of gallery_output/ and the
+content-hashed assets plus manifest.json from gallery_output/gallery/.
+Variants and render-server output are not published.
+
+One listing of the remote prefix is compared against local MD5s (the ETag of
+a single-part upload), so only new or changed objects are uploaded. Uploads
+run on a thread pool sharing a bounded connection pool. The fixed-name index
+files of gallery_output/gallery/ (manifest.json, atlas.json,
+search-index.json and their .br/.gz siblings) go last, so they never point
+at assets that aren't there yet.
+
+Needs boto3 (pip install boto3). Credentials come from the usual AWS
+environment variables or config files; pass --endpoint-url for R2 or for a
+local stand-in such as MinIO or ``moto_server``.
+"""
+
+import base64
+import hashlib
+import mimetypes
+import re
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from dataclasses import dataclass
+
+from . import OUTPUT_DIR
+from .compress import ENCODINGS
+from .manifest import HASH_LENGTH, PUBLISH_DIR
+
+DEFAULT_PREFIX = 'gallery'
+IMMUTABLE = 'public, max-age=31536000, immutable'
+REVALIDATE = 'public, max-age=300, must-revalidate'
+
+CONTENT_TYPES = {
+    '.svg': 'image/svg+xml',
+    '.json': 'application/json',
+    '.webp': 'image/webp',
+    '.png': 'image/png',
+    '.pdf': 'application/pdf',
+    '.bin': 'application/octet-stream',
+}
+_HASHED = re.compile(rf'\.[0-9a-f]{{{HASH_LENGTH}}}\.')
+
+
+@dataclass
+class LocalObject:
+    key: str
+    path: object
+    md5: str
+    size: int
+    index: bool = False  # fixed-name file referencing hashed assets; uploaded last
+
+    def headers(self):
+        return object_headers(self.path.name)
+
+
+def object_headers(name):
+    """Content-Type, Cache-Control and Content-Encoding for a file name.
+
+    ``x.svg.br``/``x.svg.gz`` keep the type of ``x.svg`` and carry the
+    matching encoding; names with a content hash are cached forever.
+    """
+    stem, encoding = name, None
+    for ext, enc in ENCODINGS.items():
+        if name.endswith(ext):
+            stem, encoding = name[:-len(ext)], enc
+    dot = stem.rfind('.')
+    suffix = stem[dot:].lower() if dot > 0 else ''
+    content_type = CONTENT_TYPES.get(suffix) or mimetypes.guess_type(stem)[0] or 'application/octet-stream'
+    if content_type in ('image/svg+xml', 'application/json'):
+        content_type += '; charset=utf-8'
+    headers = {
+        'ContentType': content_type,
+        'CacheControl': IMMUTABLE if _HASHED.search(stem) else REVALIDATE,
+    }
+    if encoding:
+        headers['ContentEncoding'] = encoding
+    return headers
+
+
+def _md5(path):
+    return hashlib.md5(path.read_bytes()).hexdigest()
+
+
+def local_objects(prefix=DEFAULT_PREFIX, out_dir=OUTPUT_DIR, publish_dir=PUBLISH_DIR):
+    """Files to publish, keyed by remote key."""
+    files = [*out_dir.glob('*.svg*'), *out_dir.glob('*.data.bin')]
+    if publish_dir.exists():
+        files += [p for p in publish_dir.iterdir() if p.is_file()]
+    objects = {}
+    for path in sorted(files):
+        if path.name.startswith('.'):
+            continue
+        key = f'{prefix}/{path.name}' if prefix else path.name
+        index = path.parent == publish_dir and not _HASHED.search(path.name)
+        objects[key] = LocalObject(key, path, _md5(path), path.stat().st_size, index)
+    return objects
+
+
+def remote_listing(client, bucket, prefix=DEFAULT_PREFIX):
+    """``{key: (etag, size)}`` for every object under the prefix."""
+    listing = {}
+    paginator = client.get_paginator('list_objects_v2')
+    for page in paginator.paginate(Bucket=bucket, Prefix=f'{prefix}/' if prefix else ''):
+        for obj in page.get('Contents', []):
+            listing[obj['Key']] = (obj['ETag'].strip('"'), obj['Size'])
+    return listing
+
+
+def plan(local, remote):
+    """Local objects whose content is missing or different remotely."""
+    changed = []
+    for key, obj in local.items():
+        etag, size = remote.get(key, (None, None))
+        # Multipart ETags ("<md5>-<parts>") aren't content MD5s; re-upload those
+        if etag != obj.md5 or size != obj.size:
+            changed.append(obj)
+    return changed
+
+
+def make_client(endpoint_url=None, region=None, connections=16):
+    try:
+        import boto3
+        from botocore.config import Config
+    except ImportError:
+        raise SystemExit('Syncing needs boto3: pip install boto3')
+    config = Config(max_pool_connections=connections,
+                    retries={'max_attempts': 5, 'mode': 'standard'})
+    return boto3.client('s3', endpoint_url=endpoint_url, region_name=region or 'auto', config=config)
+
+
+def upload(client, bucket, obj):
+    client.put_object(Bucket=bucket, Key=obj.key, Body=obj.path.read_bytes(),
+                      ContentMD5=base64.b64encode(bytes.fromhex(obj.md5)).decode('ascii'),
+                      **obj.headers())
+    return obj
+
+
+def sync(client, bucket, prefix=DEFAULT_PREFIX, jobs=16, dry_run=False, **dirs):
+    """Upload new or changed objects; returns the number of failed uploads."""
+    t0 = time.perf_counter()
+    local = local_objects(prefix, **dirs)
+    remote = remote_listing(client, bucket, prefix)
+    todo = plan(local, remote)
+    size = sum(obj.size for obj in todo)
+    print(f'{len(local)} local objects, {len(remote)} remote; '
+          f'{len(todo)} to upload ({size / 1024:.1f} KB) to s3://{bucket}/{prefix}/')
+    if dry_run:
+        for obj in todo:
+            print(f'  would upload {obj.key}  ({obj.headers()["CacheControl"]})')
+        return 0
+
+    indexes = [obj for obj in todo if obj.index]
+    assets = [obj for obj in todo if not obj.index]
+    failed = 0
+    with ThreadPoolExecutor(max_workers=jobs) as pool:
+        for batch in (assets, indexes):
+            futures = {pool.submit(upload, client, bucket, obj): obj for obj in batch}
+            for future in as_completed(futures):
+                obj = futures[future]
+                try:
+                    future.result()
+                    print(f'  uploaded {obj.key}')
+                except Exception as e:
+                    failed += 1
+                    print(f'  FAIL {obj.key}: {e}')
+            if failed:
+                if indexes and batch is assets:
+                    print(f'  {", ".join(obj.path.name for obj in indexes)} not uploaded because assets failed')
+                break
+    print(f'Synced {len(todo) - failed}/{len(todo)} objects in {time.perf_counter() - t0:.2f}s')
+    return failed
@@ -0,0 +1,321 @@
+"""
+Text-as-text SVG output with shared, subsetted web fonts.
+
+matplotlib's SVG backend normally draws every label as glyph paths, so
+text-heavy figures carry a path definition per glyph plus a ``<use>`` per
+character. In text mode ordinary text stays ``<text>`` and only math text
+(``$\\log_2$`` in g-021) is still drawn as paths, because it is laid out
+from glyphs of several fonts and has no plain-text equivalent.
+
+Each font file the text resolves to is mapped to a web font family
+('Gallery DejaVu Sans', weight/style from the face), with the real family
+and the generic one as fallbacks. Characters are collected over the whole
+batch, so one subset per face is shared by every figure:
+
+    gallery_output/text/<filename>.svg
+    gallery_output/text/fonts/<face>.<hash>.woff2   (woff without brotli)
+
+The text directory holds the latest batch only: subsets of earlier runs
+(older hashes, faces no longer used) and the SVGs that linked them are
+deleted once the new batch is written, as prune_assets does for published
+assets. Each SVG links the faces it uses through an ``@font-face`` rule.
+Browsers only load it where the SVG is a document (inline, ``<object>``,
+opened directly); in an ``<img>`` the text falls back to the local fonts
+named.
+
+The renderer hooks into private RendererSVG methods and mirrors
+FigureCanvasSVG.print_svg, so importing this module checks the matplotlib
+version against MATPLOTLIB_VERSIONS and the signatures of those methods,
+and raises ImportError rather than write subtly wrong SVGs on an untested
+release.
+"""
+
+import codecs
+import functools
+import inspect
+import io
+import time
+from dataclasses import dataclass, field
+from pathlib import Path
+
+import matplotlib
+from matplotlib import cbook
+from matplotlib import font_manager as fm
+from matplotlib.backends.backend_mixed import MixedModeRenderer
+from matplotlib.backends.backend_svg import FigureCanvasSVG, RendererSVG
+from matplotlib.ft2font import FT2Font
+
+from . import OUTPUT_DIR
+from .backend import GATE, METADATA, render
+from .manifest import hashed_name
+from .output import ChangeLog
+from .style import fit_palette
+
+# Releases RendererTextSVG and FigureCanvasTextSVG.print_svg were checked against
+MATPLOTLIB_VERSIONS = ((3, 6), (3, 11))
+# The matplotlib methods used or mirrored, with their expected parameters
+_HOOKS = {
+    (RendererSVG, '_get_clip_attrs'): ['self', 'gc'],
+    (RendererSVG, '_draw_text_as_path'): ['self', 'gc', 'x', 'y', 's', 'prop', 'angle', 'ismath', 'mtext'],
+    (RendererSVG, '_draw_text_as_text'): ['self', 'gc', 'x', 'y', 's', 'prop', 'angle', 'ismath', 'mtext'],
+    (FigureCanvasSVG, 'print_svg'): ['self', 'filename', 'bbox_inches_restore', 'metadata'],
+}
+
+TEXT_DIR = OUTPUT_DIR / 'text'
+FONT_DIR = TEXT_DIR / 'fonts'
+FAMILY_PREFIX = 'Gallery'
+_GENERIC = {'sans-serif', 'serif', 'monospace', 'cursive', 'fantasy'}
+_STYLE_OPEN = b'<style type="text/css">'
+
+
+@dataclass
+class FontUsage:
+    """Characters drawn per font file, collected across renders."""
+    chars: dict = field(default_factory=dict)  # font path -> set of characters
+
+    def add(self, path, text):
+        self.chars.setdefault(path, set()).update(text)
+
+
+@dataclass(frozen=True)
+class Face:
+    path: str
+    family: str        # web font family, e.g. 'Gallery DejaVu Sans'
+    local: str         # the font's own family name, as local fallback
+    weight: int
+    style: str
+
+    @classmethod
+    @functools.lru_cache(maxsize=None)
+    def from_path(cls, path):
+        font = FT2Font(path)
+        entry = fm.ttfFontProperty(font)
+        weight = fm.weight_dict.get(entry.weight, entry.weight)
+        return cls(path, f'{FAMILY_PREFIX} {entry.name}', entry.name, int(weight), entry.style)
+
+
+def _check_matplotlib():
+    low, high = MATPLOTLIB_VERSIONS
+    version = tuple(matplotlib.__version_info__[:2])
+    if not low <= version <= high:
+        raise ImportError(f'gallery.textsvg supports matplotlib {low[0]}.{low[1]} to {high[0]}.{high[1]}, '
+                          f'not {matplotlib.__version__}; re-check RendererTextSVG and '
+                          f'FigureCanvasTextSVG.print_svg against it and widen MATPLOTLIB_VERSIONS')
+    for (cls, name), params in _HOOKS.items():
+        method = getattr(cls, name, None)
+        if method is None or list(inspect.signature(method).parameters) != params:
+            raise ImportError(f'gallery.textsvg: {cls.__name__}.{name} is missing or changed '
+                              f'in matplotlib {matplotlib.__version__}')
+
+
+_check_matplotlib()
+
+
+def _generic(prop):
+    families = [f.replace('sans', 'sans-serif') if f in ('sans', 'sans serif') else f for f in prop.get_family()]
+    return next((f for f in families if f in _GENERIC), 'sans-serif')
+
+
+class RendererTextSVG(RendererSVG):
+    """RendererSVG that keeps text as <text> but draws math text as paths."""
+
+    def __init__(self, *args, usage, **kwargs):
+        self.usage = usage
+        self.faces = {}     # font path -> Face
+        self.generics = {}  # web family -> generic fallback family
+        self.math = 0       # math texts drawn as paths
+        super().__init__(*args, **kwargs)
+
+    def draw_text(self, gc, x, y, s, prop, angle, ismath=False, mtext=None):
+        clip_attrs = self._get_clip_attrs(gc)
+        if clip_attrs:
+            self.writer.start('g', **clip_attrs)
+        if gc.get_url() is not None:
+            self.writer.start('a', {'xlink:href': gc.get_url(), 'target': '_blank'})
+
+        if ismath:
+            self.math += 1
+            self._draw_text_as_path(gc, x, y, s, prop, angle, ismath, mtext)
+        else:
+            path = fm.findfont(prop)
+            face = self.faces.setdefault(path, Face.from_path(path))
+            self.usage.add(path, s)
+            web = prop.copy()
+            # Expanded to "'Gallery X', 'X', <generic>" when the SVG is finalized
+            web.set_family([face.family])
+            self._draw_text_as_text(gc, x, y, s, web, angle, ismath, mtext)
+            self.generics[face.family] = _generic(prop)
+
+        if gc.get_url() is not None:
+            self.writer.end('a')
+        if clip_attrs:
+            self.writer.end('g')
+
+
+class FigureCanvasTextSVG(FigureCanvasSVG):
+    usage = None
+    renderer = None
+
+    def print_svg(self, filename, *, bbox_inches_restore=None, metadata=None, **kwargs):
+        # Same as FigureCanvasSVG.print_svg, with the text-mode renderer
+        with cbook.open_file_cm(filename, 'w', encoding='utf-8') as fh:
+            if not cbook.file_requires_unicode(fh):
+                fh = codecs.getwriter('utf-8')(fh)
+            dpi = self.figure.dpi
+            self.figure.dpi = 72
+            width, height = self.figure.get_size_inches()
+            w, h = width * 72, height * 72
+            svg = RendererTextSVG(w, h, fh, image_dpi=dpi, metadata=metadata, usage=self.usage)
+            renderer = MixedModeRenderer(self.figure, width, height, dpi, svg,
+                                         bbox_inches_restore=bbox_inches_restore)
+            self.figure.draw(renderer)
+            renderer.finalize()
+            self.renderer = svg
+
+
+@dataclass
+class TextSVG:
+    """A text-mode SVG before its @font-face rules are filled in."""
+    figure: object
+    content: bytes
+    faces: dict
+    generics: dict
+    math: int
+    seconds: float
+
+
+def render_text_svg(figure, data, usage, style=None, palette=None):
+    """Render in text mode; the @font-face block is added by ``link_fonts``."""
+    t0 = time.perf_counter()
+    buf = io.BytesIO()
+    with GATE.use(style):
+        fig = figure.draw(data, fit_palette(palette, figure.palette))
+        canvas = FigureCanvasTextSVG(fig)
+        canvas.usage = usage
+        fig.savefig(buf, format='svg', bbox_inches='tight', metadata=METADATA['svg'])
+    r = canvas.renderer
+    return TextSVG(figure, buf.getvalue(), r.faces, r.generics, r.math, time.perf_counter() - t0)
+
+
+def subset_fonts(usage, out_dir=FONT_DIR):
+    """Write one subset per used face; returns ``{font path: (Face, file name)}``."""
+    from fontTools import subset
+
+    try:
+        import brotli  # noqa: F401  (needed by fontTools for woff2)
+        flavor = 'woff2'
+    except ImportError:
+        flavor = 'woff'
+    log = ChangeLog(out_dir.parent.parent)
+    fonts = {}
+    for path, chars in sorted(usage.chars.items()):
+        face = Face.from_path(path)
+        options = subset.Options()
+        options.flavor = flavor
+        options.layout_features = ['kern', 'liga']
+        options.hinting = False
+        options.desubroutinize = True
+        options.drop_tables += ['FFTM']
+        font = subset.load_font(path, options)
+        subsetter = subset.Subsetter(options)
+        subsetter.populate(text=''.join(sorted(chars)))
+        subsetter.subset(font)
+        buf = io.BytesIO()
+        subset.save_font(font, buf, options)
+        content = buf.getvalue()
+        name = hashed_name(Path(path).stem + f'.{flavor}', content)
+        log.write(out_dir / name, content)
+        fonts[path] = (face, name)
+    print(log.summary())
+    return fonts
+
+
+def link_fonts(svg, fonts, url_prefix='fonts'):
+    """Final SVG bytes: @font-face rules for the faces used, fallback families expanded."""
+    rules, content = [], svg.content
+    for path, face in sorted(svg.faces.items()):
+        _, name = fonts[path]
+        fmt = 'woff2' if name.endswith('.woff2') else 'woff'
+        rules.append(f"@font-face{{font-family:'{face.family}';font-weight:{face.weight};"
+                     f"font-style:{face.style};src:url({url_prefix}/{name}) format('{fmt}')}}")
+    # Faces of one family (regular, bold) share the family name
+    for family, local in sorted({(f.family, f.local) for f in svg.faces.values()}):
+        generic = svg.generics.get(family, 'sans-serif')
+        content = content.replace(f"font-family: '{family}'".encode(),
+                                  f"font-family: '{family}', '{local}', {generic}".encode())
+    # Into matplotlib's own <style> block (written before any drawing)
+    return content.replace(_STYLE_OPEN, _STYLE_OPEN + '\n'.join(rules).encode() + b'\n', 1)
+
+
+def prune_text_dir(svgs, fonts, out_dir=TEXT_DIR):
+    """Delete SVGs and font subsets not written by the latest batch; returns them."""
+    live_fonts = {name for _, name in fonts.values()}
+    stale = [p for p in out_dir.glob('*.svg') if p.name not in svgs]
+    stale += [p for p in (out_dir / 'fonts').glob('*.woff*') if p.name not in live_fonts]
+    for path in stale:
+        path.unlink()
+    return stale
+
+
+def _best_of(repeat, fn):
+    times, result = [], None
+    for _ in range(max(1, repeat)):
+        t0 = time.perf_counter()
+        result = fn()
+        times.append(time.perf_counter() - t0)
+    return result, min(times)
+
+
+def build_text_svgs(figures, out_dir=TEXT_DIR, compare=True, repeat=3):
+    """Render figures in text mode with shared fonts.
+
+    With ``compare``, each figure is also rendered the default way (glyph
+    paths) and both renders are timed best-of-``repeat``; returns the
+    per-figure rows and the total size of the shared fonts.
+    """
+    usage = FontUsage()
+    rendered, rows = [], []
+    print(f'Rendering {len(figures)} figures as text-mode SVG into {out_dir}/ ...\n')
+    for figure in figures:
+        data = figure.compute()
+        try:
+            svg, seconds = _best_of(repeat if compare else 1, lambda: render_text_svg(figure, data, usage))
+        except Exception as e:
+            print(f'[{figure.name}]   FAIL: {e}')
+            continue
+        rendered.append(svg)
+        row = {'figure': figure.id, 'text_seconds': round(seconds, 4)}
+        if compare:
+            paths, seconds = _best_of(repeat, lambda: render(figure, data))
+            row.update(path_bytes=len(paths), path_seconds=round(seconds, 4))
+        rows.append(row)
+
+    fonts = subset_fonts(usage, out_dir / 'fonts')
+    log = ChangeLog(out_dir.parent)
+    for svg, row in zip(rendered, rows):
+        content = link_fonts(svg, fonts)
+        log.write(out_dir / svg.figure.filename, content)
+        row.update(text_bytes=len(content), math_as_paths=svg.math)
+        print(f'[{svg.figure.name}]   OK: {svg.figure.filename}')
+    font_bytes = sum((out_dir / 'fonts' / name).stat().st_size for _, name in fonts.values())
+    print(log.summary())
+    stale = prune_text_dir({svg.figure.filename for svg in rendered}, fonts, out_dir)
+    if stale:
+        print(f'Removed {len(stale)} file(s) of earlier batches')
+    return rows, font_bytes
+
+
+def print_report(rows, font_bytes):
+    rows = [r for r in rows if 'path_bytes' in r]
+    if not rows:
+        return
+    print(f'\n{"figure":<8} {"paths KB":>9} {"text KB":>8} {"saved":>6} {"paths ms":>9} {"text ms":>8}')
+    for r in rows:
+        saved = 1 - r['text_bytes'] / r['path_bytes']
+        print(f'{r["figure"]:<8} {r["path_bytes"] / 1024:>9.1f} {r["text_bytes"] / 1024:>8.1f} {saved:>6.0%} '
+              f'{r["path_seconds"] * 1000:>9.0f} {r["text_seconds"] * 1000:>8.0f}'
+              + (f'   ({r["math_as_paths"]} math text(s) as paths)' if r['math_as_paths'] else ''))
+    paths = sum(r['path_bytes'] for r in rows)
+    text = sum(r['text_bytes'] for r in rows)
+    print(f'\nTotal: {paths / 1024:.1f} KB as paths, {text / 1024:.1f} KB as text '
+          f'+ {font_bytes / 1024:.1f} KB shared fonts ({1 - (text + font_bytes) / paths:.0%} saved)')
@@ -0,0 +1,160 @@
+"""
+Multi-resolution tiled output for heatmaps.
+
+``imshow`` embeds one full-resolution raster in the SVG, which stops working
+long before genome- or benchmark-scale matrices. Tiled export instead builds
+an image pyramid from the matrix itself:
+
+* each level halves the previous one by aggregating 2×2 blocks (mean, or
+  max to keep isolated peaks visible) in one reshape over the whole array;
+  NaN cells are ignored and odd edges are padded with NaN;
+* values are aggregated first and colored afterwards, with the figure's own
+  colormap and normalization, so every level shows real values;
+* levels are cut into Deep Zoom tiles (``<name>.dzi`` plus
+  ``<name>_files/<level>/<col>_<row>.png``, as read by OpenSeadragon), one
+  matrix cell per pixel at the deepest level;
+* the figure itself is redrawn as a low-resolution SVG overview with the
+  matrix swapped for the largest level under ``OVERVIEW_MAX`` cells.
+
+heatmap.json describes the pyramid for the detail view.
+"""
+
+import io
+import json
+import math
+from concurrent.futures import ThreadPoolExecutor
+
+import numpy as np
+from matplotlib.backends.backend_svg import FigureCanvasSVG
+from PIL import Image
+
+from . import OUTPUT_DIR
+from .backend import GATE, METADATA
+from .output import ChangeLog
+from .style import fit_palette
+
+TILE_DIR = OUTPUT_DIR / 'tiles'
+TILE_SIZE = 254
+OVERLAP = 1
+OVERVIEW_MAX = 256
+AGGREGATES = ('mean', 'max')
+
+
+def downsample(values, agg='mean'):
+    """Halve a 2-D float array by aggregating 2×2 blocks, ignoring NaN."""
+    h, w = values.shape
+    padded = np.full((h + h % 2, w + w % 2), np.nan, dtype=values.dtype)
+    padded[:h, :w] = values
+    blocks = padded.reshape(padded.shape[0] // 2, 2, padded.shape[1] // 2, 2)
+    corners = blocks[:, 0, :, 0], blocks[:, 0, :, 1], blocks[:, 1, :, 0], blocks[:, 1, :, 1]
+    if agg == 'max':
+        # fmax ignores NaN unless both sides are NaN
+        return np.fmax(np.fmax(corners[0], corners[1]), np.fmax(corners[2], corners[3]))
+    count = sum((~np.isnan(c)).astype(np.uint8) for c in corners)
+    total = sum(np.nan_to_num(c) for c in corners)
+    with np.errstate(invalid='ignore', divide='ignore'):
+        return total / count
+
+
+def pyramid(matrix, agg='mean'):
+    """Levels from 1×1 up to the full matrix, Deep Zoom order (index = level)."""
+    level = np.asarray(matrix, dtype=np.float32)
+    levels = [level]
+    while max(level.shape) > 1:
+        level = downsample(level, agg)
+        levels.append(level)
+    return levels[::-1]
+
+
+def colorize(values, cmap, norm):
+    """RGBA uint8 image of ``values``; NaN cells are transparent."""
+    rgba = cmap(norm(np.ma.masked_invalid(values)), bytes=True)
+    rgba[np.isnan(values)] = 0
+    return rgba
+
+
+def _tiles(shape, size=TILE_SIZE, overlap=OVERLAP):
+    """``(col, row, (top, bottom, left, right))`` for every tile of a level."""
+    h, w = shape
+    for row in range(math.ceil(h / size)):
+        for col in range(math.ceil(w / size)):
+            top, left = max(0, row * size - overlap), max(0, col * size - overlap)
+            bottom, right = min(h, (row + 1) * size + overlap), min(w, (col + 1) * size + overlap)
+            yield col, row, (top, bottom, left, right)
+
+
+def _png(rgba):
+    buf = io.BytesIO()
+    Image.fromarray(rgba, 'RGBA').save(buf, format='PNG', optimize=False, compress_level=6)
+    return buf.getvalue()
+
+
+def _dzi(shape):
+    h, w = shape
+    return (f'<?xml version="1.0" encoding="UTF-8"?>\n'
+            f'<Image xmlns="http://schemas.microsoft.com/deepzoom/2008" Format="png" '
+            f'Overlap="{OVERLAP}" TileSize="{TILE_SIZE}">\n'
+            f'  <Size Width="{w}" Height="{h}"/>\n</Image>\n').encode('utf-8')
+
+
+def heatmap_image(fig):
+    """The figure's largest imshow image (the heatmap), or None."""
+    images = [im for ax in fig.axes for im in ax.images]
+    return max(images, key=lambda im: im.get_array().size, default=None)
+
+
+def tile_matrix(matrix, cmap, norm, out_dir, name, agg='mean', workers=None, log=None):
+    """Write the Deep Zoom pyramid of a matrix; returns ``(levels, tile count)``."""
+    levels = pyramid(matrix, agg)
+    files_dir = out_dir / f'{name}_files'
+    log = log or ChangeLog(OUTPUT_DIR)
+    log.write(out_dir / f'{name}.dzi', _dzi(levels[-1].shape))
+
+    def encode(job):
+        index, col, row, (top, bottom, left, right) = job
+        return files_dir / str(index) / f'{col}_{row}.png', _png(colorize(levels[index][top:bottom, left:right], cmap, norm))
+
+    jobs = [(index, *tile) for index, level in enumerate(levels) for tile in _tiles(level.shape)]
+    written = set()
+    with ThreadPoolExecutor(workers) as pool:  # PNG encoding releases the GIL
+        for path, content in pool.map(encode, jobs):
+            log.write(path, content)
+            written.add(path)
+    if files_dir.exists():
+        for stale in files_dir.glob('*/*.png'):
+            if stale not in written:
+                stale.unlink()
+    return levels, len(jobs)
+
+
+def tile_figure(figure, scale=1, agg='mean', out_dir=TILE_DIR, workers=None):
+    """Tile one heatmap figure and write its overview SVG and heatmap.json."""
+    data = figure.compute(scale)
+    stem = figure.filename.rsplit('.', 1)[0]
+    target = out_dir / stem
+    log = ChangeLog(OUTPUT_DIR)
+    with GATE.use(None):
+        fig = figure.draw(data, fit_palette(None, figure.palette))
+        image = heatmap_image(fig)
+        if image is None:
+            raise ValueError(f'{figure.id} draws no imshow heatmap')
+        matrix = np.ma.filled(image.get_array().astype(np.float32), np.nan)
+        cmap, norm = image.cmap, image.norm
+        levels, n_tiles = tile_matrix(matrix, cmap, norm, target, stem, agg, workers, log)
+        # Overview: the same figure around the largest level that stays small
+        overview_level = max(i for i, level in enumerate(levels) if max(level.shape) <= OVERVIEW_MAX)
+        image.set_data(np.ma.masked_invalid(levels[overview_level]))
+        buf = io.BytesIO()
+        FigureCanvasSVG(fig)
+        fig.savefig(buf, format='svg', bbox_inches='tight', metadata=METADATA['svg'])
+    log.write(target / f'{stem}.overview.svg', buf.getvalue())
+    meta = {
+        'figure': figure.id, 'rows': int(matrix.shape[0]), 'columns': int(matrix.shape[1]),
+        'aggregate': agg, 'levels': len(levels), 'tileSize': TILE_SIZE, 'overlap': OVERLAP,
+        'format': 'png', 'tiles': n_tiles, 'dzi': f'{stem}.dzi', 'overview': f'{stem}.overview.svg',
+        'overviewLevel': overview_level, 'colormap': cmap.name,
+        'vmin': float(norm.vmin), 'vmax': float(norm.vmax),
+        'extent': [float(v) for v in image.get_extent()],
+    }
+    log.write(target / 'heatmap.json', (json.dumps(meta, indent=2) + '\n').encode('utf-8'))
+    return meta, log
@@ -0,0 +1,195 @@
+"""
+Watch mode: re-render only the figures whose generator code changed.
+
+Each generator script is parsed into per-function AST digests (formatting
+and comments don't count as changes). On save, the changed functions are
+mapped to the figures whose data or drawing stage reaches them, directly or
+through module-level helpers, and only those figures are re-rendered in this
+already-warm process. Data is re-computed only when the data stage itself
+changed; otherwise the cached data is drawn again.
+
+Renders go where a build puts them: gallery_output/<filename>, or with a
+style or palette the variant path of build_variants. The data sidecar
+(always next to the default SVG) is rewritten along with every render, so
+it follows data edits.
+"""
+
+import ast
+import hashlib
+import time
+import traceback
+from dataclasses import dataclass, field
+from pathlib import Path
+
+from . import OUTPUT_DIR
+from .backend import render
+from .output import variant_path, write
+from .registry import SCRIPTS_DIR, load_script
+from .sidecar import encode, sidecar_name
+
+WATCH_GLOB = 'generate-gallery-*.py'
+
+
+@dataclass
+class Snapshot:
+    """Digest of one generator script's source."""
+    functions: dict = field(default_factory=dict)  # name -> digest
+    calls: dict = field(default_factory=dict)      # name -> module functions it references
+    module: str = ''                               # digest of all other top-level code
+
+    def closure(self, name):
+        """``name`` plus every module function it reaches."""
+        seen, stack = set(), [name]
+        while stack:
+            fn = stack.pop()
+            if fn in seen or fn not in self.functions:
+                continue
+            seen.add(fn)
+            stack.extend(self.calls.get(fn, ()))
+        return seen
+
+
+def _digest(node):
+    return hashlib.sha1(ast.dump(node).encode('utf-8')).hexdigest()
+
+
+def _is_main_guard(node):
+    return (isinstance(node, ast.If) and isinstance(node.test, ast.Compare)
+            and isinstance(node.test.left, ast.Name) and node.test.left.id == '__name__')
+
+
+def snapshot(source):
+    tree = ast.parse(source)
+    snap = Snapshot()
+    other = []
+    for node in tree.body:
+        if isinstance(node, (ast.FunctionDef, ast.AsyncFunctionDef)):
+            snap.functions[node.name] = _digest(node)
+            snap.calls[node.name] = {n.id for n in ast.walk(node) if isinstance(n, ast.Name)}
+        elif isinstance(node, ast.Assign) and any(
+                isinstance(t, ast.Name) and t.id == 'FIGURES' for t in node.targets):
+            pass  # registry entries are compared figure by figure in affected()
+        elif not _is_main_guard(node):
+            other.append(ast.dump(node))
+    snap.module = hashlib.sha1('\n'.join(other).encode('utf-8')).hexdigest()
+    for name, refs in snap.calls.items():
+        snap.calls[name] = (refs & snap.functions.keys()) - {name}
+    return snap
+
+
+def _entry(figure):
+    return (figure.filename, figure.data.__name__, figure.draw.__name__, tuple(figure.palette))
+
+
+def _reaches(snap, stage):
+    """Module functions a stage reaches; a Composition starts from its panels."""
+    panels = getattr(stage, 'panels', None)
+    starts = [p.draw.__name__ for p in panels] if panels is not None else [stage.__name__]
+    return set().union(*(snap.closure(name) for name in starts))
+
+
+def affected(old, new, old_figures, new_figures):
+    """Figures to re-render, as ``{id: recompute_data}``."""
+    if old.module != new.module:
+        return {f.id: True for f in new_figures}
+    changed = {name for name, digest in new.functions.items() if old.functions.get(name) != digest}
+    before = {f.id: _entry(f) for f in old_figures}
+    result = {}
+    for figure in new_figures:
+        data_changed = bool(_reaches(new, figure.data) & changed)
+        draw_changed = bool(_reaches(new, figure.draw) & changed)
+        entry_changed = before.get(figure.id) != _entry(figure)
+        if data_changed or draw_changed or entry_changed:
+            result[figure.id] = data_changed or figure.id not in before
+    return result
+
+
+class Watcher:
+    def __init__(self, paths=None, out_dir=OUTPUT_DIR, style=None, palette=None):
+        self._explicit = [Path(p) for p in paths] if paths else None
+        self.out_dir = out_dir
+        self.style, self.palette = style, palette
+        self._state = {}  # path -> (mtime, source, snapshot, figures)
+        self._data = {}   # figure id -> cached data
+
+    def paths(self):
+        return self._explicit or sorted(SCRIPTS_DIR.glob(WATCH_GLOB))
+
+    def _render(self, figure, recompute):
+        t0 = time.perf_counter()
+        if recompute or figure.id not in self._data:
+            self._data[figure.id] = figure.compute()
+        data = self._data[figure.id]
+        # Change-only write: unchanged unless the data (or the palette in its header) moved
+        write(self.out_dir / sidecar_name(figure.filename), encode(figure, data))
+        content = render(figure, data, self.style, self.palette)
+        return (time.perf_counter() - t0) * 1000, write(self.output_path(figure), content)
+
+    def output_path(self, figure):
+        if self.style or self.palette:
+            return variant_path(self.out_dir, figure.filename, self.style, self.palette)
+        return self.out_dir / figure.filename
+
+    def load(self, render_all=False):
+        for path in self.paths():
+            source = path.read_text(encoding='utf-8')
+            module = load_script(path)
+            self._state[path] = (path.stat().st_mtime_ns, source, snapshot(source), list(module.FIGURES))
+            if render_all:
+                self._rerender({f.id: True for f in module.FIGURES}, module.FIGURES)
+
+    def _rerender(self, plan, figures):
+        by_id = {f.id: f for f in figures}
+        for fid, recompute in plan.items():
+            figure = by_id[fid]
+            try:
+                ms, changed = self._render(figure, recompute)
+                what = 'data + draw' if recompute else 'draw'
+                note = '' if changed else ', output unchanged'
+                print(f'[{figure.name}]   OK: {figure.filename}  ({what}, {ms:.0f} ms{note})')
+            except Exception as e:
+                print(f'[{figure.name}]   FAIL: {type(e).__name__}: {e}')
+
+    def poll(self):
+        """Check every script once; returns the number of figures re-rendered."""
+        rendered = 0
+        for path in self.paths():
+            try:
+                mtime = path.stat().st_mtime_ns
+            except FileNotFoundError:
+                continue
+            previous = self._state.get(path)
+            if previous and previous[0] == mtime:
+                continue
+            source = path.read_text(encoding='utf-8')
+            if previous and previous[1] == source:
+                self._state[path] = (mtime, *previous[1:])
+                continue
+            try:
+                snap = snapshot(source)
+                module = load_script(path, source=source)
+                figures = list(module.FIGURES)
+            except Exception:
+                print(f'\n{path.name}: not reloaded, keeping previous figures')
+                traceback.print_exc(limit=1)
+                self._state[path] = (mtime, *previous[1:]) if previous else (mtime, source, Snapshot(), [])
+                continue
+            if previous:
+                plan = affected(previous[2], snap, previous[3], figures)
+            else:
+                plan = {f.id: True for f in figures}
+            self._state[path] = (mtime, source, snap, figures)
+            print(f'\n{path.name} changed → {len(plan)} figure(s) to re-render')
+            self._rerender(plan, figures)
+            rendered += len(plan)
+        return rendered
+
+    def run(self, interval=0.5):
+        names = ', '.join(p.name for p in self.paths())
+        print(f'Watching {names} (Ctrl+C to stop)')
+        try:
+            while True:
+                self.poll()
+                time.sleep(interval)
+        except KeyboardInterrupt:
+            print('\nStopped.')
@@ -3,101 +3,96 @@ Generate 20 publication-quality SVG figures for the scientific figure gallery.
 Each figure matches the exact colorPalette, chartType, and journalStyle
 defined in lib/galleryData.ts.
 
+Every figure is registered as a data stage (``gNNN_data``) and a drawing
+stage (``gNNN``) so the same data can be re-drawn under other styles and
+palettes (see scripts/gallery/).
+
 Usage:
-    python scripts/generate-gallery-figures.py
+    python scripts/generate-gallery-figures.py [g001 ...]
+    python scripts/generate-gallery-figures.py --styles nature ieee --palettes original vibrant
 
 Output:
     gallery_output/*.svg  (20 SVG files)
 """
 
-import os
 import numpy as np
-import matplotlib
-matplotlib.use('Agg')
-import matplotlib.pyplot as plt
-import matplotlib.patches as mpatches
+from matplotlib.colors import LinearSegmentedColormap
 from matplotlib.gridspec import GridSpec
-import seaborn as sns
 from scipy import stats
-from pathlib import Path
-
-OUTPUT_DIR = Path(__file__).parent.parent / 'gallery_output'
-OUTPUT_DIR.mkdir(exist_ok=True)
-
-# Common settings for publication quality
-plt.rcParams.update({
-    'font.family': 'sans-serif',
-    'font.sans-serif': ['Arial', 'DejaVu Sans', 'Helvetica'],
-    'font.size': 11,
-    'axes.linewidth': 1.2,
-    'axes.labelsize': 12,
-    'xtick.labelsize': 10,
-    'ytick.labelsize': 10,
-    'legend.fontsize': 9,
-    'figure.dpi': 150,
-    'savefig.bbox': 'tight',
-    'savefig.pad_inches': 0.15,
-})
-
-np.random.seed(42)
 
-
-def save(fig, name):
-    path = OUTPUT_DIR / name
-    fig.savefig(path, format='svg', bbox_inches='tight')
-    plt.close(fig)
-    print(f'  OK: {name}')
+from gallery.backend import new_figure
+from gallery.build import main
+from gallery.panels import Composition, Panel
+from gallery.registry import Figure
 
 
 # ─────────────────────────────────────────────────────
 # g-001: Multi-panel Time Series Comparison (Nature, muted)
 # ─────────────────────────────────────────────────────
-def g001():
-    colors = ['#4E79A7', '#F28E2B', '#E15759', '#76B7B2', '#59A14F']
-    fig, axes = plt.subplots(2, 2, figsize=(8, 6), sharex=True)
+def g001_data(rng):
     x = np.linspace(0, 10, 100)
-    titles = ['Dataset A', 'Dataset B', 'Dataset C', 'Dataset D']
-    for idx, ax in enumerate(axes.flat):
-        for i, c in enumerate(colors):
-            noise = np.random.normal(0, 0.3, len(x))
-            y = np.sin(x + i * 0.5 + idx) * (1 + idx * 0.2) + noise + i * 0.5
-            ax.plot(x, y, color=c, linewidth=1.5, label=f'Method {i+1}')
-        ax.set_title(titles[idx], fontsize=10, fontweight='bold')
-        ax.spines['top'].set_visible(False)
-        ax.spines['right'].set_visible(False)
-        ax.grid(True, alpha=0.2, linewidth=0.5)
-    axes[0, 0].legend(frameon=False, ncol=2, fontsize=7)
-    axes[1, 0].set_xlabel('Time (s)')
-    axes[1, 1].set_xlabel('Time (s)')
-    axes[0, 0].set_ylabel('Value')
-    axes[1, 0].set_ylabel('Value')
-    fig.suptitle('Multi-panel Time Series Comparison', fontsize=13, fontweight='bold', y=1.01)
-    fig.tight_layout()
-    save(fig, 'nature-timeseries.svg')
+    y = np.empty((4, 5, len(x)))
+    for idx in range(4):
+        for i in range(5):
+            noise = rng.normal(0, 0.3, len(x))
+            y[idx, i] = np.sin(x + i * 0.5 + idx) * (1 + idx * 0.2) + noise + i * 0.5
+    return {'x': x, 'y': y, 'titles': ['Dataset A', 'Dataset B', 'Dataset C', 'Dataset D']}
+
+
+def g001_panel(fig, d, colors, idx):
+    ax = fig.subplots()
+    for i, y in enumerate(d['y'][idx]):
+        ax.plot(d['x'], y, color=colors[i], linewidth=1.5, label=f'Method {i+1}')
+    ax.set_title(d['titles'][idx], fontsize=10, fontweight='bold')
+    ax.spines['top'].set_visible(False)
+    ax.spines['right'].set_visible(False)
+    ax.grid(True, alpha=0.2, linewidth=0.5)
+    if idx == 0:
+        ax.legend(frameon=False, ncol=2, fontsize=7)
+    if idx < 2:
+        ax.tick_params(labelbottom=False)
+    else:
+        ax.set_xlabel('Time (s)')
+    if idx % 2 == 0:
+        ax.set_ylabel('Value')
+
+
+g001 = Composition(
+    'g001',
+    panels=tuple(Panel(g001_panel, keys=('x', ('y', idx), ('titles', idx)), args=(idx,)) for idx in range(4)),
+    grid=(2, 2), figsize=(8, 6.5), suptitle='Multi-panel Time Series Comparison',
+    margins={'left': 0.16, 'right': 0.96, 'bottom': 0.16, 'top': 0.88},
+)
 
 
 # ─────────────────────────────────────────────────────
 # g-002: Grouped Bar Chart with Error Bars (IEEE, cool)
 # ─────────────────────────────────────────────────────
-def g002():
-    colors = ['#1F77B4', '#FF7F0E', '#2CA02C', '#D62728']
+def g002_data(rng):
     methods = ['Method A', 'Method B', 'Method C', 'Method D']
     metrics = ['Accuracy', 'Precision', 'Recall', 'F1-Score', 'AUC']
-    n_methods = len(methods)
-    n_metrics = len(metrics)
-    x = np.arange(n_metrics)
+    vals = np.empty((len(methods), len(metrics)))
+    errs = np.empty((len(methods), len(metrics)))
+    for i in range(len(methods)):
+        vals[i] = rng.uniform(0.7, 0.95, len(metrics))
+        errs[i] = rng.uniform(0.01, 0.04, len(metrics))
+    return {'methods': methods, 'metrics': metrics, 'vals': vals, 'errs': errs}
+
+
+def g002(d, colors):
+    n_methods = len(d['methods'])
+    x = np.arange(len(d['metrics']))
     width = 0.18
-    fig, ax = plt.subplots(figsize=(8, 5))
-    for i, (method, color) in enumerate(zip(methods, colors)):
-        vals = np.random.uniform(0.7, 0.95, n_metrics)
-        errs = np.random.uniform(0.01, 0.04, n_metrics)
+    fig = new_figure(figsize=(8, 5))
+    ax = fig.subplots()
+    for i, method in enumerate(d['methods']):
         offset = (i - n_methods / 2 + 0.5) * width
-        ax.bar(x + offset, vals, width, yerr=errs, label=method,
-               color=color, edgecolor='white', linewidth=0.5,
+        ax.bar(x + offset, d['vals'][i], width, yerr=d['errs'][i], label=method,
+               color=colors[i], edgecolor='white', linewidth=0.5,
                capsize=3, error_kw={'linewidth': 1})
     ax.set_ylabel('Score')
     ax.set_xticks(x)
-    ax.set_xticklabels(metrics)
+    ax.set_xticklabels(d['metrics'])
     ax.set_ylim(0.6, 1.05)
     ax.legend(frameon=True, edgecolor='#cccccc', fancybox=False)
     ax.spines['top'].set_visible(False)
@@ -105,21 +100,19 @@ def g002():
     ax.grid(axis='y', alpha=0.2, linewidth=0.5)
     ax.set_title('Model Performance Comparison', fontsize=13, fontweight='bold')
     fig.tight_layout()
-    save(fig, 'ieee-bar.svg')
+    return fig
 
 
 # ─────────────────────────────────────────────────────
 # g-003: Scatter Plot with Density Contours (Science, cool)
 # ─────────────────────────────────────────────────────
-def g003():
-    colors = ['#3366CC', '#DC3912', '#FF9900', '#109618']
-    fig, ax = plt.subplots(figsize=(7, 6))
-    for i, c in enumerate(colors):
+def g003_data(rng):
+    groups = []
+    for i in range(4):
         n = 150
-        cx, cy = np.random.uniform(-2, 2), np.random.uniform(-2, 2)
-        x = np.random.normal(cx, 0.8, n)
-        y = np.random.normal(cy, 0.8, n)
-        ax.scatter(x, y, c=c, alpha=0.5, s=20, edgecolors='none', label=f'Group {i+1}')
+        cx, cy = rng.uniform(-2, 2), rng.uniform(-2, 2)
+        x = rng.normal(cx, 0.8, n)
+        y = rng.normal(cy, 0.8, n)
         # density contour
         try:
             xmin, xmax = x.min() - 0.5, x.max() + 0.5
@@ -127,10 +120,21 @@ def g003():
             xx, yy = np.mgrid[xmin:xmax:50j, ymin:ymax:50j]
             positions = np.vstack([xx.ravel(), yy.ravel()])
             kernel = stats.gaussian_kde(np.vstack([x, y]))
-            f = np.reshape(kernel(positions), xx.shape)
-            ax.contour(xx, yy, f, levels=3, colors=[c], alpha=0.6, linewidths=1)
+            density = (xx, yy, np.reshape(kernel(positions), xx.shape))
         except Exception:
-            pass
+            density = None
+        groups.append({'x': x, 'y': y, 'density': density})
+    return {'groups': groups}
+
+
+def g003(d, colors):
+    fig = new_figure(figsize=(7, 6))
+    ax = fig.subplots()
+    for i, group in enumerate(d['groups']):
+        c = colors[i]
+        ax.scatter(group['x'], group['y'], c=c, alpha=0.5, s=20, edgecolors='none', label=f'Group {i+1}')
+        if group['density'] is not None:
+            ax.contour(*group['density'], levels=3, colors=[c], alpha=0.6, linewidths=1)
     ax.set_xlabel('Principal Component 1')
     ax.set_ylabel('Principal Component 2')
     ax.legend(frameon=True, edgecolor='#cccccc', fancybox=False)
@@ -138,43 +142,51 @@ def g003():
     ax.spines['right'].set_visible(False)
     ax.set_title('Scatter with Density Contours', fontsize=13, fontweight='bold')
     fig.tight_layout()
-    save(fig, 'science-scatter.svg')
+    return fig
 
 
 # ─────────────────────────────────────────────────────
 # g-004: Heatmap with Hierarchical Clustering (Cell, cool)
 # ─────────────────────────────────────────────────────
-def g004():
-    from scipy.cluster.hierarchy import linkage, dendrogram
-    n_genes, n_samples = 30, 12
-    data = np.random.randn(n_genes, n_samples)
+def g004_data(rng, scale=1):
+    from scipy.cluster.hierarchy import linkage
+    n_genes, n_samples = int(30 * scale), 12
+    data = rng.randn(n_genes, n_samples)
     # add some structure
-    data[:10, :4] += 2
-    data[10:20, 4:8] += 2
-    data[20:, 8:] += 2
-
-    row_linkage = linkage(data, method='ward')
-    col_linkage = linkage(data.T, method='ward')
-
-    fig = plt.figure(figsize=(9, 7))
+    third = n_genes // 3
+    data[:third, :4] += 2
+    data[third:2 * third, 4:8] += 2
+    data[2 * third:, 8:] += 2
+    return {
+        'data': data,
+        'row_linkage': linkage(data, method='ward'),
+        'col_linkage': linkage(data.T, method='ward'),
+    }
+
+
+def g004(d, colors):
+    from scipy.cluster.hierarchy import dendrogram
+    data = d['data']
+    n_samples = data.shape[1]
+
+    fig = new_figure(figsize=(9, 7))
     gs = GridSpec(2, 2, width_ratios=[1, 5], height_ratios=[1, 5],
                   hspace=0.02, wspace=0.02)
 
     # Column dendrogram
     ax_col = fig.add_subplot(gs[0, 1])
-    dendrogram(col_linkage, ax=ax_col, color_threshold=0, above_threshold_color='#555555')
+    dendrogram(d['col_linkage'], ax=ax_col, color_threshold=0, above_threshold_color='#555555')
     ax_col.set_axis_off()
 
     # Row dendrogram
     ax_row = fig.add_subplot(gs[1, 0])
-    dendrogram(row_linkage, ax=ax_row, orientation='left', color_threshold=0,
+    dendrogram(d['row_linkage'], ax=ax_row, orientation='left', color_threshold=0,
                above_threshold_color='#555555')
     ax_row.set_axis_off()
 
     # Heatmap
     ax_heat = fig.add_subplot(gs[1, 1])
-    from matplotlib.colors import LinearSegmentedColormap
-    cmap = LinearSegmentedColormap.from_list('cell', ['#2166AC', '#F7F7F7', '#B2182B'])
+    cmap = LinearSegmentedColormap.from_list('cell', colors[:3])
     im = ax_heat.imshow(data, aspect='auto', cmap=cmap, vmin=-3, vmax=3)
     ax_heat.set_xlabel('Samples')
     ax_heat.set_ylabel('Genes')
@@ -187,22 +199,26 @@ def g004():
     cbar.set_label('Expression', fontsize=9)
 
     fig.suptitle('Hierarchical Clustering Heatmap', fontsize=13, fontweight='bold', y=0.95)
-    save(fig, 'heatmap-cluster.svg')
+    return fig
 
 
 # ─────────────────────────────────────────────────────
 # g-005: Box Plot with Jitter Points (PNAS, vibrant)
 # ─────────────────────────────────────────────────────
-def g005():
-    colors = ['#E64B35', '#4DBBD5', '#00A087', '#3C5488']
-    groups = ['Control', 'Treatment A', 'Treatment B', 'Treatment C']
-    fig, ax = plt.subplots(figsize=(7, 5.5))
-    data_list = []
-    for i in range(4):
-        d = np.random.normal(loc=3 + i * 0.8, scale=0.8 + i * 0.1, size=50)
-        data_list.append(d)
+def g005_data(rng):
+    data_list = [rng.normal(loc=3 + i * 0.8, scale=0.8 + i * 0.1, size=50) for i in range(4)]
+    jitter = [rng.uniform(-0.15, 0.15, len(d)) for d in data_list]
+    return {
+        'groups': ['Control', 'Treatment A', 'Treatment B', 'Treatment C'],
+        'data': data_list,
+        'jitter': jitter,
+    }
+
 
-    bp = ax.boxplot(data_list, patch_artist=True, widths=0.5,
+def g005(d, colors):
+    fig = new_figure(figsize=(7, 5.5))
+    ax = fig.subplots()
+    bp = ax.boxplot(d['data'], patch_artist=True, widths=0.5,
                     medianprops=dict(color='black', linewidth=1.5),
                     whiskerprops=dict(linewidth=1.2),
                     capprops=dict(linewidth=1.2))
@@ -211,31 +227,35 @@ def g005():
         patch.set_alpha(0.6)
         patch.set_edgecolor(color)
 
-    for i, (d, c) in enumerate(zip(data_list, colors)):
-        jitter = np.random.uniform(-0.15, 0.15, len(d))
-        ax.scatter(np.full_like(d, i + 1) + jitter, d, color=c,
+    for i, (vals, jitter, c) in enumerate(zip(d['data'], d['jitter'], colors)):
+        ax.scatter(np.full_like(vals, i + 1) + jitter, vals, color=c,
                    alpha=0.6, s=18, edgecolors='white', linewidth=0.5, zorder=3)
 
-    ax.set_xticklabels(groups)
+    ax.set_xticklabels(d['groups'])
     ax.set_ylabel('Measurement Value')
     ax.spines['top'].set_visible(False)
     ax.spines['right'].set_visible(False)
     ax.grid(axis='y', alpha=0.2, linewidth=0.5)
     ax.set_title('Distribution Comparison with Jitter', fontsize=13, fontweight='bold')
     fig.tight_layout()
-    save(fig, 'boxplot-jitter.svg')
+    return fig
 
 
 # ─────────────────────────────────────────────────────
 # g-006: Violin Plot Comparison (Nature, muted)
 # ─────────────────────────────────────────────────────
-def g006():
-    colors = ['#7570B3', '#D95F02', '#1B9E77']
-    fig, ax = plt.subplots(figsize=(7, 5.5))
-    groups = ['Metric A', 'Metric B', 'Metric C', 'Metric D', 'Metric E']
-    data = [np.random.normal(loc=i * 0.5 + 2, scale=0.5 + i * 0.1, size=100) for i in range(5)]
+def g006_data(rng):
+    return {
+        'groups': ['Metric A', 'Metric B', 'Metric C', 'Metric D', 'Metric E'],
+        'data': [rng.normal(loc=i * 0.5 + 2, scale=0.5 + i * 0.1, size=100) for i in range(5)],
+    }
 
-    parts = ax.violinplot(data, positions=range(1, 6), showmeans=False,
+
+def g006(d, colors):
+    fig = new_figure(figsize=(7, 5.5))
+    ax = fig.subplots()
+    n = len(d['groups'])
+    parts = ax.violinplot(d['data'], positions=range(1, n + 1), showmeans=False,
                           showmedians=True, showextrema=False)
     for i, pc in enumerate(parts['bodies']):
         pc.set_facecolor(colors[i % len(colors)])
@@ -244,29 +264,32 @@ def g006():
     parts['cmedians'].set_color('#333333')
     parts['cmedians'].set_linewidth(1.5)
 
-    ax.set_xticks(range(1, 6))
-    ax.set_xticklabels(groups)
+    ax.set_xticks(range(1, n + 1))
+    ax.set_xticklabels(d['groups'])
     ax.set_ylabel('Score')
     ax.spines['top'].set_visible(False)
     ax.spines['right'].set_visible(False)
     ax.grid(axis='y', alpha=0.2, linewidth=0.5)
     ax.set_title('Violin Plot Comparison', fontsize=13, fontweight='bold')
     fig.tight_layout()
-    save(fig, 'violin-comparison.svg')
+    return fig
 
 
 # ─────────────────────────────────────────────────────
 # g-007: Stacked Area Chart (ACS, warm)
 # ─────────────────────────────────────────────────────
-def g007():
-    colors = ['#E41A1C', '#377EB8', '#4DAF4A', '#984EA3', '#FF7F00']
-    fig, ax = plt.subplots(figsize=(8, 5))
+def g007_data(rng):
     x = np.arange(2015, 2026)
-    n = len(x)
-    raw = np.random.rand(5, n)
+    raw = rng.rand(5, len(x))
     raw = raw / raw.sum(axis=0)  # normalize to proportions
     labels = ['Component A', 'Component B', 'Component C', 'Component D', 'Component E']
-    ax.stackplot(x, raw, labels=labels, colors=colors, alpha=0.85)
+    return {'x': x, 'y': raw, 'labels': labels}
+
+
+def g007(d, colors):
+    fig = new_figure(figsize=(8, 5))
+    ax = fig.subplots()
+    ax.stackplot(d['x'], d['y'], labels=d['labels'], colors=colors[:len(d['y'])], alpha=0.85)
     ax.set_xlim(2015, 2025)
     ax.set_ylim(0, 1)
     ax.set_ylabel('Proportion')
@@ -276,56 +299,64 @@ def g007():
     ax.spines['right'].set_visible(False)
     ax.set_title('Composition Change Over Time', fontsize=13, fontweight='bold')
     fig.tight_layout()
-    save(fig, 'acs-area.svg')
+    return fig
 
 
 # ─────────────────────────────────────────────────────
 # g-008: Radar Chart (Custom, vibrant)
 # ─────────────────────────────────────────────────────
-def g008():
-    colors = ['#FF6384', '#36A2EB', '#FFCE56', '#4BC0C0']
+def g008_data(rng):
     categories = ['Accuracy', 'Speed', 'Memory', 'Scalability', 'Robustness', 'Usability']
-    n_cats = len(categories)
+    methods = ['Model A', 'Model B', 'Model C', 'Model D']
+    values = rng.uniform(0.5, 1.0, (len(methods), len(categories)))
+    return {'categories': categories, 'methods': methods, 'values': values}
+
+
+def g008(d, colors):
+    n_cats = len(d['categories'])
     angles = np.linspace(0, 2 * np.pi, n_cats, endpoint=False).tolist()
     angles += angles[:1]
 
-    fig, ax = plt.subplots(figsize=(7, 7), subplot_kw=dict(polar=True))
-    methods = ['Model A', 'Model B', 'Model C', 'Model D']
-    for i, (method, color) in enumerate(zip(methods, colors)):
-        values = np.random.uniform(0.5, 1.0, n_cats).tolist()
+    fig = new_figure(figsize=(7, 7))
+    ax = fig.subplots(subplot_kw=dict(polar=True))
+    for i, method in enumerate(d['methods']):
+        values = d['values'][i].tolist()
         values += values[:1]
-        ax.plot(angles, values, 'o-', linewidth=2, color=color, label=method, markersize=5)
-        ax.fill(angles, values, alpha=0.15, color=color)
+        ax.plot(angles, values, 'o-', linewidth=2, color=colors[i], label=method, markersize=5)
+        ax.fill(angles, values, alpha=0.15, color=colors[i])
 
     ax.set_xticks(angles[:-1])
-    ax.set_xticklabels(categories, fontsize=10)
+    ax.set_xticklabels(d['categories'], fontsize=10)
     ax.set_ylim(0, 1.1)
     ax.set_yticks([0.25, 0.5, 0.75, 1.0])
     ax.set_yticklabels(['0.25', '0.5', '0.75', '1.0'], fontsize=8)
     ax.legend(loc='upper right', bbox_to_anchor=(1.25, 1.1), frameon=True, edgecolor='#cccccc')
     ax.set_title('Multi-metric Radar Evaluation', fontsize=13, fontweight='bold', pad=20)
     fig.tight_layout()
-    save(fig, 'radar-eval.svg')
+    return fig
 
 
 # ─────────────────────────────────────────────────────
 # g-009: Dual Y-axis Plot (Nature, neutral)
 # ─────────────────────────────────────────────────────
-def g009():
-    colors = ['#0072B2', '#D55E00', '#009E73', '#CC79A7']
-    fig, ax1 = plt.subplots(figsize=(8, 5))
+def g009_data(rng):
     x = np.linspace(0, 10, 60)
-    y1 = np.cumsum(np.random.normal(0.1, 0.5, len(x)))
-    y2 = np.sin(x) * 50 + 100 + np.random.normal(0, 5, len(x))
+    y1 = np.cumsum(rng.normal(0.1, 0.5, len(x)))
+    y2 = np.sin(x) * 50 + 100 + rng.normal(0, 5, len(x))
+    return {'x': x, 'y1': y1, 'y2': y2}
 
-    ax1.plot(x, y1, color=colors[0], linewidth=2, label='Temperature (°C)')
+
+def g009(d, colors):
+    fig = new_figure(figsize=(8, 5))
+    ax1 = fig.subplots()
+    ax1.plot(d['x'], d['y1'], color=colors[0], linewidth=2, label='Temperature (°C)')
     ax1.set_xlabel('Time (hours)')
     ax1.set_ylabel('Temperature (°C)', color=colors[0])
     ax1.tick_params(axis='y', labelcolor=colors[0])
     ax1.spines['top'].set_visible(False)
 
     ax2 = ax1.twinx()
-    ax2.plot(x, y2, color=colors[1], linewidth=2, linestyle='--', label='Pressure (kPa)')
+    ax2.plot(d['x'], d['y2'], color=colors[1], linewidth=2, linestyle='--', label='Pressure (kPa)')
     ax2.set_ylabel('Pressure (kPa)', color=colors[1])
     ax2.tick_params(axis='y', labelcolor=colors[1])
     ax2.spines['top'].set_visible(False)
@@ -336,20 +367,27 @@ def g009():
 
     ax1.set_title('Dual Y-axis: Temperature vs Pressure', fontsize=13, fontweight='bold')
     fig.tight_layout()
-    save(fig, 'dual-yaxis.svg')
+    return fig
 
 
 # ─────────────────────────────────────────────────────
 # g-010: Sankey Flow Diagram (Custom, vibrant)
 # ─────────────────────────────────────────────────────
-def g010():
-    colors = ['#a6cee3', '#1f78b4', '#b2df8a', '#33a02c', '#fb9a99']
-    fig, ax = plt.subplots(figsize=(8, 6))
-    # Simulate a Sankey as alluvial/flow with filled polygons
+def g010_data(rng):
     n_flows = 5
-    labels_left = ['Source A', 'Source B', 'Source C', 'Source D', 'Source E']
-    labels_right = ['Target 1', 'Target 2', 'Target 3', 'Target 4', 'Target 5']
-    flow_matrix = np.random.randint(5, 30, (n_flows, n_flows))
+    return {
+        'labels_left': ['Source A', 'Source B', 'Source C', 'Source D', 'Source E'],
+        'labels_right': ['Target 1', 'Target 2', 'Target 3', 'Target 4', 'Target 5'],
+        'flow_matrix': rng.randint(5, 30, (n_flows, n_flows)),
+    }
+
+
+def g010(d, colors):
+    fig = new_figure(figsize=(8, 6))
+    ax = fig.subplots()
+    # Simulate a Sankey as alluvial/flow with filled polygons
+    flow_matrix = d['flow_matrix']
+    n_flows = len(flow_matrix)
 
     # Normalize flow heights
     left_heights = flow_matrix.sum(axis=1)
@@ -385,7 +423,7 @@ def g010():
 
     # Labels
     ly_label = 0
-    for i, (label, h) in enumerate(zip(labels_left, left_heights)):
+    for i, (label, h) in enumerate(zip(d['labels_left'], left_heights)):
         mid = ly_label + h / total / 2
         ax.text(-0.05, mid, label, ha='right', va='center', fontsize=9, fontweight='bold')
         ly_label += h / total + gap
@@ -394,19 +432,23 @@ def g010():
     ax.set_axis_off()
     ax.set_title('Sankey Flow Diagram', fontsize=13, fontweight='bold')
     fig.tight_layout()
-    save(fig, 'sankey-flow.svg')
+    return fig
 
 
 # ─────────────────────────────────────────────────────
 # g-011: Minimalist Line Chart (Custom, monochrome)
 # ─────────────────────────────────────────────────────
-def g011():
-    colors = ['#333333', '#999999', '#CCCCCC']
-    fig, ax = plt.subplots(figsize=(8, 4.5))
+def g011_data(rng):
     x = np.linspace(0, 10, 80)
-    for i, (c, lw) in enumerate(zip(colors, [2.5, 1.8, 1.2])):
-        y = np.cumsum(np.random.normal(0, 0.5, len(x))) + i * 3
-        ax.plot(x, y, color=c, linewidth=lw, label=f'Series {i+1}')
+    y = np.array([np.cumsum(rng.normal(0, 0.5, len(x))) + i * 3 for i in range(3)])
+    return {'x': x, 'y': y}
+
+
+def g011(d, colors):
+    fig = new_figure(figsize=(8, 4.5))
+    ax = fig.subplots()
+    for i, (y, c, lw) in enumerate(zip(d['y'], colors, [2.5, 1.8, 1.2])):
+        ax.plot(d['x'], y, color=c, linewidth=lw, label=f'Series {i+1}')
 
     ax.spines['top'].set_visible(False)
     ax.spines['right'].set_visible(False)
@@ -418,21 +460,26 @@ def g011():
     ax.legend(frameon=False, fontsize=9)
     ax.set_title('Minimalist Line Chart', fontsize=13, fontweight='bold')
     fig.tight_layout()
-    save(fig, 'minimal-line.svg')
+    return fig
 
 
 # ─────────────────────────────────────────────────────
 # g-012: Warm-toned Horizontal Bar Chart (Lancet, warm)
 # ─────────────────────────────────────────────────────
-def g012():
-    colors = ['#AD002A', '#ED0000', '#00468B', '#42B540', '#0099B4']
-    fig, ax = plt.subplots(figsize=(8, 5.5))
-    categories = ['Approach E', 'Approach D', 'Approach C', 'Approach B', 'Approach A']
-    values = np.random.uniform(40, 95, 5)
-    errors = np.random.uniform(2, 8, 5)
+def g012_data(rng):
+    return {
+        'categories': ['Approach E', 'Approach D', 'Approach C', 'Approach B', 'Approach A'],
+        'values': rng.uniform(40, 95, 5),
+        'errors': rng.uniform(2, 8, 5),
+    }
 
-    bars = ax.barh(categories, values, xerr=errors, height=0.55,
-                   color=colors, edgecolor='white', linewidth=0.5,
+
+def g012(d, colors):
+    fig = new_figure(figsize=(8, 5.5))
+    ax = fig.subplots()
+    values = d['values']
+    bars = ax.barh(d['categories'], values, xerr=d['errors'], height=0.55,
+                   color=colors[:len(values)], edgecolor='white', linewidth=0.5,
                    capsize=4, error_kw={'linewidth': 1.2})
 
     ax.set_xlabel('Score (%)')
@@ -447,26 +494,32 @@ def g012():
 
     ax.set_title('Horizontal Bar Chart — Lancet Style', fontsize=13, fontweight='bold')
     fig.tight_layout()
-    save(fig, 'warm-bar.svg')
+    return fig
 
 
 # ─────────────────────────────────────────────────────
 # g-013: Multi-dataset Scatter with Trendlines (IEEE, cool)
 # ─────────────────────────────────────────────────────
-def g013():
-    colors = ['#0073C2', '#EFC000', '#868686', '#CD534C']
-    fig, ax = plt.subplots(figsize=(7, 5.5))
-    groups = ['Dataset 1', 'Dataset 2', 'Dataset 3', 'Dataset 4']
-    for i, (group, color) in enumerate(zip(groups, colors)):
+def g013_data(rng):
+    groups = []
+    for i in range(4):
         n = 40
-        x = np.random.uniform(0, 10, n)
+        x = rng.uniform(0, 10, n)
         slope = 0.5 + i * 0.3
-        y = slope * x + np.random.normal(0, 1.5, n) + i * 2
-        ax.scatter(x, y, c=color, alpha=0.6, s=30, edgecolors='white', linewidth=0.5, label=group)
+        y = slope * x + rng.normal(0, 1.5, n) + i * 2
+        groups.append({'x': x, 'y': y, 'fit': np.polyfit(x, y, 1)})
+    return {'names': ['Dataset 1', 'Dataset 2', 'Dataset 3', 'Dataset 4'], 'groups': groups}
+
+
+def g013(d, colors):
+    fig = new_figure(figsize=(7, 5.5))
+    ax = fig.subplots()
+    x_line = np.linspace(0, 10, 50)
+    for i, (name, group) in enumerate(zip(d['names'], d['groups'])):
+        color = colors[i]
+        ax.scatter(group['x'], group['y'], c=color, alpha=0.6, s=30, edgecolors='white', linewidth=0.5, label=name)
         # Trendline
-        z = np.polyfit(x, y, 1)
-        p = np.poly1d(z)
-        x_line = np.linspace(0, 10, 50)
+        p = np.poly1d(group['fit'])
         ax.plot(x_line, p(x_line), color=color, linewidth=1.5, linestyle='--', alpha=0.8)
 
     ax.set_xlabel('Feature X')
@@ -477,21 +530,26 @@ def g013():
     ax.grid(True, alpha=0.15, linewidth=0.5)
     ax.set_title('Scatter with Linear Trendlines', fontsize=13, fontweight='bold')
     fig.tight_layout()
-    save(fig, 'scatter-trend.svg')
+    return fig
 
 
 # ─────────────────────────────────────────────────────
 # g-014: Donut/Pie Chart with Labels (Custom, vibrant)
 # ─────────────────────────────────────────────────────
-def g014():
-    colors = ['#5470C6', '#91CC75', '#FAC858', '#EE6666', '#73C0DE']
-    fig, ax = plt.subplots(figsize=(7, 7))
-    labels = ['Category A', 'Category B', 'Category C', 'Category D', 'Category E']
-    sizes = [28, 22, 20, 18, 12]
-    explode = (0.03, 0.03, 0.03, 0.03, 0.03)
+def g014_data(rng):
+    return {
+        'labels': ['Category A', 'Category B', 'Category C', 'Category D', 'Category E'],
+        'sizes': [28, 22, 20, 18, 12],
+    }
+
+
+def g014(d, colors):
+    fig = new_figure(figsize=(7, 7))
+    ax = fig.subplots()
+    explode = [0.03] * len(d['sizes'])
 
     wedges, texts, autotexts = ax.pie(
-        sizes, explode=explode, labels=labels, colors=colors,
+        d['sizes'], explode=explode, labels=d['labels'], colors=colors[:len(d['sizes'])],
         autopct='%1.1f%%', startangle=90, pctdistance=0.78,
         wedgeprops=dict(width=0.45, edgecolor='white', linewidth=2))
 
@@ -503,20 +561,24 @@ def g014():
 
     ax.set_title('Proportion Distribution', fontsize=13, fontweight='bold', pad=15)
     fig.tight_layout()
-    save(fig, 'pie-labels.svg')
+    return fig
 
 
 # ─────────────────────────────────────────────────────
 # g-015: Confidence Band Line Plot (Nature Methods, muted)
 # ─────────────────────────────────────────────────────
-def g015():
-    colors = ['#4E79A7', '#A0CBE8', '#F28E2B', '#FFBE7D']
-    fig, ax = plt.subplots(figsize=(8, 5))
+def g015_data(rng):
     x = np.linspace(0, 10, 80)
+    mean = np.array([np.sin(x * (1 + i * 0.3)) * (2 - i * 0.5) + i * 2 for i in range(2)])
+    std = np.array([0.4 + rng.uniform(0, 0.3, len(x)) for _ in range(2)])
+    return {'x': x, 'mean': mean, 'std': std}
+
 
-    for i in range(2):
-        mean = np.sin(x * (1 + i * 0.3)) * (2 - i * 0.5) + i * 2
-        std = 0.4 + np.random.uniform(0, 0.3, len(x))
+def g015(d, colors):
+    fig = new_figure(figsize=(8, 5))
+    ax = fig.subplots()
+    x = d['x']
+    for i, (mean, std) in enumerate(zip(d['mean'], d['std'])):
         ax.plot(x, mean, color=colors[i * 2], linewidth=2, label=f'Method {i+1}')
         ax.fill_between(x, mean - std, mean + std, color=colors[i * 2 + 1], alpha=0.4)
 
@@ -528,21 +590,25 @@ def g015():
     ax.grid(True, alpha=0.15, linewidth=0.5)
     ax.set_title('Training Curves with Confidence Bands', fontsize=13, fontweight='bold')
     fig.tight_layout()
-    save(fig, 'confidence-band.svg')
+    return fig
 
 
 # ─────────────────────────────────────────────────────
 # g-016: High-contrast Accessibility Chart (Custom, neutral)
 # ─────────────────────────────────────────────────────
-def g016():
-    colors = ['#000000', '#E69F00', '#56B4E9', '#009E73', '#F0E442']
+def g016_data(rng):
+    x = np.linspace(0, 10, 30)
+    y = np.array([np.cumsum(rng.normal(0.2, 0.4, len(x))) + i * 2 for i in range(5)])
+    return {'x': x, 'y': y}
+
+
+def g016(d, colors):
     markers = ['o', 's', '^', 'D', 'v']
     linestyles = ['-', '--', '-.', ':', '-']
-    fig, ax = plt.subplots(figsize=(8, 5))
-    x = np.linspace(0, 10, 30)
-    for i, (c, m, ls) in enumerate(zip(colors, markers, linestyles)):
-        y = np.cumsum(np.random.normal(0.2, 0.4, len(x))) + i * 2
-        ax.plot(x, y, color=c, marker=m, linestyle=ls, linewidth=2,
+    fig = new_figure(figsize=(8, 5))
+    ax = fig.subplots()
+    for i, (y, c, m, ls) in enumerate(zip(d['y'], colors, markers, linestyles)):
+        ax.plot(d['x'], y, color=c, marker=m, linestyle=ls, linewidth=2,
                 markersize=6, markerfacecolor=c, markeredgecolor='white',
                 markeredgewidth=0.5, label=f'Series {i+1}')
 
@@ -554,28 +620,32 @@ def g016():
     ax.grid(True, alpha=0.15, linewidth=0.5)
     ax.set_title('Colorblind-friendly Chart with Markers', fontsize=13, fontweight='bold')
     fig.tight_layout()
-    save(fig, 'accessible-chart.svg')
+    return fig
 
 
 # ─────────────────────────────────────────────────────
 # g-017: Gradient Heatmap Matrix (Science, monochrome)
 # ─────────────────────────────────────────────────────
-def g017():
-    from matplotlib.colors import LinearSegmentedColormap
-    fig, ax = plt.subplots(figsize=(7, 6))
+def g017_data(rng):
     n = 10
     # Correlation-like matrix
-    A = np.random.randn(50, n)
-    corr = np.corrcoef(A.T)
-    labels = [f'Var {i+1}' for i in range(n)]
+    A = rng.randn(50, n)
+    return {'corr': np.corrcoef(A.T), 'labels': [f'Var {i+1}' for i in range(n)]}
 
-    cmap = LinearSegmentedColormap.from_list('blues', ['#F7FBFF', '#6BAED6', '#08306B'])
+
+def g017(d, colors):
+    fig = new_figure(figsize=(7, 6))
+    ax = fig.subplots()
+    corr = d['corr']
+    n = len(corr)
+
+    cmap = LinearSegmentedColormap.from_list('blues', colors[:3])
     im = ax.imshow(corr, cmap=cmap, vmin=-1, vmax=1, aspect='equal')
 
     ax.set_xticks(range(n))
     ax.set_yticks(range(n))
-    ax.set_xticklabels(labels, rotation=45, ha='right', fontsize=8)
-    ax.set_yticklabels(labels, fontsize=8)
+    ax.set_xticklabels(d['labels'], rotation=45, ha='right', fontsize=8)
+    ax.set_yticklabels(d['labels'], fontsize=8)
 
     # Annotate
     for i in range(n):
@@ -588,29 +658,36 @@ def g017():
     cbar.set_label('Correlation', fontsize=10)
     ax.set_title('Correlation Matrix Heatmap', fontsize=13, fontweight='bold')
     fig.tight_layout()
-    save(fig, 'gradient-heatmap.svg')
+    return fig
 
 
 # ─────────────────────────────────────────────────────
 # g-018: Error Bar Comparison Chart (ACS, cool)
 # ─────────────────────────────────────────────────────
-def g018():
-    colors = ['#1B9E77', '#D95F02', '#7570B3', '#E7298A']
-    fig, ax = plt.subplots(figsize=(8, 5))
+def g018_data(rng):
     methods = ['Baseline', 'Method A', 'Method B', 'Method C']
     metrics = ['MAE', 'RMSE', 'R²', 'MAPE']
-    x_pos = np.arange(len(metrics))
+    vals = np.empty((len(methods), len(metrics)))
+    errs = np.empty((len(methods), len(metrics)))
+    for i in range(len(methods)):
+        vals[i] = rng.uniform(0.5, 0.95, len(metrics))
+        errs[i] = rng.uniform(0.02, 0.08, len(metrics))
+    return {'methods': methods, 'metrics': metrics, 'vals': vals, 'errs': errs}
+
 
-    for i, (method, color) in enumerate(zip(methods, colors)):
-        vals = np.random.uniform(0.5, 0.95, len(metrics))
-        errs = np.random.uniform(0.02, 0.08, len(metrics))
+def g018(d, colors):
+    fig = new_figure(figsize=(8, 5))
+    ax = fig.subplots()
+    x_pos = np.arange(len(d['metrics']))
+
+    for i, method in enumerate(d['methods']):
         offset = (i - 1.5) * 0.15
-        ax.errorbar(x_pos + offset, vals, yerr=errs, fmt='o', color=color,
+        ax.errorbar(x_pos + offset, d['vals'][i], yerr=d['errs'][i], fmt='o', color=colors[i],
                     markersize=8, capsize=5, capthick=1.5, linewidth=1.5,
                     label=method, markeredgecolor='white', markeredgewidth=0.8)
 
     ax.set_xticks(x_pos)
-    ax.set_xticklabels(metrics)
+    ax.set_xticklabels(d['metrics'])
     ax.set_ylabel('Score')
     ax.set_ylim(0.3, 1.1)
     ax.legend(frameon=True, edgecolor='#cccccc', fancybox=False)
@@ -619,73 +696,93 @@ def g018():
     ax.grid(axis='y', alpha=0.2, linewidth=0.5)
     ax.set_title('Error Bar Method Comparison', fontsize=13, fontweight='bold')
     fig.tight_layout()
-    save(fig, 'error-bar.svg')
+    return fig
 
 
 # ─────────────────────────────────────────────────────
 # g-019: Dark Theme Dashboard Chart (Custom, vibrant)
 # ─────────────────────────────────────────────────────
-def g019():
-    colors = ['#00DDFF', '#37A2DA', '#67E0E3', '#FFDB5C', '#FF9F7F']
-    dark_bg = '#1a1a2e'
-    grid_color = '#333355'
-
-    fig, axes = plt.subplots(1, 3, figsize=(12, 4.5))
-    fig.patch.set_facecolor(dark_bg)
-
-    for ax in axes:
-        ax.set_facecolor(dark_bg)
-        ax.tick_params(colors='#aaaaaa')
-        ax.spines['bottom'].set_color('#555577')
-        ax.spines['left'].set_color('#555577')
-        ax.spines['top'].set_visible(False)
-        ax.spines['right'].set_visible(False)
-        ax.xaxis.label.set_color('#cccccc')
-        ax.yaxis.label.set_color('#cccccc')
-        ax.title.set_color('#eeeeee')
-
-    # Chart 1: Line
-    x = np.linspace(0, 10, 50)
-    for i, c in enumerate(colors[:3]):
-        y = np.sin(x + i) * (2 + i * 0.5) + np.random.normal(0, 0.3, len(x))
-        axes[0].plot(x, y, color=c, linewidth=2)
-    axes[0].set_title('Real-time Metrics', fontsize=11, fontweight='bold')
-    axes[0].grid(True, color=grid_color, alpha=0.5, linewidth=0.5)
-
-    # Chart 2: Bar
+def g019_data(rng):
+    x_line = np.linspace(0, 10, 50)
+    y_line = np.array([np.sin(x_line + i) * (2 + i * 0.5) + rng.normal(0, 0.3, len(x_line))
+                       for i in range(3)])
     cats = ['A', 'B', 'C', 'D', 'E']
-    vals = np.random.uniform(20, 80, 5)
-    axes[1].bar(cats, vals, color=colors, edgecolor=dark_bg, linewidth=1)
-    axes[1].set_title('Category Distribution', fontsize=11, fontweight='bold')
-    axes[1].grid(axis='y', color=grid_color, alpha=0.5, linewidth=0.5)
-
-    # Chart 3: Area
-    x = np.arange(12)
-    for i, c in enumerate(colors[:3]):
-        y = np.random.uniform(10, 40, 12) + i * 10
-        axes[2].fill_between(x, y, alpha=0.4, color=c)
-        axes[2].plot(x, y, color=c, linewidth=1.5)
-    axes[2].set_title('Trend Overview', fontsize=11, fontweight='bold')
-    axes[2].grid(True, color=grid_color, alpha=0.5, linewidth=0.5)
-
-    fig.suptitle('Dark Theme Dashboard', fontsize=14, fontweight='bold', color='#eeeeee', y=1.02)
-    fig.tight_layout()
-    save(fig, 'dark-dashboard.svg')
+    vals = rng.uniform(20, 80, len(cats))
+    x_area = np.arange(12)
+    y_area = np.array([rng.uniform(10, 40, 12) + i * 10 for i in range(3)])
+    return {
+        'x_line': x_line, 'y_line': y_line,
+        'cats': cats, 'vals': vals,
+        'x_area': x_area, 'y_area': y_area,
+    }
+
+
+G019_BG = '#1a1a2e'
+G019_GRID = '#333355'
+
+
+def g019_axes(fig, title):
+    ax = fig.subplots()
+    ax.set_facecolor(G019_BG)
+    ax.tick_params(colors='#aaaaaa')
+    ax.spines['bottom'].set_color('#555577')
+    ax.spines['left'].set_color('#555577')
+    ax.spines['top'].set_visible(False)
+    ax.spines['right'].set_visible(False)
+    ax.xaxis.label.set_color('#cccccc')
+    ax.yaxis.label.set_color('#cccccc')
+    ax.set_title(title, fontsize=11, fontweight='bold', color='#eeeeee')
+    return ax
+
+
+def g019_line(fig, d, colors):
+    ax = g019_axes(fig, 'Real-time Metrics')
+    for y, c in zip(d['y_line'], colors):
+        ax.plot(d['x_line'], y, color=c, linewidth=2)
+    ax.grid(True, color=G019_GRID, alpha=0.5, linewidth=0.5)
+
+
+def g019_bar(fig, d, colors):
+    ax = g019_axes(fig, 'Category Distribution')
+    ax.bar(d['cats'], d['vals'], color=colors[:len(d['cats'])], edgecolor=G019_BG, linewidth=1)
+    ax.grid(axis='y', color=G019_GRID, alpha=0.5, linewidth=0.5)
+
+
+def g019_area(fig, d, colors):
+    ax = g019_axes(fig, 'Trend Overview')
+    for y, c in zip(d['y_area'], colors):
+        ax.fill_between(d['x_area'], y, alpha=0.4, color=c)
+        ax.plot(d['x_area'], y, color=c, linewidth=1.5)
+    ax.grid(True, color=G019_GRID, alpha=0.5, linewidth=0.5)
+
+
+g019 = Composition(
+    'g019',
+    panels=(Panel(g019_line, keys=('x_line', 'y_line')),
+            Panel(g019_bar, keys=('cats', 'vals')),
+            Panel(g019_area, keys=('x_area', 'y_area'))),
+    grid=(1, 3), figsize=(12, 4.5), facecolor=G019_BG,
+    suptitle='Dark Theme Dashboard', title_kw={'fontsize': 14, 'fontweight': 'bold', 'color': '#eeeeee'},
+    margins={'left': 0.14, 'right': 0.96, 'bottom': 0.1, 'top': 0.9},
+)
 
 
 # ─────────────────────────────────────────────────────
 # g-020: Pastel Multi-series Area (PNAS, muted)
 # ─────────────────────────────────────────────────────
-def g020():
-    colors = ['#AEC7E8', '#FFBB78', '#98DF8A', '#FF9896', '#C5B0D5']
-    fig, ax = plt.subplots(figsize=(8, 5))
+def g020_data(rng):
     x = np.linspace(0, 10, 80)
     labels = ['Series A', 'Series B', 'Series C', 'Series D', 'Series E']
+    y = np.array([np.sin(x * (0.5 + i * 0.2)) * 2 + i * 1.5 + 5 + rng.normal(0, 0.3, len(x))
+                  for i in range(len(labels))])
+    return {'x': x, 'y': y, 'labels': labels}
+
 
-    for i, (c, label) in enumerate(zip(colors, labels)):
-        base = np.sin(x * (0.5 + i * 0.2)) * 2 + i * 1.5 + 5
-        noise = np.random.normal(0, 0.3, len(x))
-        y = base + noise
+def g020(d, colors):
+    fig = new_figure(figsize=(8, 5))
+    ax = fig.subplots()
+    x = d['x']
+    for y, c, label in zip(d['y'], colors, d['labels']):
         ax.fill_between(x, y - 0.8, y + 0.8, alpha=0.4, color=c)
         ax.plot(x, y, color=c, linewidth=1.8, label=label)
 
@@ -697,25 +794,58 @@ def g020():
     ax.grid(True, alpha=0.15, linewidth=0.5)
     ax.set_title('Pastel Multi-series Area Chart', fontsize=13, fontweight='bold')
     fig.tight_layout()
-    save(fig, 'pastel-area.svg')
+    return fig
+
+
+# ─────────────────────────────────────────────────────
+# Registry (palettes match colorPalette in lib/galleryData.ts)
+# ─────────────────────────────────────────────────────
+FIGURES = [
+    Figure('g-001', 'nature-timeseries.svg', g001_data, g001,
+           ['#4E79A7', '#F28E2B', '#E15759', '#76B7B2', '#59A14F']),
+    Figure('g-002', 'ieee-bar.svg', g002_data, g002,
+           ['#1F77B4', '#FF7F0E', '#2CA02C', '#D62728']),
+    Figure('g-003', 'science-scatter.svg', g003_data, g003,
+           ['#3366CC', '#DC3912', '#FF9900', '#109618'], derived=('density',)),
+    Figure('g-004', 'heatmap-cluster.svg', g004_data, g004,
+           ['#2166AC', '#F7F7F7', '#B2182B'], derived=('row_linkage', 'col_linkage')),
+    Figure('g-005', 'boxplot-jitter.svg', g005_data, g005,
+           ['#E64B35', '#4DBBD5', '#00A087', '#3C5488'], derived=('jitter',)),
+    Figure('g-006', 'violin-comparison.svg', g006_data, g006,
+           ['#7570B3', '#D95F02', '#1B9E77']),
+    Figure('g-007', 'acs-area.svg', g007_data, g007,
+           ['#E41A1C', '#377EB8', '#4DAF4A', '#984EA3', '#FF7F00']),
+    Figure('g-008', 'radar-eval.svg', g008_data, g008,
+           ['#FF6384', '#36A2EB', '#FFCE56', '#4BC0C0']),
+    Figure('g-009', 'dual-yaxis.svg', g009_data, g009,
+           ['#0072B2', '#D55E00', '#009E73', '#CC79A7']),
+    Figure('g-010', 'sankey-flow.svg', g010_data, g010,
+           ['#a6cee3', '#1f78b4', '#b2df8a', '#33a02c', '#fb9a99']),
+    Figure('g-011', 'minimal-line.svg', g011_data, g011,
+           ['#333333', '#999999', '#CCCCCC']),
+    Figure('g-012', 'warm-bar.svg', g012_data, g012,
+           ['#AD002A', '#ED0000', '#00468B', '#42B540', '#0099B4']),
+    Figure('g-013', 'scatter-trend.svg', g013_data, g013,
+           ['#0073C2', '#EFC000', '#868686', '#CD534C'], derived=('fit',)),
+    Figure('g-014', 'pie-labels.svg', g014_data, g014,
+           ['#5470C6', '#91CC75', '#FAC858', '#EE6666', '#73C0DE']),
+    Figure('g-015', 'confidence-band.svg', g015_data, g015,
+           ['#4E79A7', '#A0CBE8', '#F28E2B', '#FFBE7D']),
+    Figure('g-016', 'accessible-chart.svg', g016_data, g016,
+           ['#000000', '#E69F00', '#56B4E9', '#009E73', '#F0E442']),
+    Figure('g-017', 'gradient-heatmap.svg', g017_data, g017,
+           ['#F7FBFF', '#6BAED6', '#08306B']),
+    Figure('g-018', 'error-bar.svg', g018_data, g018,
+           ['#1B9E77', '#D95F02', '#7570B3', '#E7298A']),
+    Figure('g-019', 'dark-dashboard.svg', g019_data, g019,
+           ['#00DDFF', '#37A2DA', '#67E0E3', '#FFDB5C', '#FF9F7F']),
+    Figure('g-020', 'pastel-area.svg', g020_data, g020,
+           ['#AEC7E8', '#FFBB78', '#98DF8A', '#FF9896', '#C5B0D5']),
+]
 
 
 # ─────────────────────────────────────────────────────
 # Main
 # ─────────────────────────────────────────────────────
 if __name__ == '__main__':
-    generators = [
-        g001, g002, g003, g004, g005,
-        g006, g007, g008, g009, g010,
-        g011, g012, g013, g014, g015,
-        g016, g017, g018, g019, g020,
-    ]
-    print(f'Generating {len(generators)} gallery figures into {OUTPUT_DIR}/ ...\n')
-    for fn in generators:
-        name = fn.__name__
-        print(f'[{name}]', end=' ')
-        try:
-            fn()
-        except Exception as e:
-            print(f'  FAIL: {e}')
-    print(f'\nDone! {len(generators)} SVGs saved to {OUTPUT_DIR}/')
+    main(FIGURES, 'gallery figures', name='figures')
@@ -0,0 +1,53 @@
+"""
+Pre-render benchmark comparison charts from lib/benchmark-data.json.
+
+For every dataset/task table: grouped bars per metric, a ranking heatmap
+and a radar summary of the top algorithms, in a gallery journal style.
+Only tables whose data (or the chart code) changed since the last run are
+re-rendered; --watch keeps doing that whenever the JSON is saved.
+
+Usage:
+    python scripts/render-benchmarks.py
+    python scripts/render-benchmarks.py --style ieee --palette highContrast --workers 4
+    python scripts/render-benchmarks.py --watch
+
+Output:
+    gallery_output/benchmarks/charts/<dataset>-<task>-{bars,ranks,radar}.svg
+    gallery_output/benchmarks/charts/index.json
+"""
+
+import argparse
+import sys
+import time
+
+from gallery.benchmarks import DATA_PATH, build_charts, load_tables
+from gallery.style import PALETTES, STYLES
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description='Render benchmark comparison charts.')
+    parser.add_argument('--style', choices=list(STYLES), default='nature', help='journal style (default: nature)')
+    parser.add_argument('--palette', choices=list(PALETTES), default='muted', help='palette (default: muted)')
+    parser.add_argument('--workers', type=int, help='render threads (default: executor default)')
+    parser.add_argument('--force', action='store_true', help='re-render every chart')
+    parser.add_argument('--watch', action='store_true', help='re-render when the JSON changes')
+    args = parser.parse_args()
+
+    def run():
+        return build_charts(load_tables(), args.style, args.palette, args.workers, force=args.force)
+
+    status = run()
+    if not args.watch:
+        sys.exit(1 if status else 0)
+    mtime = DATA_PATH.stat().st_mtime_ns
+    print(f'\nWatching {DATA_PATH} (Ctrl+C to stop)')
+    try:
+        while True:
+            time.sleep(0.5)
+            if DATA_PATH.stat().st_mtime_ns != mtime:
+                mtime = DATA_PATH.stat().st_mtime_ns
+                try:
+                    run()
+                except ValueError as e:  # half-saved JSON
+                    print(f'Not re-rendered: {e}')
+    except KeyboardInterrupt:
+        print('\nStopped.')
@@ -0,0 +1,45 @@
+"""
+Render gallery figures as text-mode SVG with shared, subsetted web fonts.
+
+Keeps labels as <text> elements (math text stays as paths) and writes one
+font subset per face for the whole batch, then compares size and render
+time with the default glyph-path SVGs. By default it covers the text-heavy
+figures g-029, g-030 and g-025.
+
+Usage:
+    python scripts/render-text-svgs.py
+    python scripts/render-text-svgs.py g021 g028
+    python scripts/render-text-svgs.py --all --no-compare
+
+Output:
+    gallery_output/text/*.svg, fonts/*.<hash>.woff2, report.json
+"""
+
+import argparse
+import json
+
+from gallery.registry import load_figures, select
+from gallery.textsvg import TEXT_DIR, build_text_svgs, print_report
+
+TARGETS = ('g-029', 'g-030', 'g-025')
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description='Render text-mode SVGs with shared web fonts.')
+    parser.add_argument('figures', nargs='*', metavar='ID', help=f'figure ids (default: {" ".join(TARGETS)})')
+    parser.add_argument('--all', action='store_true', help='render every gallery figure')
+    parser.add_argument('--no-compare', dest='compare', action='store_false',
+                        help='skip the glyph-path renders used for the size/time comparison')
+    parser.add_argument('--repeat', type=int, default=3, help='timing repeats, best taken (default: 3)')
+    args = parser.parse_args()
+
+    figures = load_figures()
+    try:
+        figures = figures if args.all else select(figures, args.figures or TARGETS)
+    except KeyError as e:
+        parser.error(e.args[0])
+
+    rows, font_bytes = build_text_svgs(figures, compare=args.compare, repeat=args.repeat)
+    print_report(rows, font_bytes)
+    report = {'font_bytes': font_bytes, 'figures': rows}
+    (TEXT_DIR / 'report.json').write_text(json.dumps(report, indent=2) + '\n', encoding='utf-8')
+    print(f'\nReport: {TEXT_DIR / "report.json"}')
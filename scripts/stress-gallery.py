@@ -0,0 +1,54 @@
+"""
+Stress the scalable gallery figures with geometrically larger data.
+
+Renders each figure whose data stage takes a scale factor (g-004, g-021,
+g-022, g-023, g-024) at 1×, 10×, 100× … its normal data size, each step in
+a fresh process. Reports time, peak memory and SVG size per step, fits how
+each grows with the data and flags figures that grow faster than linearly
+or cross a budget; exits non-zero if anything was flagged.
+
+Usage:
+    python scripts/stress-gallery.py
+    python scripts/stress-gallery.py g021 g024 --scales 1 3 10 30 --timeout 60
+    python scripts/stress-gallery.py --budget-seconds 10 --budget-rss 1024 --budget-svg 5
+
+Output:
+    gallery_output/benchmarks/stress/report.json
+"""
+
+import argparse
+import json
+import sys
+
+from gallery.registry import load_figures, select
+from gallery.stress import BUDGETS, DEFAULT_SCALES, STRESS_DIR, SUPERLINEAR, TIMEOUT, analyze, print_summary, run
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description='Find render-time cliffs as data grows.')
+    parser.add_argument('figures', nargs='*', metavar='ID', help='scalable figure ids (default: all)')
+    parser.add_argument('--scales', nargs='+', type=float, default=list(DEFAULT_SCALES),
+                        help=f'data size multipliers (default: {" ".join(map(str, DEFAULT_SCALES))})')
+    parser.add_argument('--timeout', type=float, default=TIMEOUT, help=f'seconds per step (default: {TIMEOUT:g})')
+    parser.add_argument('--superlinear', type=float, default=SUPERLINEAR,
+                        help=f'growth exponent that gets flagged (default: {SUPERLINEAR})')
+    parser.add_argument('--budget-seconds', type=float, default=BUDGETS['seconds'], help='time budget per step')
+    parser.add_argument('--budget-rss', type=float, default=BUDGETS['rss_mb'], help='peak memory budget (MB)')
+    parser.add_argument('--budget-svg', type=float, default=BUDGETS['svg_mb'], help='SVG size budget (MB)')
+    args = parser.parse_args()
+
+    try:
+        figures = select([f for f in load_figures() if f.scalable], args.figures)
+    except KeyError as e:
+        parser.error(e.args[0] + ' (only figures with a scalable data stage can be stressed)')
+
+    budgets = {'seconds': args.budget_seconds, 'rss_mb': args.budget_rss, 'svg_mb': args.budget_svg}
+    steps = run(figures, args.scales, args.timeout)
+    summary = analyze(steps, budgets, args.superlinear)
+    print_summary(summary)
+
+    STRESS_DIR.mkdir(parents=True, exist_ok=True)
+    report = {'scales': args.scales, 'budgets': budgets, 'superlinear': args.superlinear,
+              'steps': steps, 'summary': summary}
+    (STRESS_DIR / 'report.json').write_text(json.dumps(report, indent=2), encoding='utf-8')
+    print(f'\nReport: {STRESS_DIR / "report.json"}')
+    sys.exit(1 if any(row['flags'] for row in summary) else 0)
@@ -0,0 +1,39 @@
+"""
+Upload new or changed gallery assets to R2 (or any S3-compatible store).
+
+Compares gallery_output/ against the bucket listing and uploads only what
+differs, with content-type, cache-control and content-encoding set per file.
+Run build-gallery.py --publish first to produce the hashed assets.
+
+Usage:
+    python scripts/sync-gallery.py --bucket figure-gallery \\
+        --endpoint-url https://<account>.r2.cloudflarestorage.com
+    python scripts/sync-gallery.py --bucket test --endpoint-url http://127.0.0.1:5000 --dry-run
+
+Environment:
+    GALLERY_S3_BUCKET, GALLERY_S3_ENDPOINT    defaults for --bucket/--endpoint-url
+    AWS_ACCESS_KEY_ID, AWS_SECRET_ACCESS_KEY  credentials (R2 API token)
+"""
+
+import argparse
+import os
+import sys
+
+from gallery.sync import DEFAULT_PREFIX, make_client, sync
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description='Sync gallery_output/ to S3-compatible storage.')
+    parser.add_argument('--bucket', default=os.environ.get('GALLERY_S3_BUCKET'),
+                        help='bucket name (default: $GALLERY_S3_BUCKET)')
+    parser.add_argument('--endpoint-url', default=os.environ.get('GALLERY_S3_ENDPOINT'),
+                        help='S3 API endpoint (default: $GALLERY_S3_ENDPOINT, else AWS)')
+    parser.add_argument('--region', help='region name (default: auto, as R2 expects)')
+    parser.add_argument('--prefix', default=DEFAULT_PREFIX, help=f'key prefix (default: {DEFAULT_PREFIX})')
+    parser.add_argument('--jobs', type=int, default=16, help='concurrent uploads / pooled connections (default: 16)')
+    parser.add_argument('--dry-run', action='store_true', help='list what would be uploaded')
+    args = parser.parse_args()
+    if not args.bucket:
+        parser.error('--bucket or GALLERY_S3_BUCKET is required')
+
+    client = make_client(args.endpoint_url, args.region, args.jobs)
+    sys.exit(1 if sync(client, args.bucket, args.prefix.strip('/'), args.jobs, args.dry_run) else 0)
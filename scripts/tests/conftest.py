@@ -0,0 +1,5 @@
+import sys
+from pathlib import Path
+
+# The gallery package lives next to the scripts that use it
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
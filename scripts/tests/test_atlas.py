@@ -0,0 +1,49 @@
+"""gallery.atlas: sprites land in stable slots and only changed pages are re-encoded."""
+
+import io
+
+from PIL import Image
+
+from gallery.atlas import CELL, build_atlas
+from gallery.manifest import asset_entry, hashed_name
+
+
+def _thumb(out_dir, color):
+    buf = io.BytesIO()
+    Image.new('RGB', (96, 72), color).save(buf, format='PNG')
+    content = buf.getvalue()
+    name = hashed_name('fig.thumb.png', content)
+    (out_dir / name).write_bytes(content)
+    return {'filename': 'fig.svg', 'assets': {'thumbnail': asset_entry(name, content, 'png')}}
+
+
+def _sprite(out_dir, atlas, fid):
+    sprite = atlas['sprites'][fid]
+    page = atlas['pages'][sprite['page']]['png']['path'].rsplit('/', 1)[-1]
+    with Image.open(out_dir / page) as image:
+        x, y = sprite['x'] + CELL[0] // 2, sprite['y'] + CELL[1] // 2
+        return image.convert('RGB').getpixel((x, y))
+
+
+def test_atlas_is_packed_incrementally(tmp_path):
+    out_dir = tmp_path / 'gallery'
+    out_dir.mkdir()
+    figures = {'g-001': _thumb(out_dir, (255, 0, 0)), 'g-002': _thumb(out_dir, (0, 0, 255))}
+    atlas = build_atlas({'figures': figures}, out_dir)
+    assert [atlas['sprites'][f]['slot'] for f in figures] == [0, 1]
+    assert _sprite(out_dir, atlas, 'g-001') == (255, 0, 0)
+    assert atlas['pages'][0]['height'] == CELL[1]  # trimmed to the one row in use
+    page = atlas['pages'][0]
+
+    # Unchanged thumbnails: nothing is redrawn or renamed
+    assert build_atlas({'figures': figures}, out_dir)['pages'] == [page]
+
+    # g-001 leaves, g-003 takes its free slot, g-002 keeps its own
+    figures = {'g-002': figures['g-002'], 'g-003': _thumb(out_dir, (0, 255, 0))}
+    atlas = build_atlas({'figures': figures}, out_dir)
+    assert {f: s['slot'] for f, s in atlas['sprites'].items()} == {'g-002': 1, 'g-003': 0}
+    assert _sprite(out_dir, atlas, 'g-003') == (0, 255, 0)
+    assert _sprite(out_dir, atlas, 'g-002') == (0, 0, 255)
+    pages = {p.name for p in out_dir.glob('atlas-*')}
+    assert pages == {atlas['pages'][0][fmt]['path'].rsplit('/', 1)[-1] for fmt in ('webp', 'png')}
+    assert atlas['pages'][0]['width'] == 8 * CELL[0]
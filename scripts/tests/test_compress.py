@@ -0,0 +1,40 @@
+"""gallery.compress: siblings decompress to their source and are reused until it changes."""
+
+import gzip
+import json
+import os
+
+from gallery.compress import precompress, text_assets
+
+SVG = b'<svg xmlns="http://www.w3.org/2000/svg">' + b'<path d="M0 0L10 10"/>' * 200 + b'</svg>'
+
+
+def _run(tmp_path):
+    return precompress(text_assets(tmp_path), jobs=2, report_path=tmp_path / 'compress-report.json',
+                       skipped_path=tmp_path / '.cache' / 'skipped.json')
+
+
+def test_precompress_reuses_and_skips(tmp_path):
+    (tmp_path / 'a.svg').write_bytes(SVG)
+    (tmp_path / 'a.3f2a9c1d0e.svg').write_bytes(SVG)  # a content-hashed copy
+    (tmp_path / 'tiny.json').write_bytes(b'{}')
+    results = {r.paths[0].name: r for r in _run(tmp_path)}
+    # Identical bytes are compressed once, with siblings next to every copy
+    assert len(results) == 2 and len(results['a.3f2a9c1d0e.svg'].paths) == 2
+    for name in ('a.svg', 'a.3f2a9c1d0e.svg'):
+        assert gzip.decompress((tmp_path / f'{name}.gz').read_bytes()) == SVG
+    # Not smaller: no sibling, and the outcome is remembered
+    assert results['tiny.json'].variants['.gz'] is None and not (tmp_path / 'tiny.json.gz').exists()
+    assert list(json.loads((tmp_path / '.cache' / 'skipped.json').read_text()).values()) \
+        == [[s for s in results['tiny.json'].variants]]
+    assert json.loads((tmp_path / 'compress-report.json').read_text())['files'] == 3
+
+    assert all(r.reused for r in _run(tmp_path))
+
+    # A rewritten source is compressed again
+    (tmp_path / 'a.svg').write_bytes(SVG + b'\n')
+    stat = (tmp_path / 'a.svg.gz').stat()
+    os.utime(tmp_path / 'a.svg', ns=(stat.st_atime_ns, stat.st_mtime_ns + 10**9))
+    results = {r.paths[0].name: r for r in _run(tmp_path)}
+    assert not results['a.svg'].reused and results['tiny.json'].reused
+    assert gzip.decompress((tmp_path / 'a.svg.gz').read_bytes()) == SVG + b'\n'
@@ -0,0 +1,59 @@
+"""gallery.events: JSON-lines records and their OpenMetrics export."""
+
+import json
+
+from gallery.events import EventLog, openmetrics, write_openmetrics
+
+CATALOG = {'g-001': {'chartTypes': ['line', 'scatter']}, 'g-002': {'chartTypes': ['line']}}
+
+
+def _samples(text):
+    return dict(line.rsplit(' ', 1) for line in text.splitlines() if not line.startswith('#'))
+
+
+def test_event_log_writes_json_lines(tmp_path):
+    path = tmp_path / 'events.jsonl'
+    events = EventLog(path)
+    events.emit('build_start', mode='threads')
+    events.start('g-001', elapsed=0.5)
+    events.finish('g-001', size=10, changed=True)
+    events.finish('g-002', 'error', error='ValueError', seconds=1.0)
+    events.close()
+    records = [json.loads(line) for line in path.read_text().splitlines()]
+    assert [r['event'] for r in records] == ['build_start', 'figure_start', 'figure_finish',
+                                            'figure_finish', 'build_finish']
+    assert len({r['run'] for r in records}) == 1
+    assert records[2]['seconds'] >= 0.5 and records[2]['changed'] is True
+    assert records[3]['error'] == 'ValueError' and records[-1]['ok'] == 1
+    assert events.finished == records[2:4]
+
+
+def test_openmetrics_histograms_gauges_and_failures(tmp_path):
+    finished = [
+        {'figure': 'g-001', 'status': 'ok', 'seconds': 0.2, 'bytes': 100, 'rss': 2048},
+        {'figure': 'g-002', 'status': 'ok', 'seconds': 3.0, 'bytes': 50, 'rss': None},
+        {'figure': 'g-003', 'status': 'error', 'error': 'timeout', 'seconds': 120.0, 'bytes': 0, 'rss': None},
+        {'figure': 'g-004', 'status': 'error', 'error': 'timeout', 'seconds': 120.0, 'bytes': 0, 'rss': None},
+    ]
+    text = openmetrics(finished, CATALOG)
+    assert text.endswith('# EOF\n')
+    samples = _samples(text)
+    line = 'gallery_chart_type_render_seconds'
+    # Cumulative buckets: 0.2 s and 3.0 s are both lines
+    assert samples[f'{line}_bucket{{chart_type="line",le="0.25"}}'] == '1'
+    assert samples[f'{line}_bucket{{chart_type="line",le="5.0"}}'] == '2'
+    assert samples[f'{line}_bucket{{chart_type="line",le="+Inf"}}'] == '2'
+    assert samples[f'{line}_sum{{chart_type="line"}}'] == '3.200000'
+    assert samples[f'{line}_count{{chart_type="scatter"}}'] == '1'
+    # Failures are counted, not timed
+    assert 'gallery_figure_render_seconds_count{figure="g-003"}' not in samples
+    assert samples['gallery_figure_failures_total{error_type="timeout"}'] == '2'
+    assert samples['gallery_figure_rss_bytes{figure="g-001"}'] == '2048'
+    assert 'gallery_figure_rss_bytes{figure="g-002"}' not in samples
+    # Every metric family is declared once, before its samples
+    types = [line.split()[2] for line in text.splitlines() if line.startswith('# TYPE')]
+    assert len(types) == len(set(types)) == 5
+
+    path = tmp_path / 'metrics.prom'
+    write_openmetrics(path, finished, CATALOG)
+    assert path.read_text() == text
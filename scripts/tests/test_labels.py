@@ -0,0 +1,78 @@
+"""gallery.labels: placed labels never overlap and stay inside the axes."""
+
+import numpy as np
+import pytest
+from matplotlib.text import Text
+
+from gallery.backend import GATE, new_figure
+from gallery.labels import candidates, place_labels, solve, text_extents
+
+BOUNDS = (0.0, 0.0, 400.0, 300.0)
+
+
+def _overlaps(a, b):
+    return (a[0] < b[2]) & (a[2] > b[0]) & (a[1] < b[3]) & (a[3] > b[1])
+
+
+def _chosen_boxes(seed, n=300, blocked=()):
+    rng = np.random.RandomState(seed)
+    anchors = rng.uniform((0, 0), BOUNDS[2:], (n, 2))
+    widths = rng.uniform(10, 60, n)
+    points = rng.uniform((0, 0), BOUNDS[2:], (5000, 2))
+    choice, *_ = solve(anchors, widths, 8.0, points, BOUNDS, blocked)
+    boxes = candidates(anchors, widths, 8.0)[0]
+    return choice, boxes[np.flatnonzero(choice >= 0), choice[choice >= 0]]
+
+
+def test_solve_places_without_overlap_inside_bounds():
+    legend = (300.0, 240.0, 400.0, 300.0)
+    for seed in range(3):
+        choice, boxes = _chosen_boxes(seed, blocked=[legend])
+        # Crowded enough that some labels are dropped, but most fit
+        assert 0.3 * len(choice) < len(boxes) < len(choice)
+        assert (boxes[:, :2] >= BOUNDS[:2]).all() and (boxes[:, 2:] <= BOUNDS[2:]).all()
+        hit = _overlaps(boxes[:, None].T, boxes[None].T)
+        assert not hit[~np.eye(len(boxes), dtype=bool)].any()
+        assert not _overlaps(boxes.T, np.array(legend)).any()
+
+
+def test_solve_prefers_free_space_over_points():
+    anchors = np.array([[200.0, 150.0]])
+    # A cloud right above the anchor: the label goes elsewhere, at the near distance
+    points = np.column_stack([np.linspace(170, 230, 50), np.full(50, 160.0)])
+    choice, offsets, ha, va = solve(anchors, np.array([30.0]), 8.0, points, BOUNDS)
+    assert choice[0] == 1 and ha[1] == 'left'
+
+
+@pytest.mark.parametrize('dpi', [72, 150, 300])
+def test_text_extents_are_never_narrower_than_drawn(dpi):
+    texts = ['Gene0', 'BRCA1', 'wwwWWW', 'il1', 'Tumor necrosis factor']
+    widths, _ = text_extents(texts, 7, dpi=dpi)
+    with GATE.use(None):
+        fig = new_figure(figsize=(4, 2), dpi=dpi)
+        drawn = [fig.text(0.1, 0.5, t, fontsize=7, family='sans-serif') for t in texts]
+        fig.canvas.draw()
+        renderer = fig.canvas.get_renderer()
+        extents = np.array([t.get_window_extent(renderer).size for t in drawn]) * 72 / dpi
+    assert (widths >= extents[:, 0] - 1e-6).all()
+
+
+@pytest.mark.parametrize('dpi', [72, 150, 300])
+def test_drawn_labels_do_not_overlap(dpi):
+    rng = np.random.RandomState(0)
+    x, y = rng.uniform(0, 1, (2, 60))
+    with GATE.use(None):
+        fig = new_figure(figsize=(5, 4), dpi=dpi)
+        ax = fig.add_subplot()
+        ax.scatter(*rng.uniform(0, 1, (2, 500)), s=2)
+        ax.scatter(x, y, s=6)
+        placement = place_labels(ax, x, y, [f'Gene{i}' for i in range(60)])
+        fig.canvas.draw()
+        renderer = fig.canvas.get_renderer()
+        # The text alone, without the leader line
+        boxes = np.array([Text.get_window_extent(t, renderer).extents for t in ax.texts])
+        frame = ax.get_window_extent(renderer).extents
+    assert len(boxes) == placement.placed.sum() > 30
+    assert (boxes[:, :2] >= frame[:2] - 0.5).all() and (boxes[:, 2:] <= frame[2:] + 0.5).all()
+    hit = _overlaps(boxes[:, None].T, boxes[None].T)
+    assert not hit[~np.eye(len(boxes), dtype=bool)].any()
@@ -0,0 +1,33 @@
+"""gallery.manifest.publish: reuses the build's data and skips its failures."""
+
+import dataclasses
+
+from gallery.build import build
+from gallery.events import EventLog
+from gallery.manifest import load_manifest, publish
+from gallery.registry import load_figures, select
+
+FIGURE, OTHER = select(load_figures(), ['g-002', 'g-003'])
+
+
+def _no_data(rng):
+    raise AssertionError('data computed again')
+
+
+def test_publish_reuses_build_data_and_skips_failures(tmp_path):
+    finished, computed = build([FIGURE, OTHER], 'test figures', 1, EventLog(), tmp_path)
+    assert set(computed) == {FIGURE.id, OTHER.id}
+    out_dir = tmp_path / 'gallery'
+    # Data stages that raise: publishing must take the build's data
+    figures = [dataclasses.replace(f, data=_no_data) for f in (FIGURE, OTHER)]
+    manifest = publish(figures, (), tmp_path, out_dir, finished=finished, data=computed)
+    assert set(manifest['figures']) == {FIGURE.id, OTHER.id}
+    entry = manifest['figures'][OTHER.id]
+
+    # OTHER failed this run: its SVG on disk is stale, so neither it nor its
+    # manifest entry changes
+    (tmp_path / OTHER.filename).write_bytes(b'<svg/>')
+    failed = [{'figure': FIGURE.id, 'status': 'ok'}, {'figure': OTHER.id, 'status': 'timeout'}]
+    manifest = publish(figures, (), tmp_path, out_dir, finished=failed, data=computed)
+    assert manifest['figures'][OTHER.id] == entry
+    assert load_manifest(out_dir / 'manifest.json')['figures'][OTHER.id] == entry
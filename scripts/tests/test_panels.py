@@ -0,0 +1,46 @@
+"""gallery.panels cache eviction."""
+
+import os
+
+from gallery import style
+from gallery.panels import _cached, prune_cache
+from gallery.registry import load_figures, select
+
+
+def _entry(cache_dir, name, size, used):
+    path = cache_dir / f'{name}.svg'
+    path.write_bytes(b'x' * size)
+    os.utime(path, ns=(used, used))
+    return path
+
+
+def test_prune_keeps_recently_used_entries(tmp_path):
+    old = _entry(tmp_path, 'g001-old', 400, 1_000_000_000)
+    mid = _entry(tmp_path, 'g001-mid', 400, 2_000_000_000)
+    new = _entry(tmp_path, 'g001-new', 400, 3_000_000_000)
+    assert prune_cache(tmp_path, limit=1000) == 1
+    assert not old.exists() and mid.exists() and new.exists()
+    assert prune_cache(tmp_path, limit=1000) == 0
+
+
+def test_reading_an_entry_marks_it_used(tmp_path):
+    old = _entry(tmp_path, 'g001-old', 400, 1_000_000_000)
+    mid = _entry(tmp_path, 'g001-mid', 400, 2_000_000_000)
+    assert _cached(old) == b'x' * 400
+    prune_cache(tmp_path, limit=500)
+    assert old.exists() and not mid.exists()
+    assert _cached(mid) is None
+
+
+def test_panel_keys_follow_the_style_rcparams(monkeypatch):
+    figure, = select(load_figures(), ['g-001'])
+    composition, data = figure.draw, figure.compute()
+
+    def keys(name):
+        return [composition.panel_key(p, data, figure.palette, name) for p in composition.panels]
+
+    before = keys('nature')
+    monkeypatch.setitem(style.STYLES['nature'], 'axes.linewidth', 2.5)
+    changed = keys('nature')
+    monkeypatch.setitem(style.BASE_RC, 'font.size', 7)
+    assert all(a != b != c for a, b, c in zip(before, changed, keys('nature')))
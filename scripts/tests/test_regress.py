@@ -0,0 +1,56 @@
+"""gallery.regress on real gallery figures."""
+
+import io
+
+import numpy as np
+import pytest
+
+from gallery.backend import render
+from gallery.registry import load_figures, select
+from gallery.regress import _init_worker, _load_rgb, _rasterize, check, pixel_diff, update_baselines
+from gallery.supervise import script_paths
+
+# g-001 is a composition, published through the render_svg splice path
+FIGURE, = select(load_figures(), ['g-001'])
+
+
+@pytest.fixture(scope='module')
+def built(tmp_path_factory):
+    out_dir = tmp_path_factory.mktemp('out')
+    (out_dir / FIGURE.filename).write_bytes(render(FIGURE, FIGURE.compute()))
+    return out_dir
+
+
+def test_rasterize_built_svg_and_diff(built):
+    pytest.importorskip('pymupdf')
+    fid, content, info = _rasterize((FIGURE.id, built / FIGURE.filename, 72))
+    assert fid == FIGURE.id and info['rasterizer'] == 'pymupdf'
+    image = _load_rgb(io.BytesIO(content))
+    assert list(image.shape[1::-1]) == info['size']
+    assert image.std() > 0  # something was drawn
+
+    fraction, strip = pixel_diff(image, image)
+    assert fraction == 0 and strip.size == (3 * image.shape[1], image.shape[0])
+    moved = image.copy()
+    moved[:40, :40] = np.where(image[:40, :40] > 127, 0, 255)  # every channel moves by > 127
+    fraction, _ = pixel_diff(image, moved)
+    assert fraction == pytest.approx(1600 / (image.shape[0] * image.shape[1]))
+
+
+def test_missing_svg_is_an_error(tmp_path):
+    _, content, info = _rasterize((FIGURE.id, tmp_path / FIGURE.filename, 72))
+    assert content is None and 'not built' in info['error']
+
+
+def test_agg_fallback_draws_the_figure():
+    _init_worker(script_paths([FIGURE]))
+    _, content, info = _rasterize((FIGURE.id, None, 72))
+    assert content.startswith(b'\x89PNG') and info['rasterizer'] == 'agg'
+
+
+def test_check_against_fresh_baselines(built, tmp_path):
+    baseline_dir, report_dir = tmp_path / 'baseline', tmp_path / 'report'
+    assert update_baselines([FIGURE], workers=1, baseline_dir=baseline_dir, out_dir=built) == 0
+    report = check([FIGURE], workers=1, baseline_dir=baseline_dir, report_dir=report_dir, out_dir=built)
+    assert [r['status'] for r in report['figures']] == ['same']
+    assert (report_dir / 'index.html').exists()
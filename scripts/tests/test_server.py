@@ -0,0 +1,44 @@
+"""gallery.server: client-chosen paths stay inside the render directory."""
+
+import base64
+import json
+
+import pytest
+
+from gallery import server
+from gallery.registry import load_figures, select
+from gallery.server import RenderServer, _render_path, serve_lines
+
+
+@pytest.fixture
+def render_dir(tmp_path, monkeypatch):
+    monkeypatch.setattr(server, 'RENDER_DIR', tmp_path / 'renders')
+    return tmp_path / 'renders'
+
+
+@pytest.mark.parametrize('path', ['../escape.svg', 'a/../../escape.svg', '/tmp/escape.svg', '.', ''])
+def test_paths_outside_the_render_dir_are_rejected(render_dir, path):
+    with pytest.raises(ValueError):
+        _render_path(path)
+
+
+def test_paths_inside_resolve_under_it(render_dir):
+    assert _render_path('previews/a.svg') == render_dir.resolve() / 'previews' / 'a.svg'
+    assert _render_path('x/../a.svg') == render_dir.resolve() / 'a.svg'
+
+
+def test_rejected_paths_write_nothing(render_dir, tmp_path):
+    render = RenderServer(select(load_figures(), ['g-002']), workers=1)
+    replies = []
+    lines = [json.dumps({'id': 1, 'figure': 'g-002', 'path': '../escape.svg'}),
+             json.dumps({'id': 2, 'figure': 'g-002', 'path': 'ok/a.svg'}),
+             json.dumps({'id': 3, 'figure': 'g-002', 'return': 'bytes'})]
+    try:
+        serve_lines(render, lines, replies.append)
+    finally:
+        render.shutdown()
+    by_id = {r['id']: r for r in map(json.loads, replies)}
+    assert not by_id[1]['ok'] and 'outside' in by_id[1]['error']
+    assert not (tmp_path / 'escape.svg').exists()
+    assert by_id[2]['ok'] and (render_dir / 'ok' / 'a.svg').exists()
+    assert base64.b64decode(by_id[3]['content']).startswith(b'<?xml')
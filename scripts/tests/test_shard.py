@@ -0,0 +1,42 @@
+"""gallery.shard split fingerprints and merge coverage checks."""
+
+import pytest
+
+from gallery.registry import Figure
+from gallery.shard import _check_split, assign, split_fingerprint
+
+FIGURES = [Figure(f'g-00{n}', f'f{n}.svg', None, None, []) for n in range(1, 6)]
+
+
+def _reports(costs, total=2):
+    shards, _ = assign(FIGURES, total, costs)
+    split = split_fingerprint(repr(costs).encode(), FIGURES)
+    return [{'shard': i, 'split': split, 'figures': [f.id for f in shard]}
+            for i, shard in enumerate(shards, 1)]
+
+
+def test_one_split_covers_the_registry():
+    _check_split(_reports({'g-001': 5.0}), FIGURES, 'shards')
+
+
+def test_fingerprint_follows_costs_and_registry():
+    assert split_fingerprint(b'{}', FIGURES) != split_fingerprint(b'{"g-001": 1}', FIGURES)
+    assert split_fingerprint(b'{}', FIGURES) != split_fingerprint(b'{}', FIGURES[:-1])
+
+
+def test_shards_from_different_splits_are_rejected():
+    before, after = _reports({'g-001': 5.0}), _reports({'g-005': 9.0})
+    with pytest.raises(SystemExit, match='split differently'):
+        _check_split([before[0], after[1]], FIGURES, 'shards')
+
+
+def test_missing_and_duplicate_figures_are_rejected():
+    reports = _reports({})
+    reports[1]['figures'] = reports[0]['figures'][:1] + reports[1]['figures'][1:]
+    with pytest.raises(SystemExit, match='more than one shard.*missing'):
+        _check_split(reports, FIGURES, 'shards')
+
+
+def test_figures_of_another_registry_are_rejected():
+    with pytest.raises(SystemExit, match='not in this registry: g-005'):
+        _check_split(_reports({}), FIGURES[:-1], 'shards')
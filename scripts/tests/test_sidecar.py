@@ -0,0 +1,71 @@
+"""gallery.sidecar round trips, plus the fixture lib/figureData.ts is tested against.
+
+Regenerate the fixture after a format change with:
+
+    cd scripts && python -m tests.test_sidecar
+"""
+
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+from gallery.registry import Figure
+from gallery.sidecar import INLINE_LABELS, encode, read
+
+FIXTURE = Path(__file__).resolve().parents[2] / 'tests' / 'fixtures' / 'figure-data.bin'
+
+GENES = [f'Gene{i}' for i in range(INLINE_LABELS + 6)]
+
+
+def fixture_data():
+    return {
+        'x': np.arange(4, dtype=float),
+        'y': np.array([[1.0, 2.0, 3.0, 4.0], [0.5, np.nan, 1.5, 2.0], [0, 0, 0, 0]]),
+        'series': ['Control', '处理组', 'Placebo'],
+        'groups': [{'x': [0.0, 1.0], 'y': [2.0, 3.0]}, {'x': [4.0], 'y': [5.0]}],
+        'names': ['A', 'B'],
+        'genes': GENES,
+        'fc': np.linspace(-1, 1, len(GENES)),
+        'data': pd.DataFrame({'Group': ['a', 'b', 'a', 'c', 'b'], 'Response': [1, 2, 3, 4, 5]}),
+        'fit': np.ones(100),
+        'title': 'Fixture',
+    }
+
+
+FIGURE = Figure('g-fixture', 'fixture.svg', fixture_data, None, ['#000000', '#FFFFFF'],
+                derived=('fit',))
+
+
+def test_round_trip(tmp_path):
+    path = tmp_path / 'fixture.data.bin'
+    path.write_bytes(encode(FIGURE, fixture_data()))
+    for header, columns in (read(path), read(path, mmap=False), read(path.read_bytes())):
+        assert header['labels']['genes'] == GENES
+        assert header['labels']['series'] == ['Control', '处理组', 'Placebo']
+        assert header['labels']['title'] == 'Fixture'
+        np.testing.assert_array_equal(columns['y'][0], [1, 2, 3, 4])
+        assert np.isnan(columns['y'][1, 1])
+        by_name = {c['name']: c for c in header['columns']}
+        assert by_name['y']['axes'] == ['series', None]
+        assert by_name['groups.1.y']['series'] == 'B'
+        assert by_name['data.Group']['categories'] == ['a', 'b', 'c']
+        np.testing.assert_array_equal(columns['data.Group'], [0, 1, 0, 2, 1])
+        assert 'fit' not in columns
+
+
+def test_long_labels_stay_out_of_the_header():
+    content = encode(FIGURE, fixture_data())
+    header_bytes = int.from_bytes(content[4:8], 'little')
+    assert b'Gene0' not in content[8:8 + header_bytes]
+    assert len(content) < 2048
+
+
+def test_fixture_is_current():
+    assert FIXTURE.read_bytes() == encode(FIGURE, fixture_data())
+
+
+if __name__ == '__main__':
+    FIXTURE.parent.mkdir(parents=True, exist_ok=True)
+    FIXTURE.write_bytes(encode(FIGURE, fixture_data()))
+    print(f'Wrote {FIXTURE}')
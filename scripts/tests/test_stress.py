@@ -0,0 +1,43 @@
+"""gallery.stress: growth exponents, flags and isolated steps."""
+
+import pytest
+
+from gallery.registry import load_figures, select
+from gallery.stress import analyze, growth, run_step
+
+
+def _step(fid, scale, seconds, rss_mb=10.0, svg_mb=1.0, status='ok'):
+    return {'figure': fid, 'scale': scale, 'status': status, 'seconds': seconds,
+            'rss_mb': rss_mb, 'svg_mb': svg_mb}
+
+
+def test_growth_fits_power_laws():
+    assert growth([1, 10, 100], [2.0, 20.0, 200.0]) == (1.0, 1.0)
+    # Flat fixed overhead first, then quadratic: the local slope shows it
+    overall, local = growth([1, 10, 100], [1.0, 1.0, 100.0])
+    assert local == 2.0 and overall < local
+    assert growth([1], [1.0]) == (None, None)
+    assert growth([1, 10], [0.0, 1.0]) == (None, None)
+
+
+def test_analyze_flags_superlinear_steps_budgets_and_failures():
+    steps = [_step('g-900', 1, 0.1), _step('g-900', 10, 1.0), _step('g-900', 100, 50.0, svg_mb=30.0),
+             _step('g-901', 1, 0.1), _step('g-901', 10, 1.0),
+             {'figure': 'g-901', 'scale': 100, 'status': 'timeout', 'error': 'exceeded 300s'}]
+    rows = {row['figure']: row for row in analyze(steps)}
+    assert rows['g-900']['seconds'] == {'overall': 1.35, 'local': 1.7}
+    assert rows['g-900']['flags'] == ['seconds grows ~scale^1.7', 'seconds over budget (30) from 100×',
+                                      'svg_mb grows ~scale^1.48', 'svg_mb over budget (20) from 100×']
+    assert rows['g-901']['scales'] == [1, 10]
+    assert rows['g-901']['flags'] == ['timeout at 100×']
+
+
+@pytest.mark.parametrize('figure_id, status', [('g-004', 'ok'), ('g-001', 'error')])
+def test_steps_run_in_their_own_process(figure_id, status):
+    figure, = select(load_figures(), [figure_id])
+    step = run_step(figure, 2)
+    assert step['status'] == status
+    if status == 'ok':
+        assert step['seconds'] >= step['draw_seconds'] > 0 and step['svg_mb'] > 0
+    else:
+        assert 'fixed data size' in step['error']
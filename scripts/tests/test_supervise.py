@@ -0,0 +1,83 @@
+"""Supervised and threaded builds: failures are recorded, not fatal."""
+
+import textwrap
+
+import pytest
+
+from gallery.build import build
+from gallery.events import EventLog
+from gallery.registry import load_script
+from gallery import supervise as supervise_module
+from gallery.supervise import supervise
+
+SOURCE = textwrap.dedent('''
+    import time
+
+    from gallery.backend import new_figure
+    from gallery.registry import Figure
+
+
+    def quick(rng):
+        return {'y': [1.0, 2.0, 3.0]}
+
+
+    def slow(rng):
+        time.sleep(30)
+        return quick(rng)
+
+
+    def broken(rng):
+        raise ValueError('bad data')
+
+
+    def draw(d, colors):
+        fig = new_figure(figsize=(2, 2))
+        fig.add_subplot().plot(d['y'], color=colors[0])
+        return fig
+
+
+    FIGURES = [
+        Figure('g-901', 'sup-quick.svg', quick, draw, ['#336699']),
+        Figure('g-902', 'sup-slow.svg', slow, draw, ['#336699']),
+        Figure('g-903', 'sup-broken.svg', broken, draw, ['#336699']),
+        Figure('g-904', 'sup-again.svg', quick, draw, ['#336699']),
+    ]
+''')
+
+
+def _figures(tmp_path, name):
+    script = tmp_path / f'{name}.py'
+    script.write_text(SOURCE, encoding='utf-8')
+    return list(load_script(script).FIGURES)
+
+
+def _statuses(events):
+    return {r['figure']: r.get('error', r['status']) for r in events.finished}
+
+
+def test_timeouts_and_errors_fail_only_their_figure(tmp_path):
+    figures = _figures(tmp_path, 'gen_supervise_timeout')
+    events = EventLog()
+    status = supervise(figures, timeout=3, max_tasks=1, out_dir=tmp_path, events=events)
+    assert status == 1
+    assert _statuses(events) == {'g-901': 'ok', 'g-902': 'timeout', 'g-903': 'ValueError', 'g-904': 'ok'}
+    assert (tmp_path / 'sup-again.svg').exists() and not (tmp_path / 'sup-slow.svg').exists()
+
+
+def _exit_at_startup(conn, scripts, out_dir):
+    raise SystemExit(3)
+
+
+def test_worker_that_cannot_start_fails_its_figure(tmp_path, monkeypatch):
+    monkeypatch.setattr(supervise_module, '_worker_main', _exit_at_startup)
+    figures = _figures(tmp_path, 'gen_supervise_startup')[:2]
+    events = EventLog()
+    assert supervise(figures, timeout=3, out_dir=tmp_path, events=events) == 1
+    assert _statuses(events) == {'g-901': 'startup', 'g-902': 'startup'}
+
+
+@pytest.mark.parametrize('workers', [1, 2])
+def test_threaded_build_returns_failures(tmp_path, workers):
+    figures = _figures(tmp_path, 'gen_supervise_threads')
+    finished, _ = build([figures[0], figures[2]], 'test figures', workers, EventLog(), tmp_path)
+    assert {r['figure']: r['status'] for r in finished} == {'g-901': 'ok', 'g-903': 'error'}
@@ -0,0 +1,72 @@
+"""gallery.sync against moto's in-process S3 stand-in."""
+
+import boto3
+import pytest
+from moto import mock_aws
+
+from gallery.sync import IMMUTABLE, REVALIDATE, local_objects, plan, remote_listing, sync
+
+BUCKET = 'gallery-test'
+
+
+@pytest.fixture
+def out_dir(tmp_path):
+    publish = tmp_path / 'gallery'
+    publish.mkdir()
+    (tmp_path / 'ieee-bar.svg').write_text('<svg/>')
+    (publish / 'ieee-bar.0123456789.svg').write_text('<svg/>')
+    (publish / 'ieee-bar.thumb.abcdef0123.png').write_bytes(b'\x89PNG')
+    (publish / 'manifest.json').write_text('{"figures": {}}')
+    (publish / 'manifest.json.br').write_bytes(b'\x0b\x02')
+    (publish / 'atlas.json').write_text('{"sprites": {}}')
+    (publish / 'search-index.json').write_text('{"items": []}')
+    return tmp_path
+
+
+@pytest.fixture
+def client():
+    with mock_aws():
+        s3 = boto3.client('s3', region_name='us-east-1',
+                          aws_access_key_id='test', aws_secret_access_key='test')
+        s3.create_bucket(Bucket=BUCKET)
+        yield s3
+
+
+def _sync(client, out_dir):
+    return sync(client, BUCKET, jobs=4, out_dir=out_dir, publish_dir=out_dir / 'gallery')
+
+
+def test_second_run_uploads_nothing(client, out_dir):
+    assert _sync(client, out_dir) == 0
+    local = local_objects(out_dir=out_dir, publish_dir=out_dir / 'gallery')
+    assert len(local) == 7
+    assert plan(local, remote_listing(client, BUCKET)) == []
+
+    (out_dir / 'gallery' / 'manifest.json').write_text('{"figures": {"g-001": {}}}')
+    local = local_objects(out_dir=out_dir, publish_dir=out_dir / 'gallery')
+    assert [obj.key for obj in plan(local, remote_listing(client, BUCKET))] == ['gallery/manifest.json']
+
+
+def test_headers(client, out_dir):
+    _sync(client, out_dir)
+    svg = client.head_object(Bucket=BUCKET, Key='gallery/ieee-bar.0123456789.svg')
+    assert svg['ContentType'] == 'image/svg+xml; charset=utf-8'
+    assert svg['CacheControl'] == IMMUTABLE
+    manifest = client.head_object(Bucket=BUCKET, Key='gallery/manifest.json.br')
+    assert manifest['ContentType'] == 'application/json; charset=utf-8'
+    assert manifest['ContentEncoding'] == 'br'
+    assert manifest['CacheControl'] == REVALIDATE
+
+
+def test_index_files_go_last(client, out_dir):
+    order = []
+    put_object = client.put_object
+
+    def recording_put(**kwargs):
+        order.append(kwargs['Key'].rsplit('/', 1)[-1])
+        return put_object(**kwargs)
+
+    client.put_object = recording_put
+    assert _sync(client, out_dir) == 0
+    indexes = {'manifest.json', 'manifest.json.br', 'atlas.json', 'search-index.json'}
+    assert set(order[-len(indexes):]) == indexes
@@ -0,0 +1,27 @@
+"""gallery.textsvg: text stays text, fonts are shared, earlier batches are pruned."""
+
+import re
+
+from gallery.registry import load_figures, select
+from gallery.textsvg import build_text_svgs
+
+FIGURES = select(load_figures(), ['g-029', 'g-030'])
+
+
+def _font_links(path):
+    return set(re.findall(r'url\(fonts/([^)]+)\)', path.read_text(encoding='utf-8')))
+
+
+def test_text_svgs_link_shared_subsets_and_prune_old_batches(tmp_path):
+    rows, font_bytes = build_text_svgs(FIGURES, tmp_path, compare=False)
+    assert [r['figure'] for r in rows] == ['g-029', 'g-030'] and font_bytes > 0
+    first, second = (tmp_path / f.filename for f in FIGURES)
+    assert '<text' in first.read_text(encoding='utf-8')
+    fonts = {p.name for p in (tmp_path / 'fonts').iterdir()}
+    assert _font_links(first) | _font_links(second) == fonts
+
+    # A batch with fewer characters writes new subsets; the old ones and
+    # the SVG outside the batch go
+    build_text_svgs(FIGURES[:1], tmp_path, compare=False)
+    assert not second.exists()
+    assert {p.name for p in (tmp_path / 'fonts').iterdir()} == _font_links(first)
@@ -0,0 +1,61 @@
+"""gallery.tiles: NaN-aware pyramids and their Deep Zoom tiles."""
+
+import json
+import math
+import re
+
+import numpy as np
+from matplotlib import colormaps
+from matplotlib.colors import Normalize
+from PIL import Image
+
+from gallery.registry import load_figures, select
+from gallery.tiles import OVERLAP, TILE_SIZE, colorize, downsample, pyramid, tile_figure, tile_matrix
+
+CMAP, NORM = colormaps['viridis'], Normalize(0, 1)
+
+
+def test_downsample_ignores_nan_and_pads_odd_edges():
+    values = np.array([[1, 3, 5], [np.nan, 2, 7], [4, np.nan, np.nan]], dtype=np.float32)
+    np.testing.assert_allclose(downsample(values), [[2, 6], [4, np.nan]])
+    np.testing.assert_allclose(downsample(values, 'max'), [[3, 7], [4, np.nan]])
+
+
+def test_pyramid_runs_from_one_cell_to_the_full_matrix():
+    levels = pyramid(np.ones((300, 5)))
+    assert [lv.shape for lv in levels][:3] == [(1, 1), (2, 1), (3, 1)] and levels[-1].shape == (300, 5)
+    assert len(levels) == math.ceil(math.log2(300)) + 1
+
+
+def test_tiles_reassemble_the_deepest_level(tmp_path):
+    rng = np.random.RandomState(0)
+    matrix = rng.uniform(0, 1, (600, 300)).astype(np.float32)
+    matrix[10:20, 10:20] = np.nan
+    levels, n_tiles = tile_matrix(matrix, CMAP, NORM, tmp_path, 'm', workers=2)
+    size = re.search(r'<Size Width="(\d+)" Height="(\d+)"/>', (tmp_path / 'm.dzi').read_text())
+    assert size.groups() == ('300', '600')
+    deepest = tmp_path / 'm_files' / str(len(levels) - 1)
+    assert n_tiles == len(list(tmp_path.glob('m_files/*/*.png')))
+    assert sorted(p.name for p in deepest.iterdir()) == sorted(f'{c}_{r}.png' for c in range(2) for r in range(3))
+    # Each tile starts OVERLAP cells before its grid position, except on the first row/column
+    canvas = np.zeros((600, 300, 4), dtype=np.uint8)
+    for path in deepest.iterdir():
+        col, row = map(int, path.stem.split('_'))
+        top, left = max(0, row * TILE_SIZE - OVERLAP), max(0, col * TILE_SIZE - OVERLAP)
+        tile = np.asarray(Image.open(path))
+        canvas[top:top + tile.shape[0], left:left + tile.shape[1]] = tile
+    np.testing.assert_array_equal(canvas, colorize(matrix, CMAP, NORM))
+    assert (canvas[15, 15] == 0).all()  # NaN is transparent
+
+    # A smaller matrix leaves no tiles of the old levels behind
+    levels, n_tiles = tile_matrix(matrix[:200, :200], CMAP, NORM, tmp_path, 'm')
+    assert n_tiles == len(list(tmp_path.glob('m_files/*/*.png')))
+
+
+def test_tile_figure_writes_overview_and_metadata(tmp_path):
+    figure, = select(load_figures(), ['g-017'])
+    meta, _ = tile_figure(figure, out_dir=tmp_path)
+    target = tmp_path / figure.filename.rsplit('.', 1)[0]
+    assert json.loads((target / 'heatmap.json').read_text()) == meta
+    assert (target / meta['dzi']).exists() and (target / meta['overview']).read_bytes().startswith(b'<?xml')
+    assert meta['levels'] == math.ceil(math.log2(max(meta['rows'], meta['columns']))) + 1
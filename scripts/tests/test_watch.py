@@ -0,0 +1,103 @@
+"""gallery.watch change detection and where watch mode writes."""
+
+import os
+import textwrap
+
+from gallery.registry import Figure
+from gallery.sidecar import read
+from gallery.watch import Watcher, affected, snapshot
+
+SOURCE = textwrap.dedent('''
+    import numpy as np
+
+    from gallery.backend import new_figure
+    from gallery.registry import Figure
+
+    SIZE = 5
+
+
+    def scale():
+        return 1.0
+
+
+    def width():
+        return 1.5
+
+
+    def data(rng):
+        return {'x': np.arange(SIZE) * scale()}
+
+
+    def draw(d, colors):
+        fig = new_figure(figsize=(2, 2))
+        fig.add_subplot().plot(d['x'], color=colors[0], linewidth=width())
+        return fig
+
+
+    FIGURES = [Figure('g-901', 'watch-test.svg', data, draw, ['#336699'])]
+''')
+
+
+def _figures(source):
+    namespace = {}
+    exec(compile(source, 'watch_test', 'exec'), namespace)
+    return namespace['FIGURES']
+
+
+def _plan(old, new):
+    return affected(snapshot(old), snapshot(new), _figures(old), _figures(new))
+
+
+def test_formatting_and_comments_are_not_changes():
+    edited = SOURCE.replace('    return 1.5\n', '    # wider lines\n    return (\n        1.5\n    )\n')
+    assert snapshot(edited).functions == snapshot(SOURCE).functions
+    assert _plan(SOURCE, edited) == {}
+
+
+def test_helper_of_the_drawing_stage_redraws_without_recompute():
+    assert _plan(SOURCE, SOURCE.replace('return 1.5', 'return 2.0')) == {'g-901': False}
+
+
+def test_helper_of_the_data_stage_recomputes():
+    assert _plan(SOURCE, SOURCE.replace('return 1.0', 'return 2.0')) == {'g-901': True}
+
+
+def test_module_level_change_recomputes_everything():
+    assert _plan(SOURCE, SOURCE.replace('SIZE = 5', 'SIZE = 6')) == {'g-901': True}
+
+
+def test_registry_entry_change_redraws():
+    assert _plan(SOURCE, SOURCE.replace('#336699', '#993366')) == {'g-901': False}
+
+
+def _poll_after_edit(watcher, script, source):
+    script.write_text(source, encoding='utf-8')
+    stat = script.stat()
+    os.utime(script, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000_000))
+    return watcher.poll()
+
+
+def test_styled_watch_writes_variants_and_keeps_the_sidecar_current(tmp_path):
+    script = tmp_path / 'generate-gallery-watchtest.py'
+    script.write_text(SOURCE, encoding='utf-8')
+    out_dir = tmp_path / 'out'
+    watcher = Watcher([script], out_dir=out_dir, style='nature')
+    watcher.load(render_all=True)
+
+    assert (out_dir / 'variants' / 'nature' / 'original' / 'watch-test.svg').exists()
+    assert not (out_dir / 'watch-test.svg').exists()
+    _, columns = read(out_dir / 'watch-test.data.bin')
+    assert list(columns['x']) == [0, 1, 2, 3, 4]
+
+    assert _poll_after_edit(watcher, script, SOURCE.replace('return 1.0', 'return 2.0')) == 1
+    _, columns = read(out_dir / 'watch-test.data.bin')
+    assert list(columns['x']) == [0, 2, 4, 6, 8]
+
+
+def test_unstyled_watch_writes_the_default_svg(tmp_path):
+    script = tmp_path / 'generate-gallery-watchtest.py'
+    script.write_text(SOURCE, encoding='utf-8')
+    watcher = Watcher([script], out_dir=tmp_path)
+    watcher.load(render_all=True)
+    assert (tmp_path / 'watch-test.svg').read_bytes().startswith(b'<?xml')
+    assert watcher.output_path(Figure('g-901', 'watch-test.svg', None, None)) == tmp_path / 'watch-test.svg'
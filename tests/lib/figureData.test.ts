@@ -0,0 +1,70 @@
+import { readFileSync } from 'fs'
+import path from 'path'
+import {
+  categoryValues,
+  columnRow,
+  labelList,
+  parseFigureData,
+  toDataPoints,
+} from '@/lib/figureData'
+
+// Written by scripts/tests/test_sidecar.py, which checks it is current
+function fixture(): ArrayBuffer {
+  const bytes = readFileSync(path.join(__dirname, '../fixtures/figure-data.bin'))
+  return bytes.buffer.slice(bytes.byteOffset, bytes.byteOffset + bytes.byteLength)
+}
+
+describe('parseFigureData', () => {
+  it('reads the header and float32 columns', () => {
+    const data = parseFigureData(fixture())
+    expect(data.header.version).toBe(2)
+    expect(data.header.figure).toBe('g-fixture')
+    expect(data.header.palette).toEqual(['#000000', '#FFFFFF'])
+    expect(Array.from(data.columns.x)).toEqual([0, 1, 2, 3])
+    expect(Array.from(columnRow(data, 'y', 0))).toEqual([1, 2, 3, 4])
+    expect(Number.isNaN(columnRow(data, 'y', 1)[1])).toBe(true)
+    expect(data.header.labels.title).toBe('Fixture')
+  })
+
+  it('keeps axes and series names', () => {
+    const data = parseFigureData(fixture())
+    const columns = Object.fromEntries(data.header.columns.map((c) => [c.name, c]))
+    expect(columns.y.axes).toEqual(['series', null])
+    expect(columns['groups.1.y'].series).toBe('B')
+    expect(labelList(data, 'series')).toEqual(['Control', '处理组', 'Placebo'])
+  })
+
+  it('decodes long label lists stored after the columns', () => {
+    const data = parseFigureData(fixture())
+    const genes = labelList(data, 'genes')
+    expect(genes).toHaveLength(70)
+    expect(genes[0]).toBe('Gene0')
+    expect(genes[69]).toBe('Gene69')
+    expect(data.columns.fc).toHaveLength(70)
+  })
+
+  it('maps categorical codes back to strings', () => {
+    const data = parseFigureData(fixture())
+    expect(categoryValues(data, 'data.Group')).toEqual(['a', 'b', 'a', 'c', 'b'])
+    expect(Array.from(data.columns['data.Response'])).toEqual([1, 2, 3, 4, 5])
+  })
+
+  it('leaves out derived series', () => {
+    expect(parseFigureData(fixture()).columns.fit).toBeUndefined()
+  })
+
+  it('rejects other files', () => {
+    expect(() => parseFigureData(new TextEncoder().encode('<svg></svg>').buffer)).toThrow(
+      'Not a figure data sidecar'
+    )
+  })
+})
+
+describe('toDataPoints', () => {
+  it('skips missing values', () => {
+    expect(toDataPoints([1, 2, 3], [4, NaN, 6])).toEqual([
+      { x: 1, y: 4 },
+      { x: 3, y: 6 },
+    ])
+  })
+})
@@ -0,0 +1,135 @@
+import {
+  createGallerySearch,
+  filterItems,
+  hexToLab,
+  intersect,
+  nearestPalettes,
+  searchText,
+  type GalleryIndex,
+  type Lab,
+} from '@/lib/galleryIndex'
+
+const CELL = 20
+
+function cells(palettes: Lab[][]): Record<string, number[]> {
+  const out: Record<string, number[]> = {}
+  palettes.forEach((palette, n) => {
+    for (const lab of palette) {
+      const key = lab.map((v) => Math.floor(v / CELL)).join(',')
+      out[key] = [...new Set([...(out[key] ?? []), n])]
+    }
+  })
+  return out
+}
+
+// A hand-built index of the shape scripts/gallery/search.py writes
+function buildIndex(): GalleryIndex {
+  const declared = [['#ff0000'], ['#0000ff'], ['#ee1100', '#ff2200']].map((p) => p.map(hexToLab))
+  return {
+    version: 1,
+    items: ['g-001', 'g-002', 'g-003'],
+    text: {
+      heatmap: [0],
+      colormap: [2],
+      scatter: [1, 2],
+      plot: [0, 1, 2],
+      热: [0],
+      图: [0, 1],
+      热图: [0],
+      散: [1],
+      点: [1],
+      散点: [1],
+      点图: [1],
+    },
+    facets: {
+      chartTypes: { heatmap: [0], scatter: [1, 2] },
+      journalStyles: { Nature: [0, 1], IEEE: [2] },
+      colorTones: { warm: [0, 2], cool: [1] },
+    },
+    palettes: {
+      space: 'CIELAB-D65',
+      cell: CELL,
+      declared,
+      rendered: [[], [], [[...declared[2][0], 1] as [number, number, number, number]]],
+      cells: cells(declared),
+      similar: [[2, 1], [0, 2], [0, 1]],
+    },
+  }
+}
+
+const search = createGallerySearch(buildIndex())
+
+describe('intersect', () => {
+  it('keeps positions in both sorted lists', () => {
+    expect(intersect([1, 3, 5, 7], [2, 3, 4, 7, 9])).toEqual([3, 7])
+    expect(intersect([0, 2], [1, 3])).toEqual([])
+    expect(intersect([], [1])).toEqual([])
+  })
+})
+
+describe('searchText', () => {
+  it('returns null for a blank query', () => {
+    expect(searchText(search, '')).toBeNull()
+    expect(searchText(search, '   ')).toBeNull()
+  })
+
+  it('matches Latin words anywhere inside indexed words', () => {
+    expect(searchText(search, 'map')).toEqual([0, 2])
+    expect(searchText(search, 'heat')).toEqual([0])
+    expect(searchText(search, 'ｍａｐ')).toEqual([0, 2])
+  })
+
+  it('requires every query word', () => {
+    expect(searchText(search, 'Scatter PLOT')).toEqual([1, 2])
+    expect(searchText(search, 'scatter heat')).toEqual([])
+  })
+
+  it('matches Chinese runs by character and bigram', () => {
+    expect(searchText(search, '图')).toEqual([0, 1])
+    expect(searchText(search, '热图')).toEqual([0])
+    expect(searchText(search, '散点图')).toEqual([1])
+  })
+
+  it('matches nothing for unknown or unindexable queries', () => {
+    expect(searchText(search, 'zzz')).toEqual([])
+    expect(searchText(search, '%')).toEqual([])
+  })
+})
+
+describe('filterItems', () => {
+  const none = { chartTypes: [], journalStyles: [], colorTones: [], search: '' }
+
+  it('returns every item without filters', () => {
+    expect(filterItems(search, none)).toEqual(['g-001', 'g-002', 'g-003'])
+  })
+
+  it('intersects facets and text', () => {
+    expect(filterItems(search, { ...none, chartTypes: ['scatter'], colorTones: ['warm'] })).toEqual(['g-003'])
+    expect(filterItems(search, { ...none, journalStyles: ['Nature'], search: 'plot' })).toEqual([
+      'g-001',
+      'g-002',
+    ])
+    expect(filterItems(search, { ...none, search: '%' })).toEqual([])
+  })
+})
+
+describe('nearestPalettes', () => {
+  it('ranks nearby palettes, nearest first', () => {
+    expect(nearestPalettes(search, ['#ff0000'])).toEqual(['g-001', 'g-003'])
+    expect(nearestPalettes(search, ['#ff0000'], 1)).toEqual(['g-001'])
+    expect(nearestPalettes(search, ['#0000ff'])).toEqual(['g-002'])
+  })
+
+  it('returns nothing for an empty query', () => {
+    expect(nearestPalettes(search, [])).toEqual([])
+  })
+})
+
+describe('hexToLab', () => {
+  it('matches CIELAB D65 reference values', () => {
+    const [l, a, b] = hexToLab('#ff0000')
+    expect(l).toBeCloseTo(53.24, 1)
+    expect(a).toBeCloseTo(80.09, 1)
+    expect(b).toBeCloseTo(67.2, 1)
+  })
+})